@@ -0,0 +1,34 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from readingdiary.analytics import analyze
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import ReadingDiary
+
+
+def fill(diary: ReadingDiary, num_books: int, notes_per_book: int):
+    rng = random.Random(42)
+    start = datetime(2021, 1, 1)
+    for i in range(num_books):
+        isbn = f"{i:013d}"
+        diary.add_book(isbn, f"Title {i}", f"Author {i % 100}", 500)
+        book = diary.search_by_isbn(isbn)
+        for j in range(notes_per_book):
+            book.add_note(f"Note {j}", rng.randint(1, 500), start + timedelta(minutes=rng.randrange(500_000)))
+
+
+def main():
+    num_books, notes_per_book = 1_000, 300
+    diary = ReadingDiary(ColumnarBook)
+    fill(diary, num_books, notes_per_book)
+    print(f"{num_books * notes_per_book} notes in {num_books} books")
+    print(f"{'workers':>7} {'seconds':>8}")
+    for workers in (1, 2, 4, 8):
+        started = time.perf_counter()
+        analyze(diary, workers=workers)
+        print(f"{workers:>7} {time.perf_counter() - started:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
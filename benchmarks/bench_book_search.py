@@ -0,0 +1,51 @@
+import random
+import sys
+import time
+
+from readingdiary.model import ReadingDiary
+
+SYLLABLES = "ka lo mi ra ten so vu bel dor fin gar hul is jo ken lar mon nor ost pel quin ros tar ul ven".split()
+
+
+def name(rng: random.Random) -> str:
+    return " ".join("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).capitalize() for _ in range(rng.randint(2, 3)))
+
+
+def main():
+    num_books = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(42)
+    authors = [name(rng) for _ in range(num_books // 10)]
+    rows = [(f"{i:013d}", name(rng), rng.choice(authors)) for i in range(num_books)]
+    diary = ReadingDiary()
+
+    started = time.perf_counter()
+    for isbn, title, author in rows:
+        diary.add_book(isbn, title, author, 300)
+    print(f"indexed {num_books} books in {time.perf_counter() - started:.1f} s")
+
+    targets = rng.sample(authors, 50)
+    queries = {
+        'author prefix': [author.split()[-1][:4] for author in targets],
+        'author exact': targets,
+        'author typo': [author[:3] + author[4] + author[3] + author[5:] for author in targets],
+    }
+    diary.search_by_author("warm up")
+    for label, batch in queries.items():
+        fuzzy = label == 'author typo'
+        started = time.perf_counter()
+        found = sum(1 for query in batch if diary.search_by_author(query, fuzzy))
+        elapsed = (time.perf_counter() - started) / len(batch)
+        print(f"{label:>14}: {elapsed * 1e3:.2f} ms/query, {found}/{len(batch)} found")
+
+    rounds = 200
+    diary.search_by_title("warm up")
+    started = time.perf_counter()
+    for i in range(rounds):
+        diary.add_book(f"{num_books + i:013d}", name(rng), rng.choice(authors), 300)
+        diary.search_by_title(targets[i % len(targets)].split()[-1][:4])
+    elapsed = (time.perf_counter() - started) / rounds
+    print(f"{'add + search':>14}: {elapsed * 1e3:.2f} ms/round")
+
+
+if __name__ == '__main__':
+    main()
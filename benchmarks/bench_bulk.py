@@ -0,0 +1,48 @@
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from readingdiary.bulk import import_notes, read_csv, read_jsonl
+from readingdiary.model import ReadingDiary
+
+
+def write_notes(path: str, num_books: int, num_notes: int):
+    rng = random.Random(42)
+    with open(path, 'w', encoding='utf-8') as file:
+        if path.endswith('.csv'):
+            file.write("isbn,text,page,date\n")
+        for i in range(num_notes):
+            row = {"isbn": f"{rng.randrange(num_books):013d}", "text": f"Note {i}",
+                   "page": rng.randint(1, 520), "date": "2021-01-01T12:00:00"}
+            if path.endswith('.csv'):
+                file.write(f"{row['isbn']},{row['text']},{row['page']},{row['date']}\n")
+            else:
+                file.write(json.dumps(row) + "\n")
+
+
+def main():
+    num_books, num_notes = 1_000, 200_000
+    print(f"{'format':>6} {'rows/min':>12} {'rejected':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension, reader in (('csv', read_csv), ('jsonl', read_jsonl)):
+            path = os.path.join(directory, f"notes.{extension}")
+            write_notes(path, num_books, num_notes)
+            diary = ReadingDiary()
+            for i in range(num_books):
+                diary.add_book(f"{i:013d}", f"Title {i}", "Author", 500)
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            report = import_notes(diary, reader(path))
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{extension:>6} {num_notes / elapsed * 60:>12,.0f} {len(report.rejected):>9} {peak / 2**20:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import random
+import tempfile
+import timeit
+from datetime import datetime
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import ReadingDiary
+from readingdiary.sqlstore import SQLiteReadingDiary
+
+
+def fill(diary: ReadingDiary, num_books: int, notes_per_book: int):
+    rng = random.Random(42)
+    date = datetime(2021, 1, 1)
+    for i in range(num_books):
+        isbn = f"{i:013d}"
+        diary.add_book(isbn, f"Title {i}", f"Author {i % 100}", 500)
+        for j in range(rng.randint(1, 2 * notes_per_book)):
+            diary.add_note_to_book(isbn, f"Note {j}", rng.randint(1, 500), date)
+
+
+def time_lookups(diary: ReadingDiary, num_books: int) -> dict[str, float]:
+    rng = random.Random(7)
+    isbns = [f"{rng.randrange(num_books):013d}" for _ in range(100)]
+    books = [diary.search_by_isbn(isbn) for isbn in isbns]
+    runs = {
+        'search_by_isbn': lambda: [diary.search_by_isbn(isbn) for isbn in isbns],
+        'get_notes_of_page': lambda: [book.get_notes_of_page(250) for book in books],
+        'page_with_most_notes': lambda: [book.page_with_most_notes() for book in books],
+        'book_with_most_notes': lambda: [diary.book_with_most_notes() for _ in range(100)],
+    }
+    return {name: timeit.timeit(run, number=3) / 300 for name, run in runs.items()}
+
+
+def main():
+    num_books, notes_per_book = 2_000, 50
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite = SQLiteReadingDiary(os.path.join(directory, "diary.sqlite"), batch_size=10_000)
+        engines = {
+            'memory': ReadingDiary(),
+            'columnar': ReadingDiary(ColumnarBook),
+            'sqlite': sqlite,
+        }
+        results = {}
+        for name, diary in engines.items():
+            fill(diary, num_books, notes_per_book)
+            results[name] = time_lookups(diary, num_books)
+        sqlite.close()
+
+    operations = list(results['memory'])
+    print(f"{'operation (us)':>22}" + "".join(f"{name:>11}" for name in engines))
+    for operation in operations:
+        print(f"{operation:>22}" + "".join(f"{results[name][operation] * 1e6:>11.1f}" for name in engines))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import random
+import time
+import tracemalloc
+
+from readingdiary.isbn import isbn_key, isbn_keys, normalize_isbn
+from readingdiary.model import ReadingDiary
+
+
+def random_isbns(count: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    isbns = []
+    for _ in range(count):
+        body = f"978{rng.randrange(10**9):09d}"
+        check = -sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(body)) % 10
+        isbns.append(f"{body}{check}")
+    return isbns
+
+
+def hyphenated(isbn: str) -> str:
+    return f"{isbn[:3]}-{isbn[3]}-{isbn[4:7]}-{isbn[7:12]}-{isbn[12]}"
+
+
+def per_call_ns(call, values: list) -> float:
+    started = time.perf_counter_ns()
+    for value in values:
+        call(value)
+    return (time.perf_counter_ns() - started) / len(values)
+
+
+def dict_bytes(build) -> float:
+    tracemalloc.start()
+    index = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del index
+    return size / 2**20
+
+
+def main():
+    count = 100_000
+    isbns = random_isbns(count)
+    dashed = [hyphenated(isbn) for isbn in isbns]
+    keys = [int(isbn) for isbn in isbns]
+
+    print(f"{'normalize':<28} {'ns/isbn':>9}")
+    print(f"{'isbn_key (digits)':<28} {per_call_ns(isbn_key, isbns):>9.0f}")
+    print(f"{'isbn_key (hyphenated)':<28} {per_call_ns(isbn_key, dashed):>9.0f}")
+    print(f"{'normalize_isbn':<28} {per_call_ns(normalize_isbn, dashed):>9.0f}")
+    for use_numpy in (False, True):
+        started = time.perf_counter_ns()
+        isbn_keys(isbns, use_numpy)
+        print(f"{f'isbn_keys (numpy={use_numpy})':<28} {(time.perf_counter_ns() - started) / count:>9.0f}")
+
+    print()
+    books = {isbn: None for isbn in isbns}
+    book_keys = {key: None for key in keys}
+    probe = random.Random(7).choices(range(count), k=count)
+    print(f"{'lookup':<28} {'ns/lookup':>9}")
+    print(f"{'dict[str] hit':<28} {per_call_ns(books.__contains__, [isbns[i] for i in probe]):>9.0f}")
+    print(f"{'dict[int] hit':<28} {per_call_ns(book_keys.__contains__, [keys[i] for i in probe]):>9.0f}")
+
+    diary = ReadingDiary()
+    for isbn in isbns:
+        diary.add_book(hyphenated(isbn), "Title", "Author", 100)
+    print(f"{'search_by_isbn exact':<28} {per_call_ns(diary.search_by_isbn, [dashed[i] for i in probe]):>9.0f}")
+    print(f"{'search_by_isbn other form':<28} {per_call_ns(diary.search_by_isbn, [isbns[i] for i in probe]):>9.0f}")
+    print(f"{'search_by_isbn miss':<28} {per_call_ns(diary.search_by_isbn, random_isbns(count, 8)):>9.0f}")
+
+    print()
+    print(f"{'index memory':<28} {'MiB':>9}")
+    print(f"{'dict[str] (fresh keys)':<28} {dict_bytes(lambda: {isbn.encode().decode(): None for isbn in isbns}):>9.1f}")
+    print(f"{'dict[int]':<28} {dict_bytes(lambda: {int(isbn): None for isbn in isbns}):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
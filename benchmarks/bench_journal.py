@@ -0,0 +1,30 @@
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from readingdiary.journal import JournaledDiary
+
+
+def main():
+    num_notes = 20_000
+    date = datetime(2021, 1, 1)
+    print(f"{'sync_every':>10} {'notes/s':>10} {'log (MB)':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for sync_every in (1, 8, 64, 512, 4096):
+            path = os.path.join(directory, f"diary-{sync_every}.rdry")
+            diary = JournaledDiary(path, sync_every=sync_every, sync_interval=float('inf'))
+            diary.add_book("1234", "Benchmark Book", "Author X", 1000)
+
+            started = time.perf_counter()
+            for i in range(num_notes):
+                diary.add_note_to_book("1234", f"Note {i}", i % 1000, date)
+            diary.close()
+            elapsed = time.perf_counter() - started
+
+            size = os.path.getsize(diary.log_path) / 2**20
+            print(f"{sync_every:>10} {num_notes / elapsed:>10.0f} {size:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import tracemalloc
+from datetime import datetime
+
+from readingdiary.columnar import NoteColumns
+from readingdiary.model import Book, Note
+
+
+class DictNote:
+    def __init__(self, text: str, page: int, date: datetime):
+        self.text: str = text
+        self.page: int = page
+        self.date: datetime = date
+        self.id: int = -1
+
+
+class DictBook:
+    def __init__(self, isbn: str, title: str, author: str, pages: int):
+        self.isbn: str = isbn
+        self.title: str = title
+        self.author: str = author
+        self.pages: int = pages
+        self.rating: int = Book.UNRATED
+        self.notes: list[Note] = []
+        self._notes_by_page: dict[int, list[Note]] = {}
+        self._next_id: int = 0
+        self._max_page: int = -1
+        self._max_count: int = 0
+        self._diary = None
+
+
+def bytes_per_instance(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    allocated -= len(instances) * 8 + 56
+    return allocated / count
+
+
+def bytes_per_columnar_note(text: str, date: datetime, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    columns = NoteColumns()
+    for _ in range(count):
+        columns.append(text, 1, date)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename')) / count
+
+
+def main():
+    count = 100_000
+    text = "Shared note text"
+    date = datetime(2021, 1, 1)
+    isbn, title, author = "1234", "Benchmark Book", "Author X"
+
+    rows = [
+        ("note", lambda i: DictNote(text, 1, date), lambda i: Note(text, 1, date)),
+        ("book", lambda i: DictBook(isbn, title, author, 100), lambda i: Book(isbn, title, author, 100)),
+    ]
+    print(f"{'object':>6} {'__dict__ (B)':>13} {'__slots__ (B)':>14} {'saved':>7}")
+    for name, before_factory, after_factory in rows:
+        before = bytes_per_instance(before_factory, count)
+        after = bytes_per_instance(after_factory, count)
+        print(f"{name:>6} {before:>13.1f} {after:>14.1f} {1 - after / before:>6.0%}")
+
+    columnar = bytes_per_columnar_note(text, date, count)
+    print(f"columnar note store: {columnar:.1f} B/note including text bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from readingdiary.model import Book, ReadingDiary
+
+
+def linear_remove_note(notes: list, note_id: int) -> bool:
+    for index, note in enumerate(notes):
+        if note.id == note_id:
+            del notes[index]
+            return True
+    return False
+
+
+def build_diary(num_notes: int, pages: int) -> ReadingDiary:
+    rng = random.Random(42)
+    diary = ReadingDiary()
+    diary.add_book("1234", "Benchmark Book", "Author X", pages)
+    book = diary.search_by_isbn("1234")
+    date = datetime(2021, 1, 1)
+    for i in range(num_notes):
+        book.add_note(f"Note {i}", rng.randint(1, pages), date + timedelta(minutes=i))
+    diary.clear_history()
+    return diary
+
+
+def main():
+    pages = 500
+    edits = 200
+    print(f"{'notes':>8} {'linear (us)':>12} {'remove (us)':>12} {'update (us)':>12}")
+    for num_notes in (1_000, 10_000, 100_000):
+        diary = build_diary(num_notes, pages)
+        book: Book = diary.search_by_isbn("1234")
+        rng = random.Random(7)
+        targets = rng.sample(range(num_notes), 2 * edits)
+        removed, updated = targets[:edits], targets[edits:]
+
+        notes = list(book.notes)
+        started = time.perf_counter()
+        for note_id in removed:
+            linear_remove_note(notes, note_id)
+        linear = (time.perf_counter() - started) / edits
+
+        started = time.perf_counter()
+        for note_id in removed:
+            book.remove_note(note_id)
+        remove = (time.perf_counter() - started) / edits
+
+        started = time.perf_counter()
+        for note_id in updated:
+            book.update_note(note_id, page=rng.randint(1, pages))
+            book.page_with_most_notes()
+        update = (time.perf_counter() - started) / edits
+        print(f"{num_notes:>8} {linear * 1e6:>12.2f} {remove * 1e6:>12.2f} {update * 1e6:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import random
+import timeit
+from datetime import datetime
+
+from readingdiary.model import Book, Note
+
+
+def linear_notes_of_page(book: Book, page: int) -> list[Note]:
+    notes_of_page: list[Note] = []
+
+    for note in book.notes:
+        if note.page == page:
+            notes_of_page.append(note)
+
+    return notes_of_page
+
+
+def build_book(num_notes: int, pages: int) -> Book:
+    rng = random.Random(42)
+    book = Book("1234", "Benchmark Book", "Author X", pages)
+    date = datetime(2021, 1, 1)
+    for i in range(num_notes):
+        book.add_note(f"Note {i}", rng.randint(1, pages), date)
+    return book
+
+
+def main():
+    pages = 500
+    lookups = 200
+    rng = random.Random(7)
+    print(f"{'notes':>8} {'linear (us)':>12} {'indexed (us)':>13} {'speedup':>8}")
+    for num_notes in (1_000, 10_000, 100_000):
+        book = build_book(num_notes, pages)
+        targets = [rng.randint(1, pages) for _ in range(lookups)]
+        linear = timeit.timeit(lambda: [linear_notes_of_page(book, p) for p in targets], number=3) / (3 * lookups)
+        indexed = timeit.timeit(lambda: [book.get_notes_of_page(p) for p in targets], number=3) / (3 * lookups)
+        print(f"{num_notes:>8} {linear * 1e6:>12.2f} {indexed * 1e6:>13.2f} {linear / indexed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
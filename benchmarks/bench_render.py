@@ -0,0 +1,48 @@
+import io
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from readingdiary.export import write_notes
+from readingdiary.model import RENDER_CACHE_SIZE, Book, Note
+
+
+def plain_note_str(note: Note) -> str:
+    return f"{note.date} - page {note.page}: {note.text}"
+
+
+def build_book(num_notes: int, pages: int) -> Book:
+    rng = random.Random(42)
+    book = Book("1234", "Benchmark Book", "Author X", pages)
+    date = datetime(2021, 1, 1)
+    for i in range(num_notes):
+        book.add_note(f"Note {i}", rng.randint(1, pages), date + timedelta(minutes=i))
+    return book
+
+
+def print_loop(notes: list[Note], stream: io.StringIO):
+    for note in notes:
+        print(f'[{note.id}] {note}', file=stream)
+
+
+def main():
+    book = build_book(25 * RENDER_CACHE_SIZE, 50)
+    notes = book.notes
+    repeat = 3
+    plain = timeit.timeit(lambda: [plain_note_str(note) for note in notes], number=repeat)
+    rendered = timeit.timeit(lambda: [str(note) for note in notes], number=repeat)
+    printed = timeit.timeit(lambda: print_loop(notes, io.StringIO()), number=repeat)
+    written = timeit.timeit(lambda: write_notes(notes, io.StringIO(), with_ids=True), number=repeat)
+    books = timeit.timeit(lambda: [str(book) for _ in notes], number=repeat)
+
+    per_note = 1e6 / (repeat * len(notes))
+    print(f"{'operation':<24} {'us/note':>8}")
+    print(f"{'format note':<24} {plain * per_note:>8.2f}")
+    print(f"{'str(note)':<24} {rendered * per_note:>8.2f}")
+    print(f"{'print loop':<24} {printed * per_note:>8.2f}")
+    print(f"{'write_notes':<24} {written * per_note:>8.2f}")
+    print(f"{'str(book), cached':<24} {books * per_note:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import random
+import time
+from datetime import datetime
+
+from readingdiary.model import ReadingDiary
+
+WORDS = ("whale sea ship sailor captain harpoon ocean storm island wind rope deck mast sail "
+         "voyage crew map compass star night dawn fish boat port anchor wave tide shore").split()
+
+
+def build_diary(num_notes: int) -> ReadingDiary:
+    rng = random.Random(42)
+    diary = ReadingDiary()
+    for i in range(100):
+        diary.add_book(f"{i:013d}", f"Title {i}", "Author", 500)
+    date = datetime(2021, 1, 1)
+    for i in range(num_notes):
+        text = " ".join(rng.choices(WORDS, k=rng.randint(5, 25))) + f" n{i}"
+        diary.add_note_to_book(f"{rng.randrange(100):013d}", text, rng.randint(1, 500), date)
+    return diary
+
+
+def linear_search(diary: ReadingDiary, term: str) -> list:
+    return [(book, note) for book in diary.books.values() for note in book.notes if term in note.text]
+
+
+def main():
+    queries = ["harpoon", "n12345", "kraken"]
+    print(f"{'notes':>8} {'query':>8} {'linear in (ms)':>15} {'index (ms)':>11}")
+    for num_notes in (10_000, 100_000):
+        diary = build_diary(num_notes)
+        for query in queries:
+            started = time.perf_counter()
+            for _ in range(10):
+                linear_search(diary, query)
+            linear = (time.perf_counter() - started) / 10
+
+            started = time.perf_counter()
+            for _ in range(10):
+                diary.search_notes(query, limit=10)
+            indexed = (time.perf_counter() - started) / 10
+
+            print(f"{num_notes:>8} {query:>8} {linear * 1e3:>15.2f} {indexed * 1e3:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from readingdiary.model import ReadingDiary
+from readingdiary.sharding import ShardedDiary
+
+
+def fill(diary: ReadingDiary | ShardedDiary, num_books: int, num_notes: int) -> float:
+    rng = random.Random(42)
+    date = datetime(2021, 1, 1)
+    started = time.perf_counter()
+    for i in range(num_books):
+        diary.add_book(f"{i:013d}", f"Title {i}", f"Author {i % 100}", 500)
+    for i in range(num_notes):
+        diary.add_note_to_book(f"{rng.randrange(num_books):013d}", f"Note {i}", rng.randint(1, 500),
+                               date + timedelta(minutes=i))
+    return time.perf_counter() - started
+
+
+def main():
+    num_books, num_notes, lookups = 10_000, 100_000, 100_000
+    isbns = [f"{random.Random(7).randrange(num_books):013d}" for _ in range(lookups)]
+    print(f"{'diary':>10} {'fill (s)':>9} {'lookup (us)':>12} {'top book (us)':>14} {'top 10 (us)':>12} {'reshard x2 (s)':>15}")
+    for shard_count in (None, 1, 4, 16):
+        diary = ReadingDiary() if shard_count is None else ShardedDiary(shard_count)
+        filled = fill(diary, num_books, num_notes)
+
+        started = time.perf_counter()
+        for isbn in isbns:
+            diary.search_by_isbn(isbn)
+        lookup = (time.perf_counter() - started) / lookups * 1e6
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            diary.book_with_most_notes()
+        top = (time.perf_counter() - started) / 1000 * 1e6
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            diary.most_annotated_books(10)
+        top_ten = (time.perf_counter() - started) / 1000 * 1e6
+
+        reshard = ''
+        if shard_count is not None:
+            started = time.perf_counter()
+            diary.reshard(2 * shard_count)
+            reshard = f"{time.perf_counter() - started:.2f}"
+        name = 'single' if shard_count is None else f'{shard_count} shards'
+        print(f"{name:>10} {filled:>9.2f} {lookup:>12.2f} {top:>14.2f} {top_ten:>12.2f} {reshard:>15}")
+
+
+if __name__ == '__main__':
+    main()
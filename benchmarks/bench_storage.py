@@ -0,0 +1,47 @@
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from readingdiary.model import ReadingDiary
+from readingdiary.storage import load_diary, save_diary
+
+
+def build_diary(num_books: int, notes_per_book: int) -> ReadingDiary:
+    rng = random.Random(42)
+    diary = ReadingDiary()
+    start = datetime(2021, 1, 1)
+    for i in range(num_books):
+        isbn = f"{i:013d}"
+        diary.add_book(isbn, f"Title {i}", f"Author {i % 100}", 500)
+        for j in range(notes_per_book):
+            diary.add_note_to_book(isbn, f"Note {j} of book {i}", rng.randint(1, 500), start + timedelta(minutes=j))
+    return diary
+
+
+def main():
+    print(f"{'books':>7} {'notes':>9} {'size (MB)':>10} {'save (s)':>9} {'lazy load (s)':>14} {'full load (s)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "diary.rdry")
+        for num_books, notes_per_book in ((1_000, 10), (10_000, 10), (10_000, 100)):
+            diary = build_diary(num_books, notes_per_book)
+
+            started = time.perf_counter()
+            save_diary(diary, path)
+            save_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            load_diary(path)
+            lazy_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            load_diary(path)._load_all_notes()
+            full_time = time.perf_counter() - started
+
+            size = os.path.getsize(path) / 2**20
+            print(f"{num_books:>7} {num_books * notes_per_book:>9} {size:>10.1f} {save_time:>9.2f} {lazy_time:>14.3f} {full_time:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import Book, ReadingDiary
+
+BOOK_TYPES: dict[str, type[Book]] = {'memory': Book, 'columnar': ColumnarBook}
+SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+PAGES: int = 500
+NOTES_PER_BOOK: int = 100
+QUERIES: int = 10_000
+SKEW: float = 1.1
+REGRESSION: float = 1.25
+START: datetime = datetime(2021, 1, 1)
+
+
+def zipf_weights(count: int, skew: float) -> list[float]:
+    return list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def ranked_books(num_books: int, seed: int) -> list[str]:
+    books = [f"{i:013d}" for i in range(num_books)]
+    random.Random(seed).shuffle(books)
+    return books
+
+
+def generate_notes(num_notes: int, books: list[str], skew: float,
+                   rng: random.Random) -> Iterator[tuple[str, str, int, datetime]]:
+    num_books = len(books)
+    pages = list(range(1, PAGES + 1))
+    book_weights, page_weights = zipf_weights(num_books, skew), zipf_weights(PAGES, skew)
+    remaining = num_notes
+    while remaining:
+        chunk = min(remaining, 65_536)
+        isbns = rng.choices(books, cum_weights=book_weights, k=chunk)
+        note_pages = rng.choices(pages, cum_weights=page_weights, k=chunk)
+        for isbn, page in zip(isbns, note_pages):
+            index = num_notes - remaining
+            yield isbn, f"Note {index}", page, START + timedelta(minutes=index)
+            remaining -= 1
+
+
+def build_diary(num_notes: int, book_type: type[Book], skew: float, seed: int,
+                latencies: array | None = None) -> ReadingDiary:
+    num_books = max(1, num_notes // NOTES_PER_BOOK)
+    diary = ReadingDiary(book_type)
+    for i in range(num_books):
+        diary.add_book(f"{i:013d}", f"Title {i}", f"Author {i % 100}", PAGES)
+    books = diary.books
+    clock = time.perf_counter_ns
+    for isbn, text, page, date in generate_notes(num_notes, ranked_books(num_books, seed), skew, random.Random(seed)):
+        book = books[isbn]
+        if latencies is None:
+            book.add_note(text, page, date)
+        else:
+            started = clock()
+            book.add_note(text, page, date)
+            latencies.append(clock() - started)
+    diary.clear_history()
+    return diary
+
+
+def summarize(latencies: array, seconds: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(count - 1, int(fraction * count))] / 1000 if count else 0.0
+
+    return {
+        'count': count,
+        'ops_per_second': count / seconds if seconds else 0.0,
+        'p50_us': percentile(0.50),
+        'p90_us': percentile(0.90),
+        'p99_us': percentile(0.99),
+        'max_us': ordered[-1] / 1000 if count else 0.0,
+    }
+
+
+def time_calls(call: Callable, arguments: list) -> dict[str, float]:
+    latencies = array('q')
+    clock = time.perf_counter_ns
+    started = time.perf_counter()
+    for argument in arguments:
+        before = clock()
+        call(argument)
+        latencies.append(clock() - before)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def query_operations(diary: ReadingDiary, queries: int, skew: float, seed: int) -> dict[str, dict[str, float]]:
+    rng = random.Random(seed + 1)
+    samples = list(generate_notes(queries, ranked_books(len(diary.books), seed), skew, rng))
+    books = [diary.books[isbn] for isbn, _, _, _ in samples]
+    misses = [f"x{rng.randrange(10**12):012d}" for _ in range(queries // 10)]
+    isbns = [isbn for isbn, _, _, _ in samples[:queries - len(misses)]] + misses
+    rng.shuffle(isbns)
+    notes = [note for book in books for note in book.latest_notes(1)]
+
+    return {
+        'get_notes_of_page': time_calls(lambda sample: sample[0].get_notes_of_page(sample[1]),
+                                        [(book, page) for book, (_, _, page, _) in zip(books, samples)]),
+        'page_with_most_notes': time_calls(Book.page_with_most_notes, books),
+        'book_with_most_notes': time_calls(lambda _: diary.book_with_most_notes(), range(queries)),
+        'search_by_isbn': time_calls(diary.search_by_isbn, isbns),
+        'book_str': time_calls(str, books),
+        'note_str': time_calls(str, notes),
+    }
+
+
+def peak_memory(num_notes: int, book_type: type[Book], skew: float, seed: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    diary = build_diary(num_notes, book_type, skew, seed)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del diary
+    return peak
+
+
+def run_size(num_notes: int, book_type: type[Book], skew: float, seed: int, queries: int,
+             memory: bool) -> dict:
+    latencies = array('q')
+    started = time.perf_counter()
+    diary = build_diary(num_notes, book_type, skew, seed, latencies)
+    operations = {'add_note': summarize(latencies, time.perf_counter() - started)}
+    operations.update(query_operations(diary, queries, skew, seed))
+    del diary
+    result = {'notes': num_notes, 'books': max(1, num_notes // NOTES_PER_BOOK), 'operations': operations}
+    if memory:
+        result['peak_memory_bytes'] = peak_memory(num_notes, book_type, skew, seed)
+        result['bytes_per_note'] = result['peak_memory_bytes'] / num_notes
+    return result
+
+
+def regressions(report: dict, baseline: dict, threshold: float) -> list[str]:
+    previous = {(entry['notes'], name): stats for entry in baseline['results']
+                for name, stats in entry['operations'].items()}
+    found = []
+    for entry in report['results']:
+        for name, stats in entry['operations'].items():
+            before = previous.get((entry['notes'], name))
+            if before and before['p50_us'] > 0 and stats['p50_us'] > before['p50_us'] * threshold:
+                found.append(f"{name} at {entry['notes']} notes: p50 {before['p50_us']:.2f} -> {stats['p50_us']:.2f} us")
+    return found
+
+
+def print_report(report: dict):
+    for entry in report['results']:
+        memory = f", peak {entry['peak_memory_bytes'] / 2**20:.1f} MiB" if 'peak_memory_bytes' in entry else ''
+        print(f"{entry['notes']} notes over {entry['books']} books{memory}")
+        print(f"  {'operation':<22} {'ops/s':>12} {'p50 (us)':>9} {'p90 (us)':>9} {'p99 (us)':>9} {'max (us)':>10}")
+        for name, stats in entry['operations'].items():
+            print(f"  {name:<22} {stats['ops_per_second']:>12.0f} {stats['p50_us']:>9.2f} {stats['p90_us']:>9.2f} "
+                  f"{stats['p99_us']:>9.2f} {stats['max_us']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reading Diary benchmark suite')
+    parser.add_argument('--sizes', type=lambda value: int(float(value)), nargs='+', default=list(SIZES),
+                        help='note counts to run, e.g. 1e3 1e5 1e7')
+    parser.add_argument('--book-type', choices=sorted(BOOK_TYPES), default='memory')
+    parser.add_argument('--skew', type=float, default=SKEW, help='Zipf exponent for notes per book and per page')
+    parser.add_argument('--queries', type=int, default=QUERIES, help='calls timed per query operation')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak memory pass')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='compare p50 latencies against an earlier JSON report')
+    parser.add_argument('--threshold', type=float, default=REGRESSION, help='slowdown that counts as a regression')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'book_type': args.book_type,
+            'skew': args.skew,
+            'queries': args.queries,
+            'seed': args.seed,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        },
+        'results': [run_size(size, BOOK_TYPES[args.book_type], args.skew, args.seed, args.queries, not args.no_memory)
+                    for size in args.sizes],
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            found = regressions(report, json.load(file), args.threshold)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import Book, ReadingDiary
+from readingdiary.storage import save_diary
+from readingdiary.textstore import CompactBook, CompactNote, TextStore
+
+TAGS: list[str] = [f"#{word}" for word in "todo quote idea question reread favourite summary theme".split()]
+WORDS: list[str] = ("the of and to in that it was for on with as his at by had from her which but not be this "
+                    "they have one you were all she an their we would when there what so him been if more").split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def build_diary(book_type: type[Book], num_books: int, notes_per_book: int, indexed: bool = True) -> ReadingDiary:
+    rng = random.Random(42)
+    diary = ReadingDiary(book_type)
+    start = datetime(2021, 1, 1)
+    for i in range(num_books):
+        isbn = f"{i:013d}"
+        diary.add_book(isbn, f"Title {i}", f"Author {i % 100}", 500)
+        book = diary.books[isbn]
+        if not indexed:
+            book._diary = None
+        quotes = [sentence(rng, 40) for _ in range(10)]
+        for j in range(notes_per_book):
+            kind = rng.random()
+            if kind < 0.4:
+                text = rng.choice(TAGS)
+            elif kind < 0.7:
+                text = f"Chapter summary: {rng.choice(quotes)}"
+            elif kind < 0.9:
+                text = rng.choice(quotes)
+            else:
+                text = sentence(rng, 30)
+            book.add_note(text.encode().decode(), rng.randint(1, 500), start + timedelta(minutes=j))
+    diary.clear_history()
+    return diary
+
+
+def traced_memory(build) -> float:
+    CompactNote.store = TextStore()
+    gc.collect()
+    tracemalloc.start()
+    diary = build()
+    memory = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    del diary
+    return memory
+
+
+def main():
+    num_books, notes_per_book = 1_000, 100
+    print(f"{'book type':>10} {'build (s)':>10} {'notes (MB)':>11} {'diary (MB)':>11} {'read all (ms)':>14} "
+          f"{'file (MB)':>10} {'compressed (MB)':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "diary.rdry")
+        for name, book_type in (('memory', Book), ('columnar', ColumnarBook), ('compact', CompactBook)):
+            notes = traced_memory(lambda: build_diary(book_type, num_books, notes_per_book, indexed=False))
+            memory = traced_memory(lambda: build_diary(book_type, num_books, notes_per_book))
+
+            CompactNote.store = TextStore()
+            started = time.perf_counter()
+            diary = build_diary(book_type, num_books, notes_per_book)
+            build = time.perf_counter() - started
+
+            started = time.perf_counter()
+            total = sum(len(note.text) for _, note in diary.iter_notes())
+            read = (time.perf_counter() - started) * 1000
+
+            save_diary(diary, path)
+            size = os.path.getsize(path) / 2**20
+            save_diary(diary, path, compress=True)
+            compressed = os.path.getsize(path) / 2**20
+            print(f"{name:>10} {build:>10.2f} {notes:>11.1f} {memory:>11.1f} {read:>14.1f} {size:>10.1f} "
+                  f"{compressed:>16.1f}")
+            del diary, total
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from readingdiary.model import ReadingDiary
+
+
+def ingest(num_threads, num_books, notes_per_thread):
+    diary = ReadingDiary()
+    for i in range(num_books):
+        diary.add_book(f"isbn-{i}", f"Book {i}", "Author X", 1000)
+    barrier = threading.Barrier(num_threads + 1)
+    date = datetime(2021, 1, 1)
+
+    def worker(n):
+        barrier.wait()
+        for i in range(notes_per_thread):
+            diary.add_note_to_book(f"isbn-{(n + i) % num_books}", f"thread {n} note {i}", i % 1000,
+                                   date + timedelta(seconds=i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    total_notes = 80_000
+    print(f"{'threads':>7} {'books':>6} {'notes/s':>10}")
+    for num_books in (1, 64):
+        for num_threads in (1, 2, 4, 8):
+            elapsed = ingest(num_threads, num_books, total_notes // num_threads)
+            print(f"{num_threads:>7} {num_books:>6} {total_notes / elapsed:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
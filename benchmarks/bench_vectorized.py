@@ -0,0 +1,39 @@
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import ReadingDiary
+from readingdiary.vectorized import DiaryStats, np
+
+
+def fill(diary: ReadingDiary, num_books: int, notes_per_book: int):
+    rng = random.Random(42)
+    start = datetime(2021, 1, 1)
+    for i in range(num_books):
+        isbn = f"{i:013d}"
+        diary.add_book(isbn, f"Title {i}", f"Author {i % 100}", 500)
+        book = diary.search_by_isbn(isbn)
+        for j in range(rng.randint(1, 2 * notes_per_book)):
+            book.add_note(f"Note {j}", rng.randint(1, 500), start + timedelta(minutes=rng.randrange(500_000)))
+
+
+def main():
+    if np is None:
+        print("NumPy is not installed; only the pure-Python path is available")
+        return
+    diary = ReadingDiary(ColumnarBook)
+    fill(diary, 2_000, 100)
+    vectorized = DiaryStats(diary, use_numpy=True)
+    loops = DiaryStats(diary, use_numpy=False)
+    export = timeit.timeit(lambda: (vectorized.refresh(), vectorized.arrays), number=3) / 3
+
+    print(f"{len(vectorized.arrays)} notes, export to arrays {export * 1000:.1f} ms")
+    print(f"{'aggregate':>22} {'loops (ms)':>11} {'numpy (ms)':>11}")
+    for name in ('pages_with_most_notes', 'book_with_most_notes', 'reading_velocity', 'progress_percentiles'):
+        timings = [timeit.timeit(getattr(stats, name), number=3) / 3 * 1000 for stats in (loops, vectorized)]
+        print(f"{name:>22} {timings[0]:>11.2f} {timings[1]:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
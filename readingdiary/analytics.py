@@ -0,0 +1,95 @@
+import heapq
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, timedelta
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.epoch import EPOCH, to_epoch_us
+from readingdiary.model import Book, ReadingDiary
+
+DAY_US: int = 86_400_000_000
+SHARDS_PER_WORKER: int = 4
+
+BookColumns = tuple[str, int, array, array]
+
+
+class AnalyticsReport:
+
+    def __init__(self, bucket_size: int):
+        self.bucket_size: int = bucket_size
+        self.total_notes: int = 0
+        self.page_with_most_notes: dict[str, int] = {}
+        self.density: Counter[int] = Counter()
+        self.ratings: Counter[int] = Counter()
+        self.notes_per_day: Counter[date] = Counter()
+
+    def merge(self, partial: 'AnalyticsReport'):
+        self.total_notes += partial.total_notes
+        self.page_with_most_notes.update(partial.page_with_most_notes)
+        self.density.update(partial.density)
+        self.ratings.update(partial.ratings)
+        self.notes_per_day.update(partial.notes_per_day)
+
+    def __str__(self) -> str:
+        return f"{len(self.page_with_most_notes)} books, {self.total_notes} notes"
+
+
+def book_columns(book: Book) -> BookColumns:
+    if isinstance(book, ColumnarBook):
+        return book.isbn, book.rating, book._columns.pages, book._columns.dates
+    notes = list(book.iter_notes())
+    return (book.isbn, book.rating, array('i', [note.page for note in notes]),
+            array('q', [to_epoch_us(note.date) for note in notes]))
+
+
+def shard_books(diary: ReadingDiary, shards: int) -> list[list[BookColumns]]:
+    columns = [book_columns(diary.search_by_isbn(isbn)) for isbn in list(diary.books)]
+    columns.sort(key=lambda entry: len(entry[2]), reverse=True)
+    loads = [(0, shard) for shard in range(shards)]
+    result = [[] for _ in range(shards)]
+    for entry in columns:
+        load, shard = heapq.heappop(loads)
+        result[shard].append(entry)
+        heapq.heappush(loads, (load + len(entry[2]) + 1, shard))
+    return [shard for shard in result if shard]
+
+
+def analyze_shard(shard: list[BookColumns], bucket_size: int) -> AnalyticsReport:
+    report = AnalyticsReport(bucket_size)
+    days = Counter()
+    for isbn, rating, pages, dates in shard:
+        counts = Counter(pages)
+        report.page_with_most_notes[isbn] = max(counts, key=counts.__getitem__) if counts else -1
+        for page, count in counts.items():
+            report.density[page // bucket_size * bucket_size] += count
+        report.ratings[rating] += 1
+        report.total_notes += len(pages)
+        days.update(value // DAY_US for value in dates)
+    epoch = EPOCH.date()
+    for day, count in days.items():
+        report.notes_per_day[epoch + timedelta(days=day)] += count
+    return report
+
+
+def analyze(diary: ReadingDiary, workers: int | None = None, bucket_size: int = 10,
+            executor: Executor | None = None) -> AnalyticsReport:
+    workers = workers or os.cpu_count() or 1
+    report = AnalyticsReport(bucket_size)
+    shards = shard_books(diary, workers * SHARDS_PER_WORKER if workers > 1 else 1)
+    if workers == 1 and executor is None:
+        for shard in shards:
+            report.merge(analyze_shard(shard, bucket_size))
+        return report
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for partial in executor.map(analyze_shard, shards, [bucket_size] * len(shards)):
+            report.merge(partial)
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return report
@@ -1,8 +1,21 @@
+import argparse
+import atexit
+
+from readingdiary.metrics import METRICS, enable
 from readingdiary.view import UIConsole
 
 
 def main():
-    ui = UIConsole()
+    parser = argparse.ArgumentParser(description='Reading Diary App')
+    parser.add_argument('diary', nargs='?', help='diary file; changes are journaled to <diary>.log until exit')
+    parser.add_argument('--stats', action='store_true', help='record per-operation metrics and print them on exit')
+    args = parser.parse_args()
+
+    if args.stats:
+        enable()
+        atexit.register(lambda: print(METRICS.report()))
+
+    ui = UIConsole(args.diary)
     ui.run()
 
 
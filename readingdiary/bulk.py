@@ -0,0 +1,152 @@
+import csv
+import itertools
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+from readingdiary.model import Book, ReadingDiary
+
+BOOK_FIELDS: tuple[str, ...] = ('isbn', 'title', 'author', 'pages')
+NOTE_FIELDS: tuple[str, ...] = ('isbn', 'text', 'page', 'date')
+BOOK_TEXT_FIELDS: tuple[str, ...] = ('isbn', 'title', 'author')
+NOTE_TEXT_FIELDS: tuple[str, ...] = ('isbn', 'text', 'date')
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.accepted: int = 0
+        self.rejected: list[tuple[int, str]] = []
+
+    def reject(self, row_number: int, reason: str):
+        self.rejected.append((row_number, reason))
+
+    def __str__(self) -> str:
+        return f"{self.accepted} rows imported, {len(self.rejected)} rejected"
+
+
+def read_csv(path: str) -> Iterator[dict]:
+    with open(path, newline='', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    if path.endswith('.jsonl'):
+        return read_jsonl(path)
+    return read_csv(path)
+
+
+def import_books(diary: ReadingDiary, rows: Iterable[dict], report: ImportReport | None = None) -> ImportReport:
+    report = ImportReport() if report is None else report
+
+    for row_number, row in enumerate(rows, start=1):
+        reason = _invalid_row(row, BOOK_FIELDS, BOOK_TEXT_FIELDS)
+        if reason is not None:
+            report.reject(row_number, reason)
+            continue
+        try:
+            pages = _integer(row['pages'])
+            rating = _integer(row['rating']) if row.get('rating') not in (None, '') else Book.UNRATED
+        except (TypeError, ValueError):
+            report.reject(row_number, "Invalid number")
+            continue
+        if rating != Book.UNRATED and not Book.is_valid_rating(rating):
+            report.reject(row_number, "Invalid rating")
+            continue
+        try:
+            added = diary.add_book(row['isbn'], row['title'], row['author'], pages)
+        except (TypeError, ValueError, OverflowError) as error:
+            report.reject(row_number, f"Invalid book: {error}")
+            continue
+        if not added:
+            report.reject(row_number, "Book already exists")
+            continue
+        if rating != Book.UNRATED:
+            diary.rate_book(row['isbn'], rating)
+        report.accepted += 1
+
+    return report
+
+
+def import_notes(diary: ReadingDiary, rows: Iterable[dict], batch_size: int = 10_000,
+                 report: ImportReport | None = None) -> ImportReport:
+    report = ImportReport() if report is None else report
+
+    for batch in _batches(rows, batch_size):
+        accepted = report.accepted
+        try:
+            with diary.batch():
+                _import_note_batch(diary, batch, report)
+        except BaseException:
+            report.accepted = accepted
+            raise
+
+    return report
+
+
+def _import_note_batch(diary: ReadingDiary, batch: Iterator[tuple[int, dict]], report: ImportReport):
+    books: dict[str, Book | None] = {}
+    for row_number, row in batch:
+        reason = _invalid_row(row, NOTE_FIELDS, NOTE_TEXT_FIELDS)
+        if reason is not None:
+            report.reject(row_number, reason)
+            continue
+        isbn = row['isbn']
+        if isbn not in books:
+            books[isbn] = diary.search_by_isbn(isbn)
+        book = books[isbn]
+        if book is None:
+            report.reject(row_number, "Book not found")
+            continue
+        try:
+            page = _integer(row['page'])
+        except (TypeError, ValueError):
+            report.reject(row_number, "Invalid number")
+            continue
+        try:
+            date = datetime.fromisoformat(row['date'])
+        except (TypeError, ValueError):
+            report.reject(row_number, "Invalid date")
+            continue
+        try:
+            added = book.add_note(row['text'], page, date)
+        except (TypeError, ValueError, OverflowError) as error:
+            report.reject(row_number, f"Invalid note: {error}")
+            continue
+        if not added:
+            report.reject(row_number, "Invalid page")
+            continue
+        report.accepted += 1
+
+
+def _batches(rows: Iterable[dict], batch_size: int) -> Iterator[Iterator[tuple[int, dict]]]:
+    numbered = enumerate(rows, start=1)
+    for first in numbered:
+        yield itertools.chain((first,), itertools.islice(numbered, batch_size - 1))
+
+
+def _invalid_row(row: dict, fields: tuple[str, ...], text_fields: tuple[str, ...]) -> str | None:
+    if not isinstance(row, dict):
+        return "Invalid row"
+    for field in fields:
+        if row.get(field) is None:
+            return f"Missing field: {field}"
+    for field in text_fields:
+        if not isinstance(row[field], str):
+            return f"Invalid field: {field}"
+    return None
+
+
+def _integer(value) -> int:
+    if isinstance(value, str):
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise TypeError(f"Not an integer: {value!r}")
@@ -0,0 +1,177 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime
+
+from readingdiary.epoch import NAIVE, from_epoch_us, to_epoch_us, utc_offset_us
+from readingdiary.model import Book, Note
+
+
+class NoteColumns:
+    __slots__ = ('ids', 'pages', 'dates', 'zones', 'text', 'starts', 'ends', '_garbage')
+
+    def __init__(self):
+        self.ids: array = array('q')
+        self.pages: array = array('i')
+        self.dates: array = array('q')
+        self.zones: array | None = None
+        self.text: bytearray = bytearray()
+        self.starts: array = array('q')
+        self.ends: array = array('q')
+        self._garbage: int = 0
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def append(self, text: str, page: int, date: datetime, note_id: int | None = None):
+        if note_id is None:
+            note_id = self.ids[-1] + 1 if self.ids else 0
+        self.insert(len(self), note_id, text, page, date)
+
+    def insert(self, index: int, note_id: int, text: str, page: int, date: datetime):
+        date_us, zone, encoded = to_epoch_us(date), utc_offset_us(date), text.encode()
+        if zone != NAIVE and self.zones is None:
+            self.zones = array('q', [NAIVE]) * len(self)
+        self.ids.insert(index, note_id)
+        self.pages.insert(index, page)
+        self.dates.insert(index, date_us)
+        if self.zones is not None:
+            self.zones.insert(index, zone)
+        self.starts.insert(index, len(self.text))
+        self.text += encoded
+        self.ends.insert(index, len(self.text))
+
+    def delete(self, index: int):
+        start, end = self.starts[index], self.ends[index]
+        if end == len(self.text):
+            del self.text[start:]
+        else:
+            self._garbage += end - start
+        for column in (self.ids, self.pages, self.dates, self.starts, self.ends):
+            del column[index]
+        if self.zones is not None:
+            del self.zones[index]
+        if self._garbage > len(self.text) // 2:
+            self._compact()
+
+    def pop(self):
+        self.delete(len(self) - 1)
+
+    def index_of(self, note_id: int) -> int:
+        index = bisect_left(self.ids, note_id)
+        if index < len(self.ids) and self.ids[index] == note_id:
+            return index
+        return -1
+
+    def text_at(self, index: int) -> str:
+        return self.text[self.starts[index]:self.ends[index]].decode()
+
+    def _compact(self):
+        text = bytearray()
+        for index in range(len(self)):
+            start = len(text)
+            text += self.text[self.starts[index]:self.ends[index]]
+            self.starts[index] = start
+            self.ends[index] = len(text)
+        self.text = text
+        self._garbage = 0
+
+    def note_at(self, index: int) -> Note:
+        zone = NAIVE if self.zones is None else self.zones[index]
+        note = Note(self.text_at(index), self.pages[index], from_epoch_us(self.dates[index], zone))
+        note.id = self.ids[index]
+        return note
+
+    def indices_of_page(self, page: int) -> Iterator[int]:
+        pages = self.pages
+        index = -1
+        while True:
+            try:
+                index = pages.index(page, index + 1)
+            except ValueError:
+                return
+            yield index
+
+
+class ColumnarBook(Book):
+    __slots__ = ('_columns',)
+
+    def __init__(self, isbn: str, title: str, author: str, pages: int):
+        self.isbn: str = isbn
+        self.title: str = title
+        self.author: str = author
+        self.pages: int = pages
+        self.rating: int = Book.UNRATED
+        self._next_id: int = 0
+        self._diary = None
+        self._columns: NoteColumns = NoteColumns()
+
+    @property
+    def notes(self) -> list[Note]:
+        return list(self.iter_notes())
+
+    def get_note(self, note_id: int) -> Note | None:
+        index = self._columns.index_of(note_id)
+        return None if index < 0 else self._columns.note_at(index)
+
+    def _append_note(self, text: str, page: int, date: datetime) -> Note:
+        self._columns.append(text, page, date, self._next_id)
+        self._next_id += 1
+        return self._columns.note_at(len(self._columns) - 1)
+
+    def _insert_note(self, note: Note):
+        columns = self._columns
+        columns.insert(bisect_left(columns.ids, note.id), note.id, note.text, note.page, note.date)
+        self._next_id = max(self._next_id, note.id + 1)
+
+    def _remove_note(self, note_id: int) -> Note | None:
+        index = self._columns.index_of(note_id)
+        if index < 0:
+            return None
+        note = self._columns.note_at(index)
+        self._columns.delete(index)
+        return note
+
+    def _pop_note(self) -> Note:
+        note = self._remove_note(self._columns.ids[-1])
+        self._next_id = note.id
+        return note
+
+    def get_notes_of_page(self, page: int) -> list[Note]:
+        return list(self.iter_notes_of_page(page))
+
+    def iter_notes(self) -> Iterator[Note]:
+        columns = self._columns
+        return (columns.note_at(index) for index in range(len(columns)))
+
+    def iter_notes_of_page(self, page: int) -> Iterator[Note]:
+        columns = self._columns
+        return (columns.note_at(index) for index in columns.indices_of_page(page))
+
+    def iter_notes_in_pages(self, first: int, last: int) -> Iterator[Note]:
+        columns = self._columns
+        pages = sorted({page for page in columns.pages if first <= page <= last})
+        for page in pages:
+            for index in columns.indices_of_page(page):
+                yield columns.note_at(index)
+
+    def iter_notes_between(self, start: datetime, end: datetime) -> Iterator[Note]:
+        columns = self._columns
+        start, end = to_epoch_us(start), to_epoch_us(end)
+        indices = sorted((index for index, date in enumerate(columns.dates) if start <= date < end),
+                         key=columns.dates.__getitem__)
+        return (columns.note_at(index) for index in indices)
+
+    def latest_notes(self, n: int) -> list[Note]:
+        columns = self._columns
+        dates = columns.dates
+        indices = heapq.nlargest(n, range(len(columns)), key=lambda index: (dates[index], index))
+        return [columns.note_at(index) for index in indices]
+
+    def page_with_most_notes(self) -> int:
+        counts = Counter(self._columns.pages)
+        if not counts:
+            return -1
+        return max(counts, key=counts.__getitem__)
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+EPOCH: datetime = datetime(1970, 1, 1)
+MICROSECOND: timedelta = timedelta(microseconds=1)
+NAIVE: int = -1 << 62
+
+
+def as_utc(date: datetime) -> datetime:
+    if date.tzinfo is None:
+        return date
+    return date.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_epoch_us(date: datetime) -> int:
+    return (as_utc(date) - EPOCH) // MICROSECOND
+
+
+def utc_offset_us(date: datetime) -> int:
+    offset = date.utcoffset()
+    return NAIVE if offset is None else offset // MICROSECOND
+
+
+def from_epoch_us(value: int, offset: int = NAIVE) -> datetime:
+    date = EPOCH + timedelta(microseconds=value)
+    if offset == NAIVE:
+        return date
+    zone = _zone(offset)
+    return (date + zone.utcoffset(None)).replace(tzinfo=zone)
+
+
+@lru_cache(maxsize=None)
+def _zone(offset: int) -> timezone:
+    return timezone(timedelta(microseconds=offset))
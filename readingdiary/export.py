@@ -0,0 +1,39 @@
+import csv
+import json
+from collections.abc import Iterable
+from itertools import islice
+from typing import TextIO
+
+from readingdiary.model import Book, Note
+
+FIELDS: tuple[str, ...] = ('isbn', 'text', 'page', 'date')
+WRITE_CHUNK: int = 1024
+
+
+def export_jsonl(rows: Iterable[tuple[Book, Note]], stream: TextIO) -> int:
+    count = 0
+    for book, note in rows:
+        stream.write(json.dumps({'isbn': book.isbn, 'text': note.text, 'page': note.page, 'date': note.date.isoformat()}))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+def export_csv(rows: Iterable[tuple[Book, Note]], stream: TextIO) -> int:
+    writer = csv.writer(stream)
+    writer.writerow(FIELDS)
+    count = 0
+    for book, note in rows:
+        writer.writerow((book.isbn, note.text, note.page, note.date.isoformat()))
+        count += 1
+    return count
+
+
+def write_notes(notes: Iterable[Note], stream: TextIO, with_ids: bool = False) -> int:
+    lines = (f'[{note.id}] {note}' for note in notes) if with_ids else map(str, notes)
+    count = 0
+    while chunk := list(islice(lines, WRITE_CHUNK)):
+        chunk.append('')
+        stream.write('\n'.join(chunk))
+        count += len(chunk) - 1
+    return count
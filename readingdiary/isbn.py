@@ -0,0 +1,82 @@
+from array import array
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INVALID_KEY: int = -1
+NUMPY_BATCH: int = 1024
+
+_ZERO = ord('0')
+_ISBN13_OFFSET = 25 * _ZERO
+_WEIGHTS13 = (1, 3) * 6 + (1,)
+_POWERS13 = tuple(10 ** (12 - i) for i in range(13))
+
+
+def isbn_key(isbn: str) -> int:
+    digits = isbn if isbn.isdigit() else isbn.replace('-', '').replace(' ', '')
+    if len(digits) == 13:
+        if not digits.isascii() or not digits.isdigit():
+            return INVALID_KEY
+        encoded = digits.encode()
+        if (sum(encoded[0::2]) + 3 * sum(encoded[1::2]) - _ISBN13_OFFSET) % 10:
+            return INVALID_KEY
+        return int(digits)
+    if len(digits) == 10:
+        return _isbn10_key(digits)
+    return INVALID_KEY
+
+
+def _isbn10_key(digits: str) -> int:
+    head = digits[:9]
+    if not head.isascii() or not head.isdigit():
+        return INVALID_KEY
+    check = digits[9]
+    if check in 'xX':
+        check_value = 10
+    elif check.isascii() and check.isdigit():
+        check_value = int(check)
+    else:
+        return INVALID_KEY
+    encoded = head.encode()
+    total = sum(weight * value for weight, value in zip(range(10, 1, -1), encoded)) - 54 * _ZERO + check_value
+    if total % 11:
+        return INVALID_KEY
+    key = 978_000_000_000 + int(head)
+    body = f'978{head}'.encode()
+    return key * 10 + (-(sum(body[0::2]) + 3 * sum(body[1::2]) - 24 * _ZERO)) % 10
+
+
+def is_valid_isbn(isbn: str) -> bool:
+    return isbn_key(isbn) != INVALID_KEY
+
+
+def normalize_isbn(isbn: str) -> str:
+    key = isbn_key(isbn)
+    if key == INVALID_KEY:
+        raise ValueError(f'Invalid ISBN: {isbn!r}')
+    return f'{key:013d}'
+
+
+def isbn_keys(isbns: Iterable[str], use_numpy: bool | None = None) -> array:
+    isbns = isbns if isinstance(isbns, list) else list(isbns)
+    if use_numpy is None:
+        use_numpy = np is not None and len(isbns) >= NUMPY_BATCH
+    if not use_numpy:
+        return array('q', map(isbn_key, isbns))
+
+    keys = np.full(len(isbns), INVALID_KEY, dtype=np.int64)
+    canonical = [index for index, isbn in enumerate(isbns) if len(isbn) == 13 and isbn.isascii() and isbn.isdigit()]
+    if canonical:
+        digits = np.frombuffer(''.join(isbns[index] for index in canonical).encode(), dtype=np.uint8)
+        digits = (digits - _ZERO).reshape(-1, 13).astype(np.int64)
+        valid = digits @ np.array(_WEIGHTS13, dtype=np.int64) % 10 == 0
+        indexes = np.array(canonical, dtype=np.int64)
+        keys[indexes[valid]] = digits[valid] @ np.array(_POWERS13, dtype=np.int64)
+    canonical_set = set(canonical)
+    for index, isbn in enumerate(isbns):
+        if index not in canonical_set:
+            keys[index] = isbn_key(isbn)
+    return array('q', keys.tobytes())
@@ -0,0 +1,297 @@
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
+
+from readingdiary.epoch import NAIVE, from_epoch_us, to_epoch_us, utc_offset_us
+from readingdiary.model import (Book, BookAdded, BookRemoved, NoteAdded, NotePopped, NoteRemoved, NoteRestored,
+                                NoteUpdated, RatingSet, ReadingDiary, Record)
+from readingdiary.storage import load_into, save_diary
+
+MAGIC: bytes = b'RDJL'
+VERSION: int = 1
+
+HEADER = struct.Struct('<4sHQ')
+FRAME = struct.Struct('<II')
+LENGTH = struct.Struct('<I')
+ADD_BOOK = struct.Struct('<Bq')
+ADD_NOTE = struct.Struct('<Bqq')
+RATE_BOOK = struct.Struct('<Bb')
+REMOVE_NOTE = struct.Struct('<Bq')
+PUT_NOTE = struct.Struct('<Bqqq')
+OP = struct.Struct('<B')
+
+OP_ADD_BOOK: int = 1
+OP_ADD_NOTE: int = 2
+OP_RATE_BOOK: int = 3
+OP_REMOVE_BOOK: int = 4
+OP_POP_NOTE: int = 5
+OP_BATCH: int = 6
+OP_REMOVE_NOTE: int = 7
+OP_RESTORE_NOTE: int = 8
+OP_UPDATE_NOTE: int = 9
+
+
+class Journal:
+
+    def __init__(self, path: str, sync_every: int = 64, sync_interval: float = 0.05):
+        self.path: str = path
+        self.sync_every: int = sync_every
+        self.sync_interval: float = sync_interval
+        self._buffer: bytearray = bytearray()
+        self._pending: int = 0
+        self._last_sync: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._file = open(path, 'ab')
+
+    @staticmethod
+    def create(path: str, generation: int):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, generation))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+
+    def append(self, payload: bytes):
+        frame = FRAME.pack(len(payload), zlib.crc32(payload))
+        with self._lock:
+            self._buffer += frame
+            self._buffer += payload
+            self._pending += 1
+            if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+            elif self._timer is None and math.isfinite(self.sync_interval):
+                self._timer = threading.Timer(self.sync_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer.clear()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+
+def read_journal(path: str) -> tuple[int, list[bytes], int]:
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f'{path} is not a reading diary journal')
+    magic, version, generation = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a reading diary journal')
+    if version != VERSION:
+        raise ValueError(f'Unsupported reading diary journal version: {version}')
+
+    records = []
+    position = HEADER.size
+    while position + FRAME.size <= len(data):
+        length, checksum = FRAME.unpack_from(data, position)
+        payload = data[position + FRAME.size:position + FRAME.size + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        records.append(payload)
+        position += FRAME.size + length
+
+    return generation, records, position
+
+
+def encode_add_book(isbn: str, title: str, author: str, pages: int) -> bytes:
+    return ADD_BOOK.pack(OP_ADD_BOOK, pages) + _encode_strs(isbn, title, author)
+
+
+def encode_add_note(isbn: str, text: str, page: int, date: datetime) -> bytes:
+    return ADD_NOTE.pack(OP_ADD_NOTE, page, to_epoch_us(date)) + _encode_strs(isbn, text, *_zone_strs(date))
+
+
+def encode_rate_book(isbn: str, rating: int) -> bytes:
+    return RATE_BOOK.pack(OP_RATE_BOOK, rating) + _encode_strs(isbn)
+
+
+def encode_remove_book(isbn: str) -> bytes:
+    return OP.pack(OP_REMOVE_BOOK) + _encode_strs(isbn)
+
+
+def encode_pop_note(isbn: str) -> bytes:
+    return OP.pack(OP_POP_NOTE) + _encode_strs(isbn)
+
+
+def encode_remove_note(isbn: str, note_id: int) -> bytes:
+    return REMOVE_NOTE.pack(OP_REMOVE_NOTE, note_id) + _encode_strs(isbn)
+
+
+def encode_restore_note(isbn: str, note_id: int, text: str, page: int, date: datetime) -> bytes:
+    header = PUT_NOTE.pack(OP_RESTORE_NOTE, note_id, page, to_epoch_us(date))
+    return header + _encode_strs(isbn, text, *_zone_strs(date))
+
+
+def encode_update_note(isbn: str, note_id: int, text: str, page: int, date: datetime) -> bytes:
+    header = PUT_NOTE.pack(OP_UPDATE_NOTE, note_id, page, to_epoch_us(date))
+    return header + _encode_strs(isbn, text, *_zone_strs(date))
+
+
+def encode_batch(payloads: list[bytes]) -> bytes:
+    return OP.pack(OP_BATCH) + b''.join(LENGTH.pack(len(payload)) + payload for payload in payloads)
+
+
+def encode_record(record: Record) -> bytes:
+    if isinstance(record, BookAdded):
+        return encode_add_book(*record)
+    elif isinstance(record, NoteAdded):
+        return encode_add_note(*record)
+    elif isinstance(record, RatingSet):
+        return encode_rate_book(record.isbn, record.rating)
+    elif isinstance(record, BookRemoved):
+        return encode_remove_book(record.isbn)
+    elif isinstance(record, NotePopped):
+        return encode_pop_note(record.isbn)
+    elif isinstance(record, NoteRemoved):
+        return encode_remove_note(record.isbn, record.note_id)
+    elif isinstance(record, NoteRestored):
+        return encode_restore_note(*record)
+    elif isinstance(record, NoteUpdated):
+        return encode_update_note(record.isbn, record.note_id, record.text, record.page, record.date)
+    raise ValueError(f'Unknown record type: {type(record).__name__}')
+
+
+def apply_record(diary: ReadingDiary, payload: bytes):
+    op = payload[0]
+    if op == OP_ADD_BOOK:
+        _, pages = ADD_BOOK.unpack_from(payload)
+        isbn, title, author = _decode_strs(payload, ADD_BOOK.size)
+        diary._add_book(isbn, title, author, pages)
+    elif op == OP_ADD_NOTE:
+        _, page, date = ADD_NOTE.unpack_from(payload)
+        isbn, text, *zone = _decode_strs(payload, ADD_NOTE.size)
+        diary.add_note_to_book(isbn, text, page, _decode_date(date, zone))
+    elif op == OP_RATE_BOOK:
+        _, rating = RATE_BOOK.unpack_from(payload)
+        (isbn,) = _decode_strs(payload, RATE_BOOK.size)
+        if Book.is_valid_rating(rating):
+            diary.rate_book(isbn, rating)
+        else:
+            diary.search_by_isbn(isbn).rating = rating
+    elif op == OP_REMOVE_BOOK:
+        (isbn,) = _decode_strs(payload, OP.size)
+        diary._remove_book(isbn)
+    elif op == OP_POP_NOTE:
+        (isbn,) = _decode_strs(payload, OP.size)
+        diary._pop_note(isbn)
+    elif op == OP_REMOVE_NOTE:
+        _, note_id = REMOVE_NOTE.unpack_from(payload)
+        (isbn,) = _decode_strs(payload, REMOVE_NOTE.size)
+        diary.remove_note(isbn, note_id)
+    elif op == OP_RESTORE_NOTE:
+        _, note_id, page, date = PUT_NOTE.unpack_from(payload)
+        isbn, text, *zone = _decode_strs(payload, PUT_NOTE.size)
+        diary._apply(NoteRestored(isbn, note_id, text, page, _decode_date(date, zone)))
+    elif op == OP_UPDATE_NOTE:
+        _, note_id, page, date = PUT_NOTE.unpack_from(payload)
+        isbn, text, *zone = _decode_strs(payload, PUT_NOTE.size)
+        diary.update_note(isbn, note_id, text, page, _decode_date(date, zone))
+    elif op == OP_BATCH:
+        with diary.batch():
+            for record in _decode_bytes(payload, OP.size):
+                apply_record(diary, record)
+    else:
+        raise ValueError(f'Unknown journal record type: {op}')
+
+
+def _zone_strs(date: datetime) -> tuple[str, ...]:
+    offset = utc_offset_us(date)
+    return () if offset == NAIVE else (str(offset),)
+
+
+def _decode_date(value: int, zone: list[str]) -> datetime:
+    return from_epoch_us(value, int(zone[0]) if zone else NAIVE)
+
+
+def _encode_strs(*values: str) -> bytes:
+    parts = []
+    for value in values:
+        encoded = value.encode()
+        parts.append(LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+
+def _decode_bytes(payload: bytes, position: int) -> Iterator[bytes]:
+    while position < len(payload):
+        (length,) = LENGTH.unpack_from(payload, position)
+        position += LENGTH.size
+        yield payload[position:position + length]
+        position += length
+
+
+def _decode_strs(payload: bytes, position: int) -> Iterator[str]:
+    return (value.decode() for value in _decode_bytes(payload, position))
+
+
+class JournaledDiary(ReadingDiary):
+
+    def __init__(self, path: str, book_type: type[Book] = Book, sync_every: int = 64, sync_interval: float = 0.05,
+                 compress: bool = False):
+        super().__init__(book_type)
+        self.path: str = path
+        self.compress: bool = compress
+        self.log_path: str = f'{path}.log'
+        self._journal: Journal | None = None
+
+        self._generation: int = 0
+        if os.path.exists(path):
+            self._generation = load_into(self, path)
+
+        if os.path.exists(self.log_path):
+            generation, records, valid_size = read_journal(self.log_path)
+            if generation > self._generation:
+                raise ValueError(f'{self.log_path} is newer than the snapshot {path}')
+            if generation == self._generation:
+                for payload in records:
+                    apply_record(self, payload)
+                os.truncate(self.log_path, valid_size)
+            else:
+                Journal.create(self.log_path, self._generation)
+        else:
+            Journal.create(self.log_path, self._generation)
+
+        self.clear_history()
+        self._journal = Journal(self.log_path, sync_every, sync_interval)
+
+    def _applied(self, records: tuple[Record, ...]):
+        if self._journal is not None:
+            payloads = [encode_record(record) for record in records]
+            self._journal.append(payloads[0] if len(payloads) == 1 else encode_batch(payloads))
+
+    def sync(self):
+        self._journal.sync()
+
+    def compact(self):
+        self._journal.close()
+        self._generation += 1
+        save_diary(self, self.path, self._generation, self.compress)
+        Journal.create(self.log_path, self._generation)
+        self._journal = Journal(self.log_path, self._journal.sync_every, self._journal.sync_interval)
+
+    def close(self):
+        self._journal.close()
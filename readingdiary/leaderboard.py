@@ -0,0 +1,54 @@
+import heapq
+import itertools
+from collections.abc import Hashable
+
+
+class Leaderboard:
+    COMPACT_SLACK: int = 64
+
+    def __init__(self):
+        self._heap: list[tuple[int, int, int, Hashable]] = []
+        self._entries: dict[Hashable, tuple[int, int, int]] = {}
+        self._ranks = itertools.count()
+        self._stamps = itertools.count()
+
+    def add(self, item: Hashable, count: int = 0):
+        self._entries[item] = (0, next(self._ranks), 0)
+        self.update(item, count)
+
+    def remove(self, item: Hashable):
+        del self._entries[item]
+
+    def update(self, item: Hashable, count: int):
+        rank = self._entries[item][1]
+        entry = (-count, rank, next(self._stamps))
+        self._entries[item] = entry
+        if count > 0:
+            heapq.heappush(self._heap, (*entry, item))
+            if len(self._heap) > 2 * len(self._entries) + self.COMPACT_SLACK:
+                self._compact()
+
+    def count(self, item: Hashable) -> int:
+        entry = self._entries.get(item)
+        return 0 if entry is None else -entry[0]
+
+    def top(self, k: int = 1) -> list[Hashable]:
+        heap = self._heap
+        top: list[Hashable] = []
+        kept: list[tuple[int, int, int, Hashable]] = []
+
+        while heap and len(top) < k:
+            entry = heapq.heappop(heap)
+            item = entry[3]
+            if self._entries.get(item) == entry[:3]:
+                top.append(item)
+                kept.append(entry)
+
+        for entry in kept:
+            heapq.heappush(heap, entry)
+
+        return top
+
+    def _compact(self):
+        self._heap = [(*entry, item) for item, entry in self._entries.items() if entry[0] < 0]
+        heapq.heapify(self._heap)
@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from readingdiary.model import ReadingDiary
+from readingdiary.server import DEFAULT_PORT, MAX_LINE, start_server
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def make_requests(rng: random.Random, isbn: str, count: int) -> list[dict]:
+    requests = [{'op': 'add_book', 'args': {'isbn': isbn, 'title': f'Book {isbn}', 'author': 'Load Generator',
+                                            'pages': 1000}}]
+    date = datetime(2021, 1, 1)
+    for i in range(1, count):
+        choice = rng.random()
+        if choice < 0.6:
+            args = {'isbn': isbn, 'text': f'note {i}', 'page': rng.randrange(1000),
+                    'date': (date + timedelta(minutes=i)).isoformat()}
+            requests.append({'op': 'add_note', 'args': args})
+        elif choice < 0.8:
+            requests.append({'op': 'notes_of_page', 'args': {'isbn': isbn, 'page': rng.randrange(1000)}})
+        elif choice < 0.9:
+            requests.append({'op': 'page_with_most_notes', 'args': {'isbn': isbn}})
+        else:
+            requests.append({'op': 'book_with_most_notes'})
+    return requests
+
+
+async def run_connection(open_connection, requests: list[dict], depth: int, batch: int,
+                         latencies: list[float]) -> int:
+    reader, writer = await open_connection()
+    lines = []
+    for first in range(0, len(requests), batch):
+        chunk = requests[first:first + batch]
+        lines.append(json.dumps(chunk if batch > 1 else chunk[0]).encode() + b'\n')
+
+    window = asyncio.Semaphore(depth)
+    sent = deque()
+    errors = 0
+
+    async def receive():
+        nonlocal errors
+        for _ in lines:
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.popleft())
+            window.release()
+            errors += sum('error' in item for item in (response if isinstance(response, list) else [response]))
+
+    receiver = asyncio.create_task(receive())
+    for line in lines:
+        await window.acquire()
+        sent.append(time.perf_counter())
+        writer.write(line)
+        await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+async def run_load(host: str, port: int, unix_path: str | None = None, connections: int = 8,
+                   requests: int = 10_000, depth: int = 32, batch: int = 1, seed: int = 7) -> dict:
+    if unix_path is not None:
+        def open_connection():
+            return asyncio.open_unix_connection(unix_path, limit=MAX_LINE)
+    else:
+        def open_connection():
+            return asyncio.open_connection(host, port, limit=MAX_LINE)
+
+    rng = random.Random(seed)
+    per_connection = max(1, requests // connections)
+    workloads = [make_requests(rng, f'load-{seed}-{n}', per_connection) for n in range(connections)]
+    latencies = []
+    started = time.perf_counter()
+    errors = await asyncio.gather(*(run_connection(open_connection, workload, depth, batch, latencies)
+                                    for workload in workloads))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = sum(len(workload) for workload in workloads)
+    return {
+        'requests': total,
+        'errors': sum(errors),
+        'seconds': elapsed,
+        'requests_per_second': total / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def run_in_process(**options) -> dict:
+    server = await start_server(ReadingDiary(), port=0)
+    async with server:
+        port = server.sockets[0].getsockname()[1]
+        return await run_load('127.0.0.1', port, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reading Diary server load generator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help='connect to this Unix socket instead of TCP')
+    parser.add_argument('--in-process', action='store_true', help='start an in-memory server in this process')
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=10_000, help='total requests over all connections')
+    parser.add_argument('--depth', type=int, default=32, help='lines in flight per connection')
+    parser.add_argument('--batch', type=int, default=1, help='requests per line; above 1 sends JSON arrays')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    options = {'connections': args.connections, 'requests': args.requests, 'depth': args.depth,
+               'batch': args.batch, 'seed': args.seed}
+    if args.in_process:
+        stats = asyncio.run(run_in_process(**options))
+    else:
+        stats = asyncio.run(run_load(args.host, args.port, args.unix, **options))
+
+    print(f"{stats['requests']} requests in {stats['seconds']:.2f}s, {stats['errors']} errors")
+    print(f"{stats['requests_per_second']:.0f} requests/s")
+    print(f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms per line")
+
+
+if __name__ == '__main__':
+    main()
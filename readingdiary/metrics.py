@@ -0,0 +1,180 @@
+import functools
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from readingdiary.model import Book, Note, ReadingDiary
+
+BUCKETS: int = 64
+
+OPERATIONS: dict[type, tuple[str, ...]] = {
+    Note: ('__str__',),
+    Book: ('add_note', 'remove_note', 'update_note', 'set_rating', 'get_note', 'get_notes_of_page',
+           'iter_notes_between', 'latest_notes', 'page_with_most_notes', '__str__'),
+    ReadingDiary: ('add_book', 'search_by_isbn', 'search_by_title', 'search_by_author', 'add_note_to_book',
+                   'rate_book', 'remove_note', 'update_note', 'search_notes', 'iter_notes_between', 'latest_notes',
+                   'book_with_most_notes', 'most_annotated_books', 'undo', 'redo'),
+}
+
+Tracer = Callable[[str, int, int], None]
+
+
+class Histogram:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count: int = 0
+        self.total: int = 0
+        self.max: int = 0
+        self.buckets: list[int] = [0] * BUCKETS
+
+    def record(self, nanoseconds: int):
+        self.count += 1
+        self.total += nanoseconds
+        self.max = max(self.max, nanoseconds)
+        self.buckets[min(nanoseconds.bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> int:
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(1 << bucket, self.max)
+        return self.max
+
+
+class Metrics:
+
+    def __init__(self):
+        self.counters: Counter[str] = Counter()
+        self.histograms: dict[str, Histogram] = {}
+        self._tracers: list[Tracer] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, name: str, started: int, finished: int):
+        nanoseconds = finished - started
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(nanoseconds)
+        for tracer in self._tracers:
+            tracer(name, started, nanoseconds)
+
+    def add_tracer(self, tracer: Tracer):
+        self._tracers.append(tracer)
+
+    def remove_tracer(self, tracer: Tracer):
+        self._tracers.remove(tracer)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            histograms = sorted(self.histograms.items(), key=lambda item: item[1].total, reverse=True)
+            return {name: {
+                'calls': histogram.count,
+                'errors': self.counters[f'{name}.errors'],
+                'rejected': self.counters[f'{name}.rejected'],
+                'total_ms': histogram.total / 1e6,
+                'mean_us': histogram.total / histogram.count / 1e3,
+                'p50_us': histogram.percentile(0.50) / 1e3,
+                'p99_us': histogram.percentile(0.99) / 1e3,
+                'max_us': histogram.max / 1e3,
+            } for name, histogram in histograms}
+
+    def report(self) -> str:
+        stats = self.snapshot()
+        if not stats:
+            return 'No operations recorded'
+        lines = [f"{'operation':<34} {'calls':>9} {'rejected':>9} {'errors':>7} {'total (ms)':>11} "
+                 f"{'mean (us)':>10} {'p50 (us)':>9} {'p99 (us)':>9} {'max (us)':>10}"]
+        for name, row in stats.items():
+            lines.append(f"{name:<34} {row['calls']:>9} {row['rejected']:>9} {row['errors']:>7} "
+                         f"{row['total_ms']:>11.2f} {row['mean_us']:>10.2f} {row['p50_us']:>9.2f} "
+                         f"{row['p99_us']:>9.2f} {row['max_us']:>10.1f}")
+        return '\n'.join(lines)
+
+
+METRICS: Metrics = Metrics()
+_originals: dict[tuple[type, str], Callable] = {}
+_active: Metrics | None = None
+_depth: int = 0
+
+
+def _instrument(function: Callable, name: str, metrics: Metrics) -> Callable:
+    clock = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = clock()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            metrics.count(f'{name}.errors')
+            raise
+        finally:
+            metrics.observe(name, started, clock())
+        if result is False:
+            metrics.count(f'{name}.rejected')
+        return result
+
+    return wrapper
+
+
+def _classes(root: type) -> Iterator[type]:
+    yield root
+    for subclass in root.__subclasses__():
+        yield from _classes(subclass)
+
+
+def enable(metrics: Metrics = METRICS) -> Metrics:
+    global _active, _depth
+    if _depth:
+        if metrics is not _active:
+            raise RuntimeError('Metrics are already enabled for another Metrics instance')
+        _depth += 1
+        return metrics
+    _active, _depth = metrics, 1
+    for root, names in OPERATIONS.items():
+        for cls in _classes(root):
+            for name in names:
+                function = cls.__dict__.get(name)
+                if callable(function):
+                    _originals[cls, name] = function
+                    setattr(cls, name, _instrument(function, f'{cls.__name__}.{name}', metrics))
+    return metrics
+
+
+def disable():
+    global _active, _depth
+    if _depth > 1:
+        _depth -= 1
+        return
+    _active, _depth = None, 0
+    for (cls, name), function in _originals.items():
+        setattr(cls, name, function)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+@contextmanager
+def enabled(metrics: Metrics = METRICS) -> Iterator[Metrics]:
+    enable(metrics)
+    try:
+        yield metrics
+    finally:
+        disable()
@@ -1,10 +1,110 @@
+import threading
+from bisect import bisect_left, bisect_right, insort_right
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import NamedTuple
+
+from readingdiary.epoch import as_utc
+from readingdiary.isbn import INVALID_KEY, isbn_key
+from readingdiary.leaderboard import Leaderboard
+from readingdiary.search import FuzzyIndex, NoteIndex, PrefixIndex
+
+_note_id = attrgetter('id')
+_entry_note = itemgetter(1)
+_entry_utc = itemgetter(0)
+
+RENDER_CACHE_SIZE: int = 4096
+LOCK_STRIPES: int = 64
+_locks = tuple(threading.RLock() for _ in range(LOCK_STRIPES))
+
+
+
+class BookAdded(NamedTuple):
+    isbn: str
+    title: str
+    author: str
+    pages: int
+
+
+class BookRemoved(NamedTuple):
+    isbn: str
+
+
+class NoteAdded(NamedTuple):
+    isbn: str
+    text: str
+    page: int
+    date: datetime
+
+
+class NotePopped(NamedTuple):
+    isbn: str
+
+
+class RatingSet(NamedTuple):
+    isbn: str
+    previous: int
+    rating: int
+
+
+class NoteRemoved(NamedTuple):
+    isbn: str
+    note_id: int
+    text: str
+    page: int
+    date: datetime
+
+
+class NoteRestored(NamedTuple):
+    isbn: str
+    note_id: int
+    text: str
+    page: int
+    date: datetime
+
+
+class NoteUpdated(NamedTuple):
+    isbn: str
+    note_id: int
+    old_text: str
+    old_page: int
+    old_date: datetime
+    text: str
+    page: int
+    date: datetime
+
+
+Record = BookAdded | BookRemoved | NoteAdded | NotePopped | RatingSet | NoteRemoved | NoteRestored | NoteUpdated
+
+
+def _lock_for(isbn: str) -> threading.RLock:
+    key = isbn_key(isbn)
+    return _locks[(hash(isbn) if key == INVALID_KEY else key) % LOCK_STRIPES]
+
+
+def _entry_date(entry: tuple['Book', 'Note']) -> datetime:
+    return as_utc(_entry_note(entry).date)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_book(isbn: str, title: str, author: str, pages: int, rating: int) -> str:
+    label = RATING_LABELS.get(rating, "unrated")
+    return f"ISBN: {isbn}\nTitle: {title}\nAuthor: {author}\nPages: {pages}\nRating: {label}"
+
 
 class Note:
+    __slots__ = ('text', 'page', 'date', 'id')
+
     def __init__(self, text: str, page: int, date: datetime):
         self.text: str = text
         self.page: int = page
         self.date: datetime = date
+        self.id: int = -1
 
     def __str__(self) -> str:
         return f"{self.date} - page {self.page}: {self.text}"
@@ -15,6 +115,12 @@ class Book:
     BAD: int = 1
     UNRATED: int = -1
 
+    note_type: type[Note] = Note
+
+    __slots__ = ('isbn', 'title', 'author', 'pages', 'rating', 'notes', '_next_id',
+                 '_notes_by_page', '_max_page', '_max_count', '_notes_by_date', '_dates',
+                 '_diary')
+
     def __init__(self, isbn: str, title: str, author: str, pages: int):
         self.isbn: str = isbn
         self.title: str = title
@@ -22,85 +128,284 @@ class Book:
         self.pages: int = pages
         self.rating: int = Book.UNRATED
         self.notes: list[Note] = []
+        self._next_id: int = 0
+        self._notes_by_page: dict[int, list[Note]] = {}
+        self._max_page: int | None = -1
+        self._max_count: int = 0
+        self._notes_by_date: list[Note] = []
+        self._dates: list[datetime] = []
+        self._diary: ReadingDiary | None = None
 
     def add_note(self, text: str, page: int, date: datetime) -> bool:
-        if page > self.pages:
+        if not self.is_valid_page(page):
             return False
         else:
-            self.notes.append(Note(text, page, date))
+            with self._writing(), _lock_for(self.isbn):
+                note = self._append_note(text, page, date)
+                if self._diary is not None:
+                    self._diary._note_added(self, note)
             return True
 
+    def get_note(self, note_id: int) -> Note | None:
+        index = bisect_left(self.notes, note_id, key=_note_id)
+        if index < len(self.notes) and self.notes[index].id == note_id:
+            return self.notes[index]
+        return None
+
+    def remove_note(self, note_id: int) -> bool:
+        with self._writing(), _lock_for(self.isbn):
+            note = self._remove_note(note_id)
+            if note is None:
+                return False
+            if self._diary is not None:
+                self._diary._note_removed(self, note)
+            return True
+
+    def update_note(self, note_id: int, text: str | None = None, page: int | None = None,
+                    date: datetime | None = None) -> bool:
+        with self._writing(), _lock_for(self.isbn):
+            old = self.get_note(note_id)
+            if old is None:
+                return False
+            new = self.note_type(old.text if text is None else text, old.page if page is None else page,
+                                 old.date if date is None else date)
+            if not self.is_valid_page(new.page):
+                return False
+            new.id = note_id
+            self._remove_note(note_id)
+            self._insert_note(new)
+            if self._diary is not None:
+                self._diary._note_updated(self, old, new)
+            return True
+
+    def _writing(self):
+        return nullcontext() if self._diary is None else self._diary._writing()
+
+    def _append_note(self, text: str, page: int, date: datetime) -> Note:
+        note = self.note_type(text, page, date)
+        note.id = self._next_id
+        self._index_note(note)
+        self.notes.append(note)
+        self._next_id += 1
+        return note
+
+    def _insert_note(self, note: Note):
+        self._index_note(note)
+        insort_right(self.notes, note, key=_note_id)
+        self._next_id = max(self._next_id, note.id + 1)
+
+    def _index_note(self, note: Note):
+        date = as_utc(note.date)
+        first = bisect_left(self._dates, date)
+        last = bisect_right(self._dates, date, lo=first)
+        index = bisect_right(self._notes_by_date, note.id, first, last, key=_note_id)
+        self._dates.insert(index, date)
+        self._notes_by_date.insert(index, note)
+        notes_of_page = self._notes_by_page.get(note.page)
+        if notes_of_page is None:
+            notes_of_page = self._notes_by_page[note.page] = []
+        insort_right(notes_of_page, note, key=_note_id)
+        if self._max_page is not None and self._beats_max_page(notes_of_page):
+            self._max_count = len(notes_of_page)
+            self._max_page = note.page
+
+    def _beats_max_page(self, notes_of_page: list[Note]) -> bool:
+        if len(notes_of_page) != self._max_count:
+            return len(notes_of_page) > self._max_count
+        return notes_of_page[0].id < self._notes_by_page[self._max_page][0].id
+
+    def _remove_note(self, note_id: int) -> Note | None:
+        note = self.get_note(note_id)
+        if note is None:
+            return None
+        del self.notes[bisect_left(self.notes, note_id, key=_note_id)]
+        notes_of_page = self._notes_by_page[note.page]
+        del notes_of_page[bisect_left(notes_of_page, note_id, key=_note_id)]
+        if not notes_of_page:
+            del self._notes_by_page[note.page]
+        if note.page == self._max_page:
+            self._max_page = None
+        date = as_utc(note.date)
+        first = bisect_left(self._dates, date)
+        last = bisect_right(self._dates, date, lo=first)
+        index = bisect_left(self._notes_by_date, note_id, first, last, key=_note_id)
+        del self._dates[index]
+        del self._notes_by_date[index]
+        return note
+
+    def _pop_note(self) -> Note:
+        note = self._remove_note(self.notes[-1].id)
+        self._next_id = note.id
+        return note
+
+    def is_valid_page(self, page: int) -> bool:
+        return page <= self.pages
+
+    @classmethod
+    def is_valid_rating(cls, rating: int) -> bool:
+        return rating in (cls.EXCELLENT, cls.GOOD, cls.BAD)
+
     def set_rating(self, rating: int) -> bool:
-        if rating not in (self.EXCELLENT, self.GOOD, self.BAD):
+        if not self.is_valid_rating(rating):
             return False
         else:
-            self.rating: int = rating
+            with self._writing(), _lock_for(self.isbn):
+                previous = self.rating
+                self.rating: int = rating
+                if self._diary is not None:
+                    self._diary._rating_set(self, previous)
             return True
 
     def get_notes_of_page(self, page: int) -> list[Note]:
-        notes_of_page: list[Note] = []
+        with _lock_for(self.isbn):
+            return list(self._notes_by_page.get(page, ()))
 
-        for note in self.notes:
-            if note.page == page:
-                notes_of_page.append(note)
+    def iter_notes(self) -> Iterator[Note]:
+        return iter(self.notes)
 
-        return notes_of_page
+    def iter_notes_of_page(self, page: int) -> Iterator[Note]:
+        return iter(self._notes_by_page.get(page, ()))
+
+    def iter_notes_in_pages(self, first: int, last: int) -> Iterator[Note]:
+        if last - first < len(self._notes_by_page):
+            pages = range(first, last + 1)
+        else:
+            pages = sorted(page for page in self._notes_by_page if first <= page <= last)
+        for page in pages:
+            yield from self._notes_by_page.get(page, ())
+
+    def iter_notes_between(self, start: datetime, end: datetime) -> Iterator[Note]:
+        with _lock_for(self.isbn):
+            first = bisect_left(self._dates, as_utc(start))
+            last = bisect_left(self._dates, as_utc(end), lo=first)
+            return iter(self._notes_by_date[first:last])
+
+    def latest_notes(self, n: int) -> list[Note]:
+        if n <= 0:
+            return []
+        with _lock_for(self.isbn):
+            return self._notes_by_date[:-n - 1:-1]
 
     def page_with_most_notes(self) -> int:
-        notes_of_page = {}
+        if self._max_page is None:
+            with _lock_for(self.isbn):
+                self._max_page, self._max_count = -1, 0
+                for page, notes_of_page in self._notes_by_page.items():
+                    if self._beats_max_page(notes_of_page):
+                        self._max_page, self._max_count = page, len(notes_of_page)
+        return self._max_page
 
-        for note in self.notes:
-            if note.page not in notes_of_page:
-                notes_of_page[note.page] = 1
-            else:
-                notes_of_page[note.page] += 1
+    def __str__(self) -> str:
+        return _render_book(self.isbn, self.title, self.author, self.pages, self.rating)
 
-        if not notes_of_page:
-            return -1
 
-        max_page = None
-        max_count = -1
+RATING_LABELS: dict[int, str] = {
+    Book.EXCELLENT: "excellent",
+    Book.GOOD: "good",
+    Book.BAD: "bad",
+    Book.UNRATED: "unrated",
+}
 
-        for page, count in notes_of_page.items():
-            if count > max_count:
-                max_count = count
-                max_page = page
 
-        return max_page
+class Batch:
+    __slots__ = ('records', 'books', 'notes', 'indexed')
 
-    def __str__(self) -> str:
-        texto = "unrated"
-        if self.rating == self.EXCELLENT:
-            texto = "excellent"
-        elif self.rating == self.GOOD:
-            texto = "good"
-        elif self.rating == self.BAD:
-            texto = "bad"
-        elif self.rating == self.UNRATED:
-            texto = "unrated"
+    def __init__(self):
+        self.records: list[Record] = []
+        self.books: list[Book] = []
+        self.notes: list[tuple[Book, Note]] = []
+        self.indexed: int = 0
 
-        return f"ISBN: {self.isbn}\nTitle: {self.title}\nAuthor: {self.author}\nPages: {self.pages}\nRating: {texto}"
 
+class DiaryBooks(dict):
 
+    def __init__(self, diary: 'ReadingDiary'):
+        super().__init__()
+        self._diary: ReadingDiary = diary
 
-class ReadingDiary:
+    def __getitem__(self, isbn: str) -> Book:
+        if isbn in self._diary._note_loaders:
+            self._diary._load_notes(isbn)
+        return super().__getitem__(isbn)
 
-    def __init__(self):
-        self.books: dict[str, Book] = { }
+    def get(self, isbn: str, default: Book | None = None) -> Book | None:
+        return self[isbn] if isbn in self else default
+
+    def values(self):
+        self._diary._load_all_notes()
+        return super().values()
+
+    def items(self):
+        self._diary._load_all_notes()
+        return super().items()
+
+
+class ReadingDiary:
+    HISTORY_SIZE: int = 10_000
+    movable_books: bool = True
+
+    def __init__(self, book_type: type[Book] = Book):
+        self.books: DiaryBooks = DiaryBooks(self)
+        self._isbn_index: dict[int, Book] = {}
+        self._book_type: type[Book] = book_type
+        self._leaderboard: Leaderboard = Leaderboard()
+        self._note_loaders: dict[str, Callable[[Book], None]] = {}
+        self._notes_by_date: list[tuple[datetime, Book, Note]] = []
+        self._notes_by_date_sorted: bool = True
+        self._removed_books: set[Book] = set()
+        self._removed_notes: int = 0
+        self._text_index: NoteIndex | None = None
+        self._title_prefixes: PrefixIndex = PrefixIndex()
+        self._author_prefixes: PrefixIndex = PrefixIndex()
+        self._fuzzy_titles: FuzzyIndex = FuzzyIndex()
+        self._fuzzy_authors: FuzzyIndex = FuzzyIndex()
+        self._catalog_built: bool = False
+        self._leaderboard_lock: threading.Lock = threading.Lock()
+        self._dates_lock: threading.Lock = threading.Lock()
+        self._text_lock: threading.Lock = threading.Lock()
+        self._catalog_lock: threading.Lock = threading.Lock()
+        self._history_lock: threading.Lock = threading.Lock()
+        self._batch: Batch | None = None
+        self._batch_gate: threading.Condition = threading.Condition()
+        self._batch_owner: int | None = None
+        self._writers: int = 0
+        self._history: deque[tuple[Record, ...]] = deque()
+        self._history_size: int = 0
+        self._redo: list[tuple[Record, ...]] = []
+        self._on_commit: Callable[[ReadingDiary], None] | None = None
+        self._version: int = 0
 
     def add_book(self, isbn: str, title: str, author: str, pages: int) -> bool:
-        if isbn in self.books:
-            return False
-        else:
-            new_book = Book(isbn, title, author, pages)
-            self.books[isbn] = new_book
-            return True
+        with self._writing(), _lock_for(isbn):
+            if isbn in self.books or isbn_key(isbn) in self._isbn_index:
+                return False
+            else:
+                self._add_book(isbn, title, author, pages)
+                return True
 
     def search_by_isbn(self, isbn: str) -> Book | None:
-        if isbn in self.books:
-            return self.books[isbn]
-        else:
-            return None
+        if isbn not in self.books:
+            book = self._isbn_index.get(isbn_key(isbn))
+            if book is None:
+                return None
+            isbn = book.isbn
+        return self.books[isbn]
+
+    def search_by_title(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Book]:
+        if not self._catalog_built:
+            self._build_catalog()
+        index = self._fuzzy_titles if fuzzy else self._title_prefixes
+        with self._catalog_lock:
+            books = index.search(query, limit)
+        return self._loaded(books)
+
+    def search_by_author(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Book]:
+        if not self._catalog_built:
+            self._build_catalog()
+        index = self._fuzzy_authors if fuzzy else self._author_prefixes
+        with self._catalog_lock:
+            books = index.search(query, limit)
+        return self._loaded(books)
 
     def add_note_to_book(self, isbn: str, text: str, page: int, date: datetime) -> bool:
         book = self.search_by_isbn(isbn)
@@ -114,23 +419,444 @@ class ReadingDiary:
             return False
         return book.set_rating(rating)
 
-    def book_with_most_notes(self) -> Book | None:
-        if not self.books:
-            return None
-
-        max_notes = -1
-        book_with_max = None
+    def iter_notes(self) -> Iterator[tuple[Book, Note]]:
+        for isbn in self.books:
+            book = self.search_by_isbn(isbn)
+            for note in book.iter_notes():
+                yield book, note
+
+    def iter_notes_between(self, start: datetime, end: datetime) -> Iterator[tuple[Book, Note]]:
+        self._load_all_notes()
+        with self._dates_lock:
+            notes_by_date = self._sorted_notes_by_date()
+            first = bisect_left(notes_by_date, as_utc(start), key=_entry_utc)
+            last = bisect_left(notes_by_date, as_utc(end), lo=first, key=_entry_utc)
+            removed = self._removed_books
+            return iter([(book, note) for _, book, note in notes_by_date[first:last] if book not in removed])
+
+    def latest_notes(self, n: int) -> list[tuple[Book, Note]]:
+        if n <= 0:
+            return []
+        self._load_all_notes()
+        with self._dates_lock:
+            notes_by_date = self._sorted_notes_by_date()
+            if not self._removed_books:
+                return [(book, note) for _, book, note in notes_by_date[:-n - 1:-1]]
+            live = ((book, note) for _, book, note in reversed(notes_by_date) if book not in self._removed_books)
+            return list(islice(live, n))
+
+    def search_notes(self, query: str, isbn: str | None = None, page: int | None = None,
+                     limit: int = 10) -> list[tuple[Book, Note]]:
+        if isbn is not None:
+            book = self.search_by_isbn(isbn)
+            if book is None:
+                return []
+            isbn = book.isbn
+        return [entry for _, entry in self._scored_notes(query, isbn, page, limit)]
 
-        for book in self.books.values():
-            num_notes = len(book.notes)
-            if num_notes > max_notes:
-                max_notes = num_notes
-                book_with_max = book
+    def book_with_most_notes(self) -> Book | None:
+        top = self.most_annotated_books(1)
+        return top[0] if top else None
 
-        if max_notes == 0:
-            return None
+    def most_annotated_books(self, k: int) -> list[Book]:
+        with self._leaderboard_lock:
+            books = self._leaderboard.top(k)
+        return self._loaded(books)
 
-        return book_with_max
+    def remove_note(self, isbn: str, note_id: int) -> bool:
+        book = self.search_by_isbn(isbn)
+        if book is None:
+            return False
+        return book.remove_note(note_id)
 
+    def update_note(self, isbn: str, note_id: int, text: str | None = None, page: int | None = None,
+                    date: datetime | None = None) -> bool:
+        book = self.search_by_isbn(isbn)
+        if book is None:
+            return False
+        return book.update_note(note_id, text, page, date)
+
+    @contextmanager
+    def batch(self):
+        if self._batch_owner == threading.get_ident():
+            yield
+            return
+        with self._exclusive():
+            self._batch = batch = Batch()
+            try:
+                yield
+            except BaseException:
+                self._batch = None
+                self._revert(batch.records[batch.indexed:], indexed=False)
+                self._revert(batch.records[:batch.indexed])
+                raise
+            self._batch = None
+            self._index_batch(batch)
+            if batch.records:
+                self._commit(tuple(batch.records))
+
+    def undo(self) -> bool:
+        if self._batch_owner == threading.get_ident():
+            raise RuntimeError('Cannot undo inside a batch')
+        with self._writing():
+            with self._history_lock:
+                if not self._history:
+                    return False
+                records = self._history.pop()
+                self._history_size -= len(records)
+            self._revert(records)
+            with self._history_lock:
+                self._redo.append(records)
+            self._applied(self._inverse(records))
+            return True
 
+    def redo(self) -> bool:
+        if self._batch_owner == threading.get_ident():
+            raise RuntimeError('Cannot redo inside a batch')
+        with self._writing():
+            with self._history_lock:
+                if not self._redo:
+                    return False
+                records = self._redo.pop()
+            for record in records:
+                self._apply(record)
+            with self._history_lock:
+                self._remember(records)
+            self._applied(records)
+            return True
 
+    @contextmanager
+    def _writing(self):
+        if self._batch_owner == threading.get_ident():
+            yield
+            return
+        with self._batch_gate:
+            while self._batch_owner is not None:
+                self._batch_gate.wait()
+            self._writers += 1
+        try:
+            yield
+        finally:
+            with self._batch_gate:
+                self._writers -= 1
+                if not self._writers:
+                    self._batch_gate.notify_all()
+
+    @contextmanager
+    def _exclusive(self):
+        with self._batch_gate:
+            while self._batch_owner is not None or self._writers:
+                self._batch_gate.wait()
+            self._batch_owner = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._batch_gate:
+                self._batch_owner = None
+                self._batch_gate.notify_all()
+
+    def clear_history(self):
+        with self._history_lock:
+            self._history.clear()
+            self._history_size = 0
+            self._redo.clear()
+
+    def _log(self, record: Record):
+        self._version += 1
+        if self._batch is not None:
+            self._batch.records.append(record)
+        else:
+            self._commit((record,))
+
+    def _commit(self, records: tuple[Record, ...]):
+        with self._history_lock:
+            self._remember(records)
+            self._redo.clear()
+        self._applied(records)
+        if self._on_commit is not None:
+            self._on_commit(self)
+
+    def _remember(self, records: tuple[Record, ...]):
+        self._history.append(records)
+        self._history_size += len(records)
+        while self._history_size > self.HISTORY_SIZE:
+            self._history_size -= len(self._history.popleft())
+
+    def _applied(self, records: tuple[Record, ...]):
+        pass
+
+    @staticmethod
+    def _inverse(records: tuple[Record, ...]) -> tuple[Record, ...]:
+        inverse = []
+        for record in reversed(records):
+            if isinstance(record, BookAdded):
+                inverse.append(BookRemoved(record.isbn))
+            elif isinstance(record, NoteAdded):
+                inverse.append(NotePopped(record.isbn))
+            elif isinstance(record, RatingSet):
+                inverse.append(RatingSet(record.isbn, record.rating, record.previous))
+            elif isinstance(record, NoteRemoved):
+                inverse.append(NoteRestored(*record))
+            elif isinstance(record, NoteRestored):
+                inverse.append(NoteRemoved(*record))
+            else:
+                inverse.append(NoteUpdated(record.isbn, record.note_id, record.text, record.page, record.date,
+                                           record.old_text, record.old_page, record.old_date))
+        return tuple(inverse)
+
+    def _revert(self, records: list[Record] | tuple[Record, ...], indexed: bool = True):
+        for record in self._inverse(records):
+            self._apply(record, indexed)
+
+    def _apply(self, record: Record, indexed: bool = True):
+        self._version += 1
+        isbn = record.isbn
+        if isinstance(record, BookAdded):
+            self._insert_book(*record)
+        elif isinstance(record, BookRemoved):
+            self._remove_book(isbn, indexed)
+        elif isinstance(record, NoteAdded):
+            book = self.books[isbn]
+            with _lock_for(isbn):
+                self._index_notes([(book, book._append_note(record.text, record.page, record.date))])
+        elif isinstance(record, NotePopped):
+            self._pop_note(isbn, indexed)
+        elif isinstance(record, RatingSet):
+            self.books[isbn].rating = record.rating
+        else:
+            book = self.search_by_isbn(isbn)
+            with _lock_for(isbn):
+                if not isinstance(record, NoteRestored):
+                    self._unindex_note(book, book._remove_note(record.note_id))
+                if not isinstance(record, NoteRemoved):
+                    note = book.note_type(record.text, record.page, record.date)
+                    note.id = record.note_id
+                    book._insert_note(note)
+                    self._index_notes([(book, note)])
+
+    def _add_book(self, isbn: str, title: str, author: str, pages: int) -> Book:
+        new_book = self._insert_book(isbn, title, author, pages)
+        if self._batch is not None:
+            self._batch.books.append(new_book)
+        self._log(BookAdded(isbn, title, author, pages))
+        return new_book
+
+    def _insert_book(self, isbn: str, title: str, author: str, pages: int) -> Book:
+        self._version += 1
+        new_book = self._book_type(isbn, title, author, pages)
+        new_book._diary = self
+        if self._batch is None:
+            with self._leaderboard_lock:
+                self._leaderboard.add(new_book)
+        self.books[isbn] = new_book
+        key = isbn_key(isbn)
+        if key != INVALID_KEY:
+            self._isbn_index.setdefault(key, new_book)
+        if self._batch is None:
+            self._catalog_book(new_book)
+        return new_book
+
+    def _index_book(self, book: Book):
+        with self._leaderboard_lock:
+            self._leaderboard.add(book)
+        self._catalog_book(book)
+
+    def _catalog_book(self, book: Book):
+        with self._catalog_lock:
+            if self._catalog_built:
+                self._add_to_catalog(book)
+
+    def _add_to_catalog(self, book: Book):
+        self._title_prefixes.add(book, book.title)
+        self._author_prefixes.add(book, book.author)
+        self._fuzzy_titles.add(book, book.title)
+        self._fuzzy_authors.add(book, book.author)
+
+    def _build_catalog(self):
+        with self._writing():
+            if self._batch is not None:
+                self._index_batch(self._batch)
+            with self._catalog_lock:
+                if not self._catalog_built:
+                    for book in list(dict.values(self.books)):
+                        self._add_to_catalog(book)
+                    self._catalog_built = True
+
+    def _index_batch(self, batch: Batch):
+        for book in batch.books:
+            self._index_book(book)
+        self._index_notes(batch.notes, sort=False)
+        batch.books.clear()
+        batch.notes.clear()
+        batch.indexed = len(batch.records)
+
+    def _index_notes(self, entries: list[tuple[Book, Note]], sort: bool = True):
+        if not entries:
+            return
+        self._version += 1
+        with self._leaderboard_lock:
+            for book, count in Counter(book for book, _ in entries).items():
+                self._leaderboard.update(book, self._leaderboard.count(book) + count)
+        with self._dates_lock:
+            if sort and len(entries) == 1 and self._notes_by_date_sorted:
+                book, note = entries[0]
+                insort_right(self._notes_by_date, (as_utc(note.date), book, note), key=_entry_utc)
+            else:
+                self._notes_by_date.extend((as_utc(note.date), book, note) for book, note in entries)
+                self._notes_by_date_sorted = False
+        with self._text_lock:
+            if self._text_index is not None:
+                for book, note in entries:
+                    self._text_index.add(book, note)
+
+    def _unindex_note(self, book: Book, note: Note):
+        with self._leaderboard_lock:
+            self._leaderboard.update(book, self._leaderboard.count(book) - 1)
+        with self._dates_lock:
+            entries = self._sorted_notes_by_date()
+            date = as_utc(note.date)
+            first = bisect_left(entries, date, key=_entry_utc)
+            last = bisect_right(entries, date, lo=first, key=_entry_utc)
+            for index in range(last - 1, first - 1, -1):
+                if entries[index][1] is book and entries[index][2].id == note.id:
+                    del entries[index]
+                    break
+        with self._text_lock:
+            if self._text_index is not None:
+                self._text_index.remove(book, note)
+
+    def _note_added(self, book: Book, note: Note):
+        if self._batch is not None:
+            self._batch.notes.append((book, note))
+        else:
+            self._index_notes([(book, note)])
+        self._log(NoteAdded(book.isbn, note.text, note.page, note.date))
+
+    def _note_removed(self, book: Book, note: Note):
+        if self._batch is not None:
+            self._index_batch(self._batch)
+        self._unindex_note(book, note)
+        self._log(NoteRemoved(book.isbn, note.id, note.text, note.page, note.date))
+        if self._batch is not None:
+            self._batch.indexed = len(self._batch.records)
+
+    def _note_updated(self, book: Book, old: Note, new: Note):
+        if self._batch is not None:
+            self._index_batch(self._batch)
+        self._unindex_note(book, old)
+        self._index_notes([(book, new)])
+        self._log(NoteUpdated(book.isbn, new.id, old.text, old.page, old.date, new.text, new.page, new.date))
+        if self._batch is not None:
+            self._batch.indexed = len(self._batch.records)
+
+    def _scored_notes(self, query: str, isbn: str | None, page: int | None,
+                      limit: int) -> list[tuple[float, tuple[Book, Note]]]:
+        self._load_all_notes()
+        if self._text_index is None:
+            self._build_text_index()
+        with self._text_lock:
+            return self._text_index.scored(query, isbn, page, limit)
+
+    def _build_text_index(self):
+        with self._writing():
+            if self._batch is not None:
+                self._index_batch(self._batch)
+            with self._text_lock:
+                if self._text_index is None:
+                    index = NoteIndex()
+                    for book in list(self.books.values()):
+                        for note in book.iter_notes():
+                            index.add(book, note)
+                    self._text_index = index
+
+    def _note_count(self, book: Book) -> int:
+        with self._leaderboard_lock:
+            return self._leaderboard.count(book)
+
+    def _sorted_notes_by_date(self) -> list[tuple[datetime, Book, Note]]:
+        if not self._notes_by_date_sorted:
+            self._notes_by_date.sort(key=_entry_utc)
+            self._notes_by_date_sorted = True
+        return self._notes_by_date
+
+    def _rating_set(self, book: Book, previous: int):
+        self._log(RatingSet(book.isbn, previous, book.rating))
+
+    def _remove_book(self, isbn: str, indexed: bool = True) -> Book:
+        with _lock_for(isbn):
+            return self._remove_books([isbn], indexed)[0]
+
+    def _remove_books(self, isbns: list[str], indexed: bool = True) -> list[Book]:
+        self._version += 1
+        books = [self.books.pop(isbn) for isbn in isbns]
+        for book in books:
+            self._note_loaders.pop(book.isbn, None)
+            key = isbn_key(book.isbn)
+            if self._isbn_index.get(key) is book:
+                del self._isbn_index[key]
+        if not indexed:
+            return books
+        removed = set(books)
+        with self._leaderboard_lock:
+            annotated = {book: self._leaderboard.count(book) for book in books if self._leaderboard.count(book) > 0}
+            for book in books:
+                self._leaderboard.remove(book)
+        with self._catalog_lock:
+            if self._catalog_built:
+                self._title_prefixes.remove_all(removed)
+                self._author_prefixes.remove_all(removed)
+                self._fuzzy_titles.remove_all(removed)
+                self._fuzzy_authors.remove_all(removed)
+        if annotated:
+            with self._dates_lock:
+                self._removed_books.update(annotated)
+                self._removed_notes += sum(annotated.values())
+                if 2 * self._removed_notes > len(self._notes_by_date):
+                    self._notes_by_date = [entry for entry in self._notes_by_date
+                                           if entry[1] not in self._removed_books]
+                    self._removed_books = set()
+                    self._removed_notes = 0
+            with self._text_lock:
+                if self._text_index is not None:
+                    self._text_index.remove_books(annotated.keys())
+        return books
+
+    def _pop_note(self, isbn: str, indexed: bool = True) -> Note:
+        book = self.search_by_isbn(isbn)
+        with _lock_for(isbn):
+            note = book._pop_note()
+            if indexed:
+                self._unindex_note(book, note)
+            return note
+
+    def _defer_notes(self, book: Book, note_count: int, loader: Callable[[Book], None]):
+        self._note_loaders[book.isbn] = loader
+        with self._leaderboard_lock:
+            self._leaderboard.update(book, note_count)
+
+    def _load_notes(self, isbn: str):
+        with _lock_for(isbn):
+            loader = self._note_loaders.pop(isbn, None)
+            if loader is None:
+                return
+            book = self.books[isbn]
+            loader(book)
+            notes = list(book.iter_notes())
+            with self._dates_lock:
+                self._notes_by_date.extend((as_utc(note.date), book, note) for note in notes)
+                self._notes_by_date_sorted = False
+            with self._text_lock:
+                if self._text_index is not None:
+                    for note in notes:
+                        self._text_index.add(book, note)
+
+    def _loaded(self, books: list[Book]) -> list[Book]:
+        if self._note_loaders:
+            for book in books:
+                if book.isbn in self._note_loaders:
+                    self._load_notes(book.isbn)
+        return books
+
+    def _load_all_notes(self):
+        for isbn in list(self._note_loaders):
+            self._load_notes(isbn)
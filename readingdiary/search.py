@@ -0,0 +1,265 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from difflib import SequenceMatcher
+
+TOKEN = re.compile(r'\w+')
+SIMILARITY: float = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.casefold())
+
+
+class NoteIndex:
+    K1: float = 1.2
+    B: float = 0.75
+
+    def __init__(self):
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._counts: dict[str, int] = {}
+        self._docs: dict[int, tuple] = {}
+        self._doc_ids: dict[tuple, int] = {}
+        self._lengths: dict[int, int] = {}
+        self._total_length: int = 0
+        self._next_id: int = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, book, note):
+        if (book, note.id) in self._doc_ids:
+            return
+        doc_id = self._next_id
+        self._next_id += 1
+        terms = Counter(tokenize(note.text))
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('q'), array('i'))
+            postings[0].append(doc_id)
+            postings[1].append(frequency)
+            self._counts[term] = self._counts.get(term, 0) + 1
+        self._docs[doc_id] = (book, note)
+        self._doc_ids[book, note.id] = doc_id
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, book, note):
+        doc_id = self._doc_ids.get((book, note.id))
+        if doc_id is not None:
+            self._delete(doc_id)
+
+    def remove_book(self, book):
+        self.remove_books({book})
+
+    def remove_books(self, books: set):
+        for book in books:
+            for note in book.iter_notes():
+                self.remove(book, note)
+
+    def _delete(self, doc_id: int):
+        book, note = self._docs.pop(doc_id)
+        del self._doc_ids[book, note.id]
+        for term in set(tokenize(note.text)):
+            count = self._counts[term] - 1
+            if not count:
+                del self._counts[term]
+                del self._postings[term]
+                continue
+            self._counts[term] = count
+            doc_ids, frequencies = self._postings[term]
+            if 2 * count < len(doc_ids):
+                live = [index for index, posted in enumerate(doc_ids) if posted in self._docs]
+                self._postings[term] = (array('q', [doc_ids[index] for index in live]),
+                                        array('i', [frequencies[index] for index in live]))
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def search(self, query: str, isbn: str | None = None, page: int | None = None, limit: int = 10) -> list[tuple]:
+        return [doc for _, doc in self.scored(query, isbn, page, limit)]
+
+    def scored(self, query: str, isbn: str | None = None, page: int | None = None,
+               limit: int = 10) -> list[tuple[float, tuple]]:
+        if not self._docs:
+            return []
+
+        num_docs = len(self._docs)
+        average_length = self._total_length / num_docs or 1
+        scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            count = self._counts.get(term)
+            if not count:
+                continue
+            idf = math.log(1 + (num_docs - count + 0.5) / (count + 0.5))
+            for doc_id, frequency in zip(*self._postings[term]):
+                doc = self._docs.get(doc_id)
+                if doc is None:
+                    continue
+                if isbn is not None or page is not None:
+                    book, note = doc
+                    if (isbn is not None and book.isbn != isbn) or (page is not None and note.page != page):
+                        continue
+                norm = self.K1 * (1 - self.B + self.B * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + norm)
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, self._docs[doc_id]) for doc_id, score in best]
+
+
+def word_grams(word: str) -> set[str]:
+    padded = f'${word}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fuzzy_score(query_words: list[str], text: str, similarity: float = SIMILARITY) -> float | None:
+    words = set(tokenize(text))
+    score = 0.0
+    for query_word in query_words:
+        best = max((SequenceMatcher(None, query_word, word).ratio() for word in words), default=0.0)
+        if best < similarity:
+            return None
+        score += best
+    return score
+
+
+class PrefixIndex:
+    TAIL_SIZE: int = 4096
+
+    def __init__(self):
+        self._entries: list[tuple[str, int, object]] = []
+        self._tail: list[tuple[str, int, object]] = []
+        self._next_rank: int = 0
+        self._ranks: dict[object, tuple[int, int]] = {}
+        self._removed: set[int] = set()
+        self._garbage: int = 0
+
+    def add(self, item, text: str):
+        if item in self._ranks:
+            return
+        rank = self._next_rank
+        self._next_rank += 1
+        key = text.casefold()
+        count = len(self._tail)
+        for match in TOKEN.finditer(key):
+            self._tail.append((key[match.start():], rank, item))
+        self._ranks[item] = (rank, len(self._tail) - count)
+
+    def remove(self, item):
+        self.remove_all({item})
+
+    def remove_all(self, items: set):
+        for item in items:
+            rank, count = self._ranks.pop(item, (-1, 0))
+            if count:
+                self._removed.add(rank)
+                self._garbage += count
+        if 2 * self._garbage > len(self._entries) + len(self._tail):
+            removed = self._removed
+            self._entries = [entry for entry in self._entries if entry[1] not in removed]
+            self._tail = [entry for entry in self._tail if entry[1] not in removed]
+            self._removed = set()
+            self._garbage = 0
+
+    def search(self, prefix: str, limit: int = 10) -> list:
+        prefix = prefix.casefold().strip()
+        if not prefix:
+            return []
+        if len(self._tail) > self.TAIL_SIZE:
+            self._entries += self._tail
+            self._tail = []
+            self._entries.sort()
+        else:
+            self._tail.sort()
+
+        results = []
+        seen: set[int] = set()
+        matches = _prefix_matches(self._entries, prefix)
+        if self._tail:
+            matches = heapq.merge(matches, _prefix_matches(self._tail, prefix))
+        for _, rank, item in matches:
+            if len(results) >= limit:
+                break
+            if rank not in seen and rank not in self._removed:
+                seen.add(rank)
+                results.append(item)
+        return results
+
+
+def _prefix_matches(entries: list[tuple[str, int, object]], prefix: str) -> Iterator[tuple[str, int, object]]:
+    index = bisect_left(entries, (prefix,))
+    while index < len(entries) and entries[index][0].startswith(prefix):
+        yield entries[index]
+        index += 1
+
+
+class FuzzyIndex:
+
+    def __init__(self):
+        self._items: list = []
+        self._ids: dict[object, int] = {}
+        self._words: dict[str, list[int]] = {}
+        self._grams: dict[str, set[str]] = {}
+
+    def add(self, item, text: str):
+        if item in self._ids:
+            return
+        item_id = len(self._items)
+        self._items.append(item)
+        self._ids[item] = item_id
+        for word in set(tokenize(text)):
+            item_ids = self._words.get(word)
+            if item_ids is None:
+                item_ids = self._words[word] = []
+                for gram in word_grams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+            item_ids.append(item_id)
+
+    def remove(self, item):
+        self.remove_all({item})
+
+    def remove_all(self, items: set):
+        for item in items:
+            item_id = self._ids.pop(item, None)
+            if item_id is not None:
+                self._items[item_id] = None
+
+    def search(self, query: str, limit: int = 10) -> list:
+        scores: dict[int, float] | None = None
+        for query_word in set(tokenize(query)):
+            best: dict[int, float] = {}
+            for word, similarity in self._similar_words(query_word):
+                for item_id in self._words[word]:
+                    if self._items[item_id] is not None and similarity > best.get(item_id, 0.0):
+                        best[item_id] = similarity
+            if scores is None:
+                scores = best
+            else:
+                scores = {item_id: score + best[item_id] for item_id, score in scores.items() if item_id in best}
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._items[item_id] for item_id, _ in ranked]
+
+    def _similar_words(self, query_word: str) -> Iterator[tuple[str, float]]:
+        grams = word_grams(query_word)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        needed = max(1, len(grams) - 4)
+        for word, count in shared.items():
+            if count < needed or abs(len(word) - len(query_word)) > 2:
+                continue
+            matcher = SequenceMatcher(None, query_word, word)
+            if matcher.quick_ratio() >= SIMILARITY:
+                similarity = matcher.ratio()
+                if similarity >= SIMILARITY:
+                    yield word, similarity
@@ -0,0 +1,222 @@
+import argparse
+import asyncio
+import inspect
+import json
+import typing
+from datetime import datetime
+
+from readingdiary.journal import JournaledDiary
+from readingdiary.metrics import METRICS, enable
+from readingdiary.model import Book, Note, ReadingDiary
+
+READ_SIZE: int = 2**16
+MAX_LINE: int = 2**20
+DEFAULT_PORT: int = 7878
+
+
+def book_to_dict(book: Book) -> dict:
+    return {'isbn': book.isbn, 'title': book.title, 'author': book.author, 'pages': book.pages,
+            'rating': book.rating}
+
+
+def note_to_dict(note: Note) -> dict:
+    return {'id': note.id, 'text': note.text, 'page': note.page, 'date': note.date.isoformat()}
+
+
+def parse_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid date')
+
+
+def argument_types(operation) -> dict[str, tuple[type, ...]]:
+    hints = typing.get_type_hints(operation)
+    hints.pop('return', None)
+    return {name: typing.get_args(hint) or (hint,) for name, hint in hints.items()}
+
+
+def check_arguments(signature: inspect.Signature, types: dict[str, tuple[type, ...]], args: dict):
+    signature.bind(**args)
+    for name, value in args.items():
+        allowed = types[name]
+        if not isinstance(value, allowed) or (isinstance(value, bool) and bool not in allowed):
+            raise TypeError(f'Invalid argument: {name}')
+
+
+def encode(response) -> bytes:
+    return json.dumps(response, separators=(',', ':')).encode() + b'\n'
+
+
+class DiaryService:
+
+    def __init__(self, diary: ReadingDiary):
+        self.diary: ReadingDiary = diary
+        self.operations = {
+            'add_book': self.add_book,
+            'add_note': self.add_note,
+            'rate_book': self.rate_book,
+            'remove_note': self.remove_note,
+            'update_note': self.update_note,
+            'search_by_isbn': self.search_by_isbn,
+            'search_by_title': self.search_by_title,
+            'search_by_author': self.search_by_author,
+            'search_notes': self.search_notes,
+            'notes_of_page': self.notes_of_page,
+            'page_with_most_notes': self.page_with_most_notes,
+            'book_with_most_notes': self.book_with_most_notes,
+            'stats': self.stats,
+        }
+        self.signatures = {name: (inspect.signature(operation), argument_types(operation))
+                           for name, operation in self.operations.items()}
+
+    def add_book(self, isbn: str, title: str, author: str, pages: int) -> bool:
+        return self.diary.add_book(isbn, title, author, pages)
+
+    def add_note(self, isbn: str, text: str, page: int, date: str) -> bool:
+        return self.diary.add_note_to_book(isbn, text, page, parse_date(date))
+
+    def remove_note(self, isbn: str, note_id: int) -> bool:
+        return self.diary.remove_note(isbn, note_id)
+
+    def update_note(self, isbn: str, note_id: int, text: str | None = None, page: int | None = None,
+                    date: str | None = None) -> bool:
+        return self.diary.update_note(isbn, note_id, text, page, None if date is None else parse_date(date))
+
+    def rate_book(self, isbn: str, rating: int) -> bool:
+        return self.diary.rate_book(isbn, rating)
+
+    def search_by_isbn(self, isbn: str) -> dict | None:
+        book = self.diary.search_by_isbn(isbn)
+        return None if book is None else book_to_dict(book)
+
+    def search_by_title(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[dict]:
+        return [book_to_dict(book) for book in self.diary.search_by_title(query, fuzzy, limit)]
+
+    def search_by_author(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[dict]:
+        return [book_to_dict(book) for book in self.diary.search_by_author(query, fuzzy, limit)]
+
+    def search_notes(self, query: str, isbn: str | None = None, page: int | None = None,
+                     limit: int = 10) -> list[dict]:
+        return [{'isbn': book.isbn, **note_to_dict(note)}
+                for book, note in self.diary.search_notes(query, isbn, page, limit)]
+
+    def notes_of_page(self, isbn: str, page: int) -> list[dict] | None:
+        book = self.diary.search_by_isbn(isbn)
+        if book is None:
+            return None
+        return [note_to_dict(note) for note in book.iter_notes_of_page(page)]
+
+    def page_with_most_notes(self, isbn: str) -> int | None:
+        book = self.diary.search_by_isbn(isbn)
+        return None if book is None else book.page_with_most_notes()
+
+    def book_with_most_notes(self) -> dict | None:
+        book = self.diary.book_with_most_notes()
+        return None if book is None else book_to_dict(book)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return METRICS.snapshot()
+
+    def handle(self, request) -> dict:
+        if not isinstance(request, dict):
+            return {'error': 'Invalid request'}
+        response = {'id': request['id']} if 'id' in request else {}
+        op = request.get('op')
+        operation = self.operations.get(op) if isinstance(op, str) else None
+        if operation is None:
+            response['error'] = f"Unknown operation: {op}"
+            return response
+        args = request.get('args', {})
+        if not isinstance(args, dict):
+            response['error'] = 'Invalid arguments'
+            return response
+        try:
+            check_arguments(*self.signatures[op], args)
+        except TypeError:
+            response['error'] = 'Invalid arguments'
+            return response
+        try:
+            response['result'] = operation(**args)
+        except ValueError as error:
+            response['error'] = str(error)
+        except Exception as error:
+            response['error'] = f'Internal error: {type(error).__name__}'
+        return response
+
+    def handle_line(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+        except (ValueError, RecursionError):
+            return encode({'error': 'Invalid JSON'})
+        if isinstance(request, list):
+            return encode([self._respond(item) for item in request])
+        return encode(self._respond(request))
+
+    def _respond(self, request) -> dict:
+        try:
+            return self.handle(request)
+        except Exception as error:
+            return {'error': f'Internal error: {type(error).__name__}'}
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = b''
+        try:
+            while data := await reader.read(READ_SIZE):
+                lines = (pending + data).split(b'\n')
+                pending = lines.pop()
+                writer.write(b''.join(self.handle_line(line) for line in lines if line.strip()))
+                if len(pending) > MAX_LINE:
+                    writer.write(encode({'error': 'Request too long'}))
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def start_server(diary: ReadingDiary, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                       unix_path: str | None = None) -> asyncio.Server:
+    service = DiaryService(diary)
+    if unix_path is not None:
+        return await asyncio.start_unix_server(service.serve_client, unix_path)
+    return await asyncio.start_server(service.serve_client, host, port)
+
+
+async def serve(diary: ReadingDiary, host: str, port: int, unix_path: str | None):
+    server = await start_server(diary, host, port, unix_path)
+    address = unix_path or f'{host}:{port}'
+    print(f"Serving reading diary on {address}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reading Diary server')
+    parser.add_argument('diary', nargs='?', help='diary file; changes are journaled to <diary>.log until exit')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--stats', action='store_true', help='record per-operation metrics, served by the stats op')
+    args = parser.parse_args()
+
+    if args.stats:
+        enable()
+
+    diary = JournaledDiary(args.diary) if args.diary is not None else ReadingDiary()
+    try:
+        asyncio.run(serve(diary, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.diary is not None:
+            diary.compact()
+            diary.close()
+            print(f"Diary saved to {args.diary}")
+        if args.stats:
+            print(METRICS.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+import heapq
+import itertools
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+from readingdiary.isbn import INVALID_KEY, isbn_key
+from readingdiary.model import (Book, BookAdded, BookRemoved, Note, NoteRestored, RatingSet, ReadingDiary,
+                                _entry_date, _lock_for)
+from readingdiary.search import TOKEN, fuzzy_score, tokenize
+
+ShardFactory = Callable[[int], ReadingDiary]
+
+REBALANCE_STEP: int = 256
+
+
+def shard_key(isbn: str) -> int:
+    key = isbn_key(isbn)
+    return zlib.crc32(isbn.encode() if key == INVALID_KEY else key.to_bytes(8, 'little'))
+
+
+def _prefix_key(text: str, prefix: str) -> str:
+    key = text.casefold()
+    return min((key[match.start():] for match in TOKEN.finditer(key) if key.startswith(prefix, match.start())),
+               default=key)
+
+
+class ShardedBooks(Mapping):
+
+    def __init__(self, diary: 'ShardedDiary'):
+        self._diary: ShardedDiary = diary
+
+    def __getitem__(self, isbn: str) -> Book:
+        return self._diary._shard_for(isbn).books[isbn]
+
+    def __contains__(self, isbn: object) -> bool:
+        return isinstance(isbn, str) and isbn in self._diary._shard_for(isbn).books
+
+    def __iter__(self) -> Iterator[str]:
+        return (isbn for isbn in list(self._diary._sequence) if isbn in self)
+
+    def __len__(self) -> int:
+        return sum(len(shard.books) for shard in self._diary.shards)
+
+
+class ShardedDiary:
+
+    def __init__(self, shard_count: int = 4, book_type: type[Book] = Book,
+                 shard_factory: ShardFactory | None = None):
+        if shard_count < 1:
+            raise ValueError(f'Invalid shard count: {shard_count}')
+        self._factory: ShardFactory = shard_factory or (lambda index: ReadingDiary(book_type))
+        self.shards: list[ReadingDiary] = []
+        self.books: ShardedBooks = ShardedBooks(self)
+        self._count: int = shard_count
+        self._previous: int | None = None
+        self._retired_version: int = 0
+        self._sequence: dict[str, int] = {}
+        self._ranks = itertools.count()
+        self._group: list[ReadingDiary] | None = None
+        self._history: deque[tuple[ReadingDiary, ...]] = deque(maxlen=ReadingDiary.HISTORY_SIZE)
+        self._redo: list[tuple[ReadingDiary, ...]] = []
+        for _ in range(shard_count):
+            self._add_shard()
+        for shard in self.shards:
+            for isbn in shard.books:
+                self._sequence[isbn] = next(self._ranks)
+
+    @property
+    def shard_count(self) -> int:
+        return self._count
+
+    @property
+    def _version(self) -> int:
+        return self._retired_version + sum(shard._version for shard in self.shards)
+
+    def add_book(self, isbn: str, title: str, author: str, pages: int) -> bool:
+        with _lock_for(isbn):
+            if isbn in self.books:
+                return False
+            if not self.shards[shard_key(isbn) % self._count].add_book(isbn, title, author, pages):
+                return False
+            self._sequence.pop(isbn, None)
+            self._sequence[isbn] = next(self._ranks)
+            return True
+
+    def search_by_isbn(self, isbn: str) -> Book | None:
+        return self._shard_for(isbn).search_by_isbn(isbn)
+
+    def search_by_title(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Book]:
+        books = [book for shard in self.shards for book in shard.search_by_title(query, fuzzy, limit)]
+        return self._merge_books(books, 'title', query, fuzzy, limit)
+
+    def search_by_author(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Book]:
+        books = [book for shard in self.shards for book in shard.search_by_author(query, fuzzy, limit)]
+        return self._merge_books(books, 'author', query, fuzzy, limit)
+
+    def add_note_to_book(self, isbn: str, text: str, page: int, date: datetime) -> bool:
+        return self._shard_for(isbn).add_note_to_book(isbn, text, page, date)
+
+    def rate_book(self, isbn: str, rating: int) -> bool:
+        return self._shard_for(isbn).rate_book(isbn, rating)
+
+    def remove_note(self, isbn: str, note_id: int) -> bool:
+        return self._shard_for(isbn).remove_note(isbn, note_id)
+
+    def update_note(self, isbn: str, note_id: int, text: str | None = None, page: int | None = None,
+                    date: datetime | None = None) -> bool:
+        return self._shard_for(isbn).update_note(isbn, note_id, text, page, date)
+
+    def iter_notes(self) -> Iterator[tuple[Book, Note]]:
+        for isbn in self.books:
+            book = self.search_by_isbn(isbn)
+            for note in book.iter_notes():
+                yield book, note
+
+    def iter_notes_between(self, start: datetime, end: datetime) -> Iterator[tuple[Book, Note]]:
+        return heapq.merge(*(shard.iter_notes_between(start, end) for shard in self.shards), key=_entry_date)
+
+    def latest_notes(self, n: int) -> list[tuple[Book, Note]]:
+        if n <= 0:
+            return []
+        latest = heapq.merge(*(shard.latest_notes(n) for shard in self.shards), key=_entry_date, reverse=True)
+        return list(itertools.islice(latest, n))
+
+    def search_notes(self, query: str, isbn: str | None = None, page: int | None = None,
+                     limit: int = 10) -> list[tuple[Book, Note]]:
+        if isbn is not None:
+            return self._shard_for(isbn).search_notes(query, isbn, page, limit)
+        scored = [(score, self._sequence.get(entry[0].isbn, -1), entry[1].id, entry)
+                  for shard in self.shards for score, entry in shard._scored_notes(query, isbn, page, limit)]
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1], item[2]))
+        return [entry for _, _, _, entry in best]
+
+    def book_with_most_notes(self) -> Book | None:
+        top = self.most_annotated_books(1)
+        return top[0] if top else None
+
+    def most_annotated_books(self, k: int) -> list[Book]:
+        if k <= 0:
+            return []
+        counted = [(-count, self._sequence.get(book.isbn, -1), book)
+                   for shard in self.shards for count, book in self._top_books(shard, k)]
+        return [book for _, _, book in heapq.nsmallest(k, counted, key=lambda item: item[:2])]
+
+    @contextmanager
+    def batch(self):
+        if self._group is not None:
+            yield
+            return
+        self._group = group = []
+        try:
+            with ExitStack() as stack:
+                for shard in self.shards:
+                    stack.enter_context(shard.batch())
+                yield
+        finally:
+            self._group = None
+        if group:
+            self._history.append(tuple(group))
+            self._redo.clear()
+
+    def undo(self) -> bool:
+        if self._group is not None:
+            raise RuntimeError('Cannot undo inside a batch')
+        if not self._history:
+            return False
+        group = self._history.pop()
+        for shard in reversed(group):
+            shard.undo()
+        self._redo.append(group)
+        return True
+
+    def redo(self) -> bool:
+        if self._group is not None:
+            raise RuntimeError('Cannot redo inside a batch')
+        if not self._redo:
+            return False
+        group = self._redo.pop()
+        for shard in group:
+            shard.redo()
+        self._history.append(group)
+        return True
+
+    def clear_history(self):
+        self._history.clear()
+        self._redo.clear()
+        for shard in self.shards:
+            shard.clear_history()
+
+    def reshard(self, shard_count: int):
+        for _ in self.rebalance(shard_count):
+            pass
+
+    def rebalance(self, shard_count: int, step: int = REBALANCE_STEP) -> Iterator[list[str]]:
+        if shard_count < 1:
+            raise ValueError(f'Invalid shard count: {shard_count}')
+        if self._group is not None:
+            raise RuntimeError('Cannot rebalance inside a batch')
+        if self._previous is None:
+            count = len(self.shards)
+            while len(self.shards) < shard_count:
+                self._add_shard()
+            fixed = [shard for shard in self.shards if not shard.movable_books]
+            if fixed:
+                self._drop_shards(count)
+                raise TypeError(f'Cannot move books between {type(fixed[0]).__name__} shards')
+            self.clear_history()
+            self._previous, self._count = self._count, shard_count
+        elif shard_count != self._count:
+            raise RuntimeError(f'A rebalance to {self._count} shards is still running')
+
+        for source in self.shards[:self._previous]:
+            moves: dict[int, list[str]] = {}
+            for isbn in source.books:
+                index = shard_key(isbn) % self._count
+                if self.shards[index] is not source:
+                    moves.setdefault(index, []).append(isbn)
+            for index, isbns in moves.items():
+                isbns.sort(key=lambda isbn: self._sequence.get(isbn, -1))
+                for first in range(0, len(isbns), step):
+                    chunk = [isbn for isbn in isbns[first:first + step] if isbn in source.books]
+                    self._move(chunk, source, self.shards[index])
+                    yield chunk
+
+        self._previous = None
+        self._drop_shards(self._count)
+        self.clear_history()
+
+    def _add_shard(self):
+        shard = self._factory(len(self.shards))
+        shard._on_commit = self._committed
+        self.shards.append(shard)
+
+    def _drop_shards(self, count: int):
+        for shard in self.shards[count:]:
+            self._retired_version += shard._version
+            close = getattr(shard, 'close', None)
+            if close is not None:
+                close()
+        del self.shards[count:]
+
+    def _shard_for(self, isbn: str) -> ReadingDiary:
+        key = shard_key(isbn)
+        shard = self.shards[key % self._count]
+        if self._previous is not None and shard.search_by_isbn(isbn) is None:
+            return self.shards[key % self._previous]
+        return shard
+
+    def _committed(self, shard: ReadingDiary):
+        if self._group is None:
+            self._history.append((shard,))
+            self._redo.clear()
+        elif shard not in self._group:
+            self._group.append(shard)
+
+    def _move(self, isbns: list[str], source: ReadingDiary, target: ReadingDiary):
+        entries: list[tuple[Book, Note]] = []
+        for isbn in isbns:
+            book = source.search_by_isbn(isbn)
+            record = BookAdded(isbn, book.title, book.author, book.pages)
+            target._apply(record)
+            target._applied((record,))
+            moved = target.books[isbn]
+            if book.rating != Book.UNRATED:
+                moved.rating = book.rating
+                target._applied((RatingSet(isbn, Book.UNRATED, book.rating),))
+            for note in book.iter_notes():
+                moved._insert_note(note)
+                entries.append((moved, note))
+                target._applied((NoteRestored(isbn, note.id, note.text, note.page, note.date),))
+            moved._next_id = book._next_id
+        target._index_notes(entries, sort=False)
+        source._remove_books(isbns)
+        for isbn in isbns:
+            source._applied((BookRemoved(isbn),))
+
+    def _top_books(self, shard: ReadingDiary, k: int) -> list[tuple[int, Book]]:
+        # Moved books rank after a shard's own books on ties, so widen until the k-th count is passed.
+        limit = k + 1
+        while True:
+            top = [(shard._note_count(book), book) for book in shard.most_annotated_books(limit)]
+            if len(top) < limit or top[-1][0] < top[k - 1][0]:
+                return top
+            limit *= 2
+
+    def _merge_books(self, books: list[Book], field: str, query: str, fuzzy: bool, limit: int) -> list[Book]:
+        if fuzzy:
+            words = tokenize(query)
+            ranked = [(-(fuzzy_score(words, getattr(book, field)) or 0.0), self._sequence.get(book.isbn, -1), book)
+                      for book in books]
+        else:
+            prefix = query.casefold().strip()
+            ranked = [(_prefix_key(getattr(book, field), prefix), self._sequence.get(book.isbn, -1), book)
+                      for book in books]
+        return [book for _, _, book in heapq.nsmallest(limit, ranked, key=lambda item: item[:2])]
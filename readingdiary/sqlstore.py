@@ -0,0 +1,366 @@
+import sqlite3
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from datetime import datetime
+
+from readingdiary.epoch import NAIVE, from_epoch_us, to_epoch_us, utc_offset_us
+from readingdiary.isbn import INVALID_KEY, isbn_key
+from readingdiary.model import Batch, Book, Note, ReadingDiary
+from readingdiary.search import fuzzy_score, tokenize
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    isbn TEXT NOT NULL UNIQUE,
+    isbn_key INTEGER,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    pages INTEGER NOT NULL,
+    rating INTEGER NOT NULL,
+    note_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    isbn TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    date INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    zone INTEGER
+);
+CREATE INDEX IF NOT EXISTS notes_isbn_page ON notes (isbn, page);
+CREATE INDEX IF NOT EXISTS notes_isbn_date ON notes (isbn, date);
+CREATE INDEX IF NOT EXISTS notes_date ON notes (date);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(text, content='notes', content_rowid='id');
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(title, author, content='books', content_rowid='id');
+CREATE VIRTUAL TABLE IF NOT EXISTS books_trigrams USING fts5(
+    title, author, content='books', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+    INSERT INTO books_trigrams (rowid, title, author) VALUES (new.id, new.title, new.author);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF text ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO notes_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE INDEX IF NOT EXISTS books_note_count ON books (note_count DESC, id);
+"""
+
+
+def _note(note_id: int, text: str, page: int, date: int, zone: int | None) -> Note:
+    note = Note(text, page, from_epoch_us(date, NAIVE if zone is None else zone))
+    note.id = note_id
+    return note
+
+
+def _zone(date: datetime) -> int | None:
+    offset = utc_offset_us(date)
+    return None if offset == NAIVE else offset
+
+
+class SQLiteBook(Book):
+    __slots__ = ('_db',)
+
+    def __init__(self, db: sqlite3.Connection, isbn: str, title: str, author: str, pages: int):
+        self._db: sqlite3.Connection = db
+        self.isbn: str = isbn
+        self.title: str = title
+        self.author: str = author
+        self.pages: int = pages
+        self._diary = None
+
+    @property
+    def rating(self) -> int:
+        return self._db.execute("SELECT rating FROM books WHERE isbn = ?", (self.isbn,)).fetchone()[0]
+
+    @rating.setter
+    def rating(self, rating: int):
+        self._db.execute("UPDATE books SET rating = ? WHERE isbn = ?", (rating, self.isbn))
+        if self._diary is not None:
+            self._diary._written()
+
+    @property
+    def notes(self) -> list[Note]:
+        return list(self.iter_notes())
+
+    def get_note(self, note_id: int) -> Note | None:
+        return next(self._select("WHERE isbn = ? AND id = ?", self.isbn, note_id), None)
+
+    def _append_note(self, text: str, page: int, date: datetime) -> Note:
+        cursor = self._db.execute(
+            "INSERT INTO notes (isbn, page, date, zone, text) VALUES (?, ?, ?, ?, ?)",
+            (self.isbn, page, to_epoch_us(date), _zone(date), text))
+        self._db.execute("UPDATE books SET note_count = note_count + 1 WHERE isbn = ?", (self.isbn,))
+        note = Note(text, page, date)
+        note.id = cursor.lastrowid
+        return note
+
+    def _insert_note(self, note: Note):
+        self._db.execute(
+            "INSERT INTO notes (id, isbn, page, date, zone, text) VALUES (?, ?, ?, ?, ?, ?)",
+            (note.id, self.isbn, note.page, to_epoch_us(note.date), _zone(note.date), note.text))
+        self._db.execute("UPDATE books SET note_count = note_count + 1 WHERE isbn = ?", (self.isbn,))
+
+    def _remove_note(self, note_id: int) -> Note | None:
+        note = self.get_note(note_id)
+        if note is None:
+            return None
+        self._db.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        self._db.execute("UPDATE books SET note_count = note_count - 1 WHERE isbn = ?", (self.isbn,))
+        return note
+
+    def get_notes_of_page(self, page: int) -> list[Note]:
+        return list(self.iter_notes_of_page(page))
+
+    def iter_notes(self) -> Iterator[Note]:
+        return self._select("WHERE isbn = ? ORDER BY id", self.isbn)
+
+    def iter_notes_of_page(self, page: int) -> Iterator[Note]:
+        return self._select("WHERE isbn = ? AND page = ? ORDER BY id", self.isbn, page)
+
+    def iter_notes_in_pages(self, first: int, last: int) -> Iterator[Note]:
+        return self._select("WHERE isbn = ? AND page BETWEEN ? AND ? ORDER BY page, id", self.isbn, first, last)
+
+    def iter_notes_between(self, start: datetime, end: datetime) -> Iterator[Note]:
+        return self._select(
+            "WHERE isbn = ? AND date >= ? AND date < ? ORDER BY date, id", self.isbn, to_epoch_us(start), to_epoch_us(end))
+
+    def latest_notes(self, n: int) -> list[Note]:
+        return list(self._select("WHERE isbn = ? ORDER BY date DESC, id DESC LIMIT ?", self.isbn, max(n, 0)))
+
+    def _select(self, where: str, *params) -> Iterator[Note]:
+        rows = self._db.execute(f"SELECT id, text, page, date, zone FROM notes {where}", params)
+        return (_note(*row) for row in rows)
+
+    def page_with_most_notes(self) -> int:
+        row = self._db.execute(
+            "SELECT page FROM notes WHERE isbn = ? GROUP BY page ORDER BY COUNT(*) DESC, MIN(id) LIMIT 1",
+            (self.isbn,)).fetchone()
+        return -1 if row is None else row[0]
+
+
+class SQLiteBooks(Mapping):
+
+    def __init__(self, diary: 'SQLiteReadingDiary'):
+        self._diary: SQLiteReadingDiary = diary
+
+    def __getitem__(self, isbn: str) -> SQLiteBook:
+        row = self._diary._db.execute(
+            "SELECT isbn, title, author, pages FROM books WHERE isbn = ?", (isbn,)).fetchone()
+        if row is None:
+            raise KeyError(isbn)
+        return self._diary._book(row)
+
+    def __contains__(self, isbn: object) -> bool:
+        return self._diary._db.execute("SELECT 1 FROM books WHERE isbn = ?", (isbn,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (isbn for (isbn,) in self._diary._db.execute("SELECT isbn FROM books ORDER BY id"))
+
+    def __len__(self) -> int:
+        return self._diary._db.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+
+class SQLiteReadingDiary(ReadingDiary):
+    movable_books: bool = False
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        super().__init__(Book)
+        self._db: sqlite3.Connection = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(SCHEMA)
+        self._index_isbn_keys()
+        self._add_note_zones()
+        self.books: SQLiteBooks = SQLiteBooks(self)
+        self.batch_size: int = batch_size
+        self._pending_writes: int = 0
+
+    def add_book(self, isbn: str, title: str, author: str, pages: int) -> bool:
+        key = isbn_key(isbn)
+        try:
+            self._db.execute(
+                "INSERT INTO books (isbn, isbn_key, title, author, pages, rating) VALUES (?, ?, ?, ?, ?, ?)",
+                (isbn, None if key == INVALID_KEY else key, title, author, pages, Book.UNRATED))
+        except sqlite3.IntegrityError:
+            return False
+        self._written()
+        return True
+
+    def search_by_isbn(self, isbn: str) -> Book | None:
+        book = self.books.get(isbn)
+        if book is None:
+            key = isbn_key(isbn)
+            if key != INVALID_KEY:
+                row = self._db.execute(
+                    "SELECT isbn, title, author, pages FROM books WHERE isbn_key = ?", (key,)).fetchone()
+                if row is not None:
+                    book = self._book(row)
+        return book
+
+    def iter_notes_between(self, start: datetime, end: datetime) -> Iterator[tuple[Book, Note]]:
+        return self._select_notes(
+            "WHERE date >= ? AND date < ? ORDER BY date, id", to_epoch_us(start), to_epoch_us(end))
+
+    def latest_notes(self, n: int) -> list[tuple[Book, Note]]:
+        return list(self._select_notes("ORDER BY date DESC, id DESC LIMIT ?", max(n, 0)))
+
+    def search_by_title(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Book]:
+        return self._search_books('title', query, fuzzy, limit)
+
+    def search_by_author(self, query: str, fuzzy: bool = False, limit: int = 10) -> list[Book]:
+        return self._search_books('author', query, fuzzy, limit)
+
+    def search_notes(self, query: str, isbn: str | None = None, page: int | None = None,
+                     limit: int = 10) -> list[tuple[Book, Note]]:
+        if isbn is not None:
+            book = self.search_by_isbn(isbn)
+            if book is None:
+                return []
+            isbn = book.isbn
+        return [entry for _, entry in self._scored_notes(query, isbn, page, limit)]
+
+    def _scored_notes(self, query: str, isbn: str | None, page: int | None,
+                      limit: int) -> list[tuple[float, tuple[Book, Note]]]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        sql = ("SELECT -bm25(notes_fts), notes.isbn, notes.id, notes.text, notes.page, notes.date, notes.zone FROM notes_fts "
+               "JOIN notes ON notes.id = notes_fts.rowid WHERE notes_fts MATCH ?")
+        params: list = [' OR '.join(f'"{term}"' for term in terms)]
+        if isbn is not None:
+            sql += " AND notes.isbn = ?"
+            params.append(isbn)
+        if page is not None:
+            sql += " AND notes.page = ?"
+            params.append(page)
+        sql += " ORDER BY bm25(notes_fts), notes.id LIMIT ?"
+        params.append(limit)
+        return [(score, (self.books[isbn], _note(*row))) for score, isbn, *row in self._db.execute(sql, params)]
+
+    def _note_count(self, book: Book) -> int:
+        row = self._db.execute("SELECT note_count FROM books WHERE isbn = ?", (book.isbn,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def book_with_most_notes(self) -> Book | None:
+        top = self.most_annotated_books(1)
+        return top[0] if top else None
+
+    def most_annotated_books(self, k: int) -> list[Book]:
+        rows = self._db.execute(
+            "SELECT isbn, title, author, pages FROM books WHERE note_count > 0 ORDER BY note_count DESC, id LIMIT ?",
+            (k,))
+        return [self._book(row) for row in rows]
+
+    @contextmanager
+    def batch(self):
+        if self._batch_owner == threading.get_ident():
+            yield
+            return
+        with self._exclusive():
+            self.commit()
+            self._batch = Batch()
+            try:
+                yield
+            except BaseException:
+                self._db.rollback()
+                self._version += 1
+                raise
+            else:
+                self.commit()
+            finally:
+                self._batch = None
+
+    def commit(self):
+        self._db.commit()
+        self._pending_writes = 0
+
+    def close(self):
+        self.commit()
+        self._db.close()
+
+    def _index_isbn_keys(self):
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(books)")}
+        if 'isbn_key' not in columns:
+            self._db.execute("ALTER TABLE books ADD COLUMN isbn_key INTEGER")
+            keys: dict[int, int] = {}
+            for book_id, isbn in self._db.execute("SELECT id, isbn FROM books ORDER BY id").fetchall():
+                key = isbn_key(isbn)
+                if key != INVALID_KEY:
+                    keys.setdefault(key, book_id)
+            self._db.executemany("UPDATE books SET isbn_key = ? WHERE id = ?", keys.items())
+        self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS books_isbn_key ON books (isbn_key)")
+        self._db.commit()
+
+    def _add_note_zones(self):
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(notes)")}
+        if 'zone' not in columns:
+            self._db.execute("ALTER TABLE notes ADD COLUMN zone INTEGER")
+            self._db.commit()
+
+    def _search_books(self, column: str, query: str, fuzzy: bool, limit: int) -> list[Book]:
+        words = tokenize(query)
+        if not fuzzy:
+            if not words:
+                return []
+            terms = ' '.join(f'"{word}"' for word in words) + '*'
+            rows = self._db.execute(
+                "SELECT books.isbn, books.title, books.author, books.pages FROM books_fts "
+                "JOIN books ON books.id = books_fts.rowid WHERE books_fts MATCH ? "
+                "ORDER BY bm25(books_fts), books.id LIMIT ?",
+                (f'{column} : ({terms})', limit))
+            return [self._book(row) for row in rows]
+
+        grams = {word[i:i + 3] for word in words for i in range(len(word) - 2)}
+        if not grams:
+            return []
+        terms = ' OR '.join(f'"{gram}"' for gram in grams)
+        rows = self._db.execute(
+            "SELECT books.id, books.isbn, books.title, books.author, books.pages FROM books_trigrams "
+            "JOIN books ON books.id = books_trigrams.rowid WHERE books_trigrams MATCH ? "
+            "ORDER BY bm25(books_trigrams) LIMIT ?",
+            (f'{column} : ({terms})', 50 * limit))
+        scored = []
+        for book_id, *row in rows:
+            score = fuzzy_score(words, row[1] if column == 'title' else row[2])
+            if score is not None:
+                scored.append((-score, book_id, row))
+        scored.sort()
+        return [self._book(row) for _, _, row in scored[:limit]]
+
+    def _select_notes(self, where: str, *params) -> Iterator[tuple[Book, Note]]:
+        books: dict[str, SQLiteBook] = {}
+        rows = self._db.execute(f"SELECT isbn, id, text, page, date, zone FROM notes {where}", params)
+        for isbn, *row in rows:
+            if isbn not in books:
+                books[isbn] = self.books[isbn]
+            yield books[isbn], _note(*row)
+
+    def _book(self, row: tuple[str, str, str, int]) -> SQLiteBook:
+        book = SQLiteBook(self._db, *row)
+        book._diary = self
+        return book
+
+    def _note_added(self, book: Book, note: Note):
+        self._written()
+
+    def _note_removed(self, book: Book, note: Note):
+        self._written()
+
+    def _note_updated(self, book: Book, old: Note, new: Note):
+        self._written()
+
+    def _rating_set(self, book: Book, previous: int):
+        pass
+
+    def _written(self):
+        self._version += 1
+        self._pending_writes += 1
+        if self._pending_writes >= self.batch_size and self._batch is None:
+            self.commit()
@@ -0,0 +1,164 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable
+from functools import partial
+from typing import BinaryIO
+
+from readingdiary.epoch import NAIVE, from_epoch_us, to_epoch_us, utc_offset_us
+from readingdiary.model import Book, Note, ReadingDiary
+
+MAGIC: bytes = b'RDRY'
+VERSION: int = 3
+FLAG_COMPRESSED: int = 1
+FLAG_ZONED: int = 2
+FLAGS: int = FLAG_COMPRESSED | FLAG_ZONED
+
+HEADER = struct.Struct('<4sHHQQQ')
+BOOK = struct.Struct('<qbQQq')
+LENGTH = struct.Struct('<I')
+
+
+def save_diary(diary: ReadingDiary, path: str, generation: int = 0, compress: bool = False):
+    diary._load_all_notes()
+    books = list(diary.books.values())
+    zoned = any(note.date.tzinfo is not None for book in books for note in book.iter_notes())
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(bytes(HEADER.size))
+
+        entries: list[tuple[Book, int, int]] = []
+        for book in books:
+            notes = book.notes
+            entries.append((book, len(notes), file.tell()))
+            _write_notes(file, notes, compress, zoned)
+
+        table_offset = file.tell()
+        for book, note_count, offset in entries:
+            for value in (book.isbn, book.title, book.author):
+                _write_str(file, value)
+            file.write(BOOK.pack(book.pages, book.rating, note_count, offset, book._next_id))
+
+        file.seek(0)
+        flags = (FLAG_COMPRESSED if compress else 0) | (FLAG_ZONED if zoned else 0)
+        file.write(HEADER.pack(MAGIC, VERSION, flags, generation, len(entries), table_offset))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_diary(path: str, book_type: type[Book] = Book) -> ReadingDiary:
+    diary = ReadingDiary(book_type)
+    load_into(diary, path)
+    return diary
+
+
+def load_into(diary: ReadingDiary, path: str) -> int:
+    with open(path, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(data) < HEADER.size:
+        raise ValueError(f'{path} is not a reading diary file')
+    magic, version, flags, generation, book_count, position = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a reading diary file')
+    if version != VERSION:
+        raise ValueError(f'Unsupported reading diary file version: {version}')
+    if flags & ~FLAGS:
+        raise ValueError(f'Unsupported reading diary file flags: {flags}')
+    compressed, zoned = bool(flags & FLAG_COMPRESSED), bool(flags & FLAG_ZONED)
+
+    for _ in range(book_count):
+        isbn, position = _read_str(data, position)
+        title, position = _read_str(data, position)
+        author, position = _read_str(data, position)
+        pages, rating, note_count, offset, next_id = BOOK.unpack_from(data, position)
+        position += BOOK.size
+
+        book = diary._insert_book(isbn, title, author, pages)
+        book.rating = rating
+        book._next_id = next_id
+        if note_count:
+            diary._defer_notes(book, note_count, partial(_read_notes, data, offset, note_count, compressed, zoned))
+
+    diary.clear_history()
+    return generation
+
+
+def _write_str(file: BinaryIO, value: str):
+    encoded = value.encode()
+    file.write(LENGTH.pack(len(encoded)))
+    file.write(encoded)
+
+
+def _read_str(data: mmap.mmap, position: int) -> tuple[str, int]:
+    (length,) = LENGTH.unpack_from(data, position)
+    position += LENGTH.size
+    return data[position:position + length].decode(), position + length
+
+
+def _write_array(file: BinaryIO, values: Iterable[int]):
+    values = array('q', values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    values.tofile(file)
+
+
+def _read_array(data: mmap.mmap, position: int, count: int) -> array:
+    values = array('q')
+    values.frombytes(data[position:position + count * values.itemsize])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _write_notes(file: BinaryIO, notes: list[Note], compress: bool = False, zoned: bool = False):
+    if not notes:
+        return
+
+    texts = [note.text.encode() for note in notes]
+    offsets = [0]
+    for text in texts:
+        offsets.append(offsets[-1] + len(text))
+
+    _write_array(file, (note.page for note in notes))
+    _write_array(file, (to_epoch_us(note.date) for note in notes))
+    if zoned:
+        _write_array(file, (utc_offset_us(note.date) for note in notes))
+    _write_array(file, (note.id for note in notes))
+    _write_array(file, offsets)
+    text = b''.join(texts)
+    if compress:
+        text = zlib.compress(text)
+        file.write(LENGTH.pack(len(text)))
+    file.write(text)
+
+
+def _read_notes(data: mmap.mmap, position: int, count: int, compressed: bool, zoned: bool, book: Book):
+    pages = _read_array(data, position, count)
+    position += 8 * count
+    dates = _read_array(data, position, count)
+    position += 8 * count
+    zones = array('q', [NAIVE]) * count
+    if zoned:
+        zones = _read_array(data, position, count)
+        position += 8 * count
+    ids = _read_array(data, position, count)
+    position += 8 * count
+    offsets = _read_array(data, position, count + 1)
+    position += 8 * (count + 1)
+    if compressed:
+        (length,) = LENGTH.unpack_from(data, position)
+        position += LENGTH.size
+        text = zlib.decompress(data[position:position + length])
+    else:
+        text = data[position:position + offsets[-1]]
+
+    for index in range(count):
+        note = book.note_type(text[offsets[index]:offsets[index + 1]].decode(), pages[index],
+                              from_epoch_us(dates[index], zones[index]))
+        note.id = ids[index]
+        book._insert_note(note)
@@ -0,0 +1,105 @@
+import hashlib
+import sys
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from weakref import WeakValueDictionary
+
+from readingdiary.model import Book, Note
+
+COMPRESS_THRESHOLD: int = 128
+TRAINING_SAMPLES: int = 256
+DICTIONARY_SIZE: int = 32 * 1024
+COMPRESSION_LEVEL: int = 6
+DECOMPRESS_CACHE_SIZE: int = 1024
+
+
+class Blob:
+    __slots__ = ('data', '__weakref__')
+
+    def __init__(self, data: bytes):
+        self.data: bytes = data
+
+
+class TextStore:
+
+    def __init__(self, threshold: int = COMPRESS_THRESHOLD, training_samples: int = TRAINING_SAMPLES,
+                 level: int = COMPRESSION_LEVEL, cache_size: int = DECOMPRESS_CACHE_SIZE):
+        self.threshold: int = threshold
+        self.training_samples: int = training_samples
+        self.level: int = level
+        self._blobs: WeakValueDictionary[bytes, Blob] = WeakValueDictionary()
+        self._samples: Counter[str] = Counter()
+        self._sampled: int = 0
+        self._zdict: bytes | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._decompress = lru_cache(maxsize=cache_size)(self._decompress)
+
+    def pack(self, text: str) -> str | Blob:
+        with self._lock:
+            if len(text) < self.threshold or self._zdict is None and not self._train(text):
+                return sys.intern(text)
+            encoded = text.encode()
+            digest = hashlib.blake2b(encoded, digest_size=16).digest()
+            blob = self._blobs.get(digest)
+            if blob is None:
+                compressor = zlib.compressobj(self.level, zdict=self._zdict)
+                blob = self._blobs[digest] = Blob(compressor.compress(encoded) + compressor.flush())
+            return blob
+
+    def unpack(self, packed: str | Blob) -> str:
+        if type(packed) is str:
+            return packed
+        return self._decompress(packed.data)
+
+    def _decompress(self, blob: bytes) -> str:
+        decompressor = zlib.decompressobj(zdict=self._zdict)
+        return (decompressor.decompress(blob) + decompressor.flush()).decode()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            blobs = list(self._blobs.values())
+            return {
+                'blobs': len(blobs),
+                'blob_bytes': sum(len(blob.data) for blob in blobs),
+                'dictionary_bytes': len(self._zdict or b''),
+            }
+
+    def _train(self, text: str) -> bool:
+        self._samples[text] += 1
+        self._sampled += 1
+        if self._sampled < self.training_samples:
+            return False
+        dictionary = bytearray()
+        for sample, _ in self._samples.most_common():
+            if len(dictionary) >= DICTIONARY_SIZE:
+                break
+            dictionary[:0] = sample.encode()
+        self._zdict = bytes(dictionary[-DICTIONARY_SIZE:])
+        self._samples.clear()
+        return True
+
+
+TEXT_STORE: TextStore = TextStore()
+_packed_text = Note.text
+
+
+class CompactNote(Note):
+    __slots__ = ()
+
+    store: TextStore = TEXT_STORE
+
+    @property
+    def text(self) -> str:
+        return self.store.unpack(_packed_text.__get__(self))
+
+    @text.setter
+    def text(self, text: str):
+        _packed_text.__set__(self, self.store.pack(text))
+
+
+class CompactBook(Book):
+    __slots__ = ()
+
+    note_type: type[Note] = CompactNote
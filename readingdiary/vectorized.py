@@ -0,0 +1,167 @@
+from readingdiary.analytics import DAY_US, book_columns
+from readingdiary.epoch import as_utc
+from readingdiary.model import Book, ReadingDiary
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PERCENTILES: tuple[int, ...] = (25, 50, 75, 90)
+
+
+class NoteArrays:
+
+    def __init__(self, diary: ReadingDiary):
+        self.books: list[Book] = [diary.search_by_isbn(isbn) for isbn in list(diary.books)]
+        self.ids: dict[str, int] = {book.isbn: book_id for book_id, book in enumerate(self.books)}
+        columns = [book_columns(book) for book in self.books]
+        counts = np.array([len(pages) for _, _, pages, _ in columns], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.book_ids = np.repeat(np.arange(len(self.books), dtype=np.int32), counts)
+        self.pages = np.concatenate([np.asarray(pages, dtype=np.int32) for _, _, pages, _ in columns]
+                                    or [np.empty(0, dtype=np.int32)])
+        self.dates = np.concatenate([np.asarray(dates, dtype=np.int64) for _, _, _, dates in columns]
+                                    or [np.empty(0, dtype=np.int64)])
+        self.book_pages = np.array([book.pages for book in self.books], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def annotated(self):
+        starts = self.offsets[:-1]
+        book_ids = np.flatnonzero(self.offsets[1:] > starts)
+        return book_ids, starts[book_ids]
+
+
+def page_with_most_notes(pages) -> int:
+    if len(pages) == 0:
+        return -1
+    low = pages.min()
+    counts = np.bincount(pages - low)
+    tied = np.flatnonzero(counts == counts[counts.argmax()]) + low
+    if len(tied) == 1:
+        return int(tied[0])
+    return int(pages[np.isin(pages, tied)][0])
+
+
+def _percentiles(values: list[float], percentiles: tuple[int, ...]) -> dict[int, float]:
+    values = sorted(values)
+    result = {}
+    for q in percentiles:
+        if not values:
+            result[q] = 0.0
+            continue
+        position = q / 100 * (len(values) - 1)
+        below = int(position)
+        above = min(below + 1, len(values) - 1)
+        result[q] = values[below] + (values[above] - values[below]) * (position - below)
+    return result
+
+
+class DiaryStats:
+
+    def __init__(self, diary: ReadingDiary, use_numpy: bool | None = None):
+        self.diary: ReadingDiary = diary
+        self.use_numpy: bool = np is not None if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise ImportError('NumPy is not installed')
+        self._arrays: NoteArrays | None = None
+        self._version: int = -1
+
+    @property
+    def arrays(self) -> NoteArrays:
+        if self._arrays is None or self._version != self.diary._version:
+            self._version = self.diary._version
+            self._arrays = NoteArrays(self.diary)
+        return self._arrays
+
+    def refresh(self):
+        self._arrays = None
+
+    def page_with_most_notes(self, isbn: str) -> int | None:
+        book = self.diary.search_by_isbn(isbn)
+        if book is None:
+            return None
+        if not self.use_numpy:
+            return book.page_with_most_notes()
+        arrays = self.arrays
+        book_id = arrays.ids[isbn]
+        return page_with_most_notes(arrays.pages[arrays.offsets[book_id]:arrays.offsets[book_id + 1]])
+
+    def pages_with_most_notes(self) -> dict[str, int]:
+        if not self.use_numpy:
+            return {isbn: self.diary.search_by_isbn(isbn).page_with_most_notes() for isbn in list(self.diary.books)}
+
+        arrays = self.arrays
+        result = dict.fromkeys((book.isbn for book in arrays.books), -1)
+        if not len(arrays):
+            return result
+        low = int(arrays.pages.min())
+        span = int(arrays.pages.max()) - low + 1
+        keys, first, counts = np.unique(arrays.book_ids.astype(np.int64) * span + (arrays.pages - low),
+                                        return_index=True, return_counts=True)
+        book_ids = keys // span
+        order = np.lexsort((first, -counts, book_ids))
+        ordered_books = book_ids[order]
+        winners = order[np.concatenate(([True], ordered_books[1:] != ordered_books[:-1]))]
+        for book_id, page in zip(book_ids[winners].tolist(), (keys[winners] % span + low).tolist()):
+            result[arrays.books[book_id].isbn] = page
+        return result
+
+    def book_with_most_notes(self) -> Book | None:
+        if not self.use_numpy:
+            return self.diary.book_with_most_notes()
+        arrays = self.arrays
+        if not len(arrays):
+            return None
+        return arrays.books[int(np.bincount(arrays.book_ids, minlength=len(arrays.books)).argmax())]
+
+    def reading_velocity(self) -> dict[str, float]:
+        if not self.use_numpy:
+            result = {}
+            for isbn in list(self.diary.books):
+                notes = list(self.diary.search_by_isbn(isbn).iter_notes())
+                if not notes:
+                    continue
+                dates = [as_utc(note.date) for note in notes]
+                days = (max(dates) - min(dates)).total_seconds() / 86_400
+                if days > 0:
+                    result[isbn] = (max(note.page for note in notes) - min(note.page for note in notes)) / days
+            return result
+
+        arrays = self.arrays
+        annotated, starts = arrays.annotated()
+        if not len(annotated):
+            return {}
+        pages = np.maximum.reduceat(arrays.pages, starts) - np.minimum.reduceat(arrays.pages, starts)
+        days = (np.maximum.reduceat(arrays.dates, starts) - np.minimum.reduceat(arrays.dates, starts)) / DAY_US
+        moving = days > 0
+        return {arrays.books[book_id].isbn: velocity for book_id, velocity in
+                zip(annotated[moving].tolist(), (pages[moving] / days[moving]).tolist())}
+
+    def progress(self) -> dict[str, float]:
+        if not self.use_numpy:
+            result = {}
+            for isbn in list(self.diary.books):
+                book = self.diary.search_by_isbn(isbn)
+                furthest = max(0, max((note.page for note in book.iter_notes()), default=0))
+                result[isbn] = furthest / book.pages if book.pages > 0 else 0.0
+            return result
+
+        arrays = self.arrays
+        furthest = np.zeros(len(arrays.books), dtype=np.int64)
+        annotated, starts = arrays.annotated()
+        if len(annotated):
+            furthest[annotated] = np.maximum(np.maximum.reduceat(arrays.pages, starts), 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            progress = np.where(arrays.book_pages > 0, furthest / arrays.book_pages, 0.0)
+        return {book.isbn: value for book, value in zip(arrays.books, progress.tolist())}
+
+    def progress_percentiles(self, percentiles: tuple[int, ...] = PERCENTILES) -> dict[int, float]:
+        if not self.use_numpy:
+            return _percentiles(list(self.progress().values()), percentiles)
+        progress = np.fromiter(self.progress().values(), dtype=np.float64)
+        if not len(progress):
+            return dict.fromkeys(percentiles, 0.0)
+        return dict(zip(percentiles, np.percentile(progress, percentiles).tolist()))
@@ -1,5 +1,9 @@
 import sys
+from datetime import datetime
 
+from readingdiary.export import write_notes
+from readingdiary.journal import JournaledDiary
+from readingdiary.metrics import METRICS, is_enabled
 from readingdiary.model import ReadingDiary
 
 
@@ -7,9 +11,14 @@ class UIConsole:
     
     ENTER_ISBN: str = 'Enter ISBN: '
     BOOK_NOT_FOUND: str = 'Book not found'
+    NOTE_NOT_FOUND: str = 'Note not found'
     
-    def __init__(self):
-        self.diary = ReadingDiary()
+    def __init__(self, path: str | None = None):
+        self.path = path
+        if path is not None:
+            self.diary = JournaledDiary(path, sync_every=1)
+        else:
+            self.diary = ReadingDiary()
         self.options = {
             '1': self.add_book,
             '2': self.add_note,
@@ -18,6 +27,12 @@ class UIConsole:
             '5': self.get_notes_of_page,
             '6': self.page_with_most_notes,
             '7': self.book_with_most_notes,
+            '8': self.search_notes,
+            '9': self.search_books_by_title,
+            '10': self.search_books_by_author,
+            '11': self.edit_note,
+            '12': self.delete_note,
+            '13': self.show_stats,
             '0': self.exit
         }
     
@@ -31,6 +46,12 @@ class UIConsole:
         print('5. Get notes of page')
         print('6. Page with most notes')
         print('7. Book with most notes')
+        print('8. Search notes')
+        print('9. Search books by title')
+        print('10. Search books by author')
+        print('11. Edit note')
+        print('12. Delete note')
+        print('13. Show stats')
         print('0. Exit')
         print("====================================")
     
@@ -64,7 +85,11 @@ class UIConsole:
             return
         text = input('Enter text: ')
         page = int(input('Enter page: '))
-        date = input('Enter date (YYYY-MM-DD): ')
+        try:
+            date = datetime.strptime(input('Enter date (YYYY-MM-DD): '), '%Y-%m-%d')
+        except ValueError:
+            print('Invalid date')
+            return
         if book.add_note(text, page, date):
             print('Note added successfully')
         else:
@@ -100,11 +125,7 @@ class UIConsole:
             print(UIConsole.BOOK_NOT_FOUND)
             return
         page = int(input('Enter page: '))
-        notes = book.get_notes_of_page(page)
-        if notes:
-            for note in notes:
-                print(note)
-        else:
+        if not write_notes(book.iter_notes_of_page(page), sys.stdout, with_ids=True):
             print('No notes found')
     
     def page_with_most_notes(self):
@@ -121,6 +142,84 @@ class UIConsole:
         book = self.diary.book_with_most_notes()
         print(book)
     
+    def search_notes(self):
+        print(">>> Search notes ========================")
+        query = input('Enter search terms: ')
+        isbn = input('Enter ISBN (empty for all books): ') or None
+        results = self.diary.search_notes(query, isbn)
+        if results:
+            for book, note in results:
+                print(f'[{book.isbn}] {note}')
+        else:
+            print('No notes found')
+    
+    def search_books_by_title(self):
+        print(">>> Search books by title ========================")
+        query = input('Enter title or its beginning: ')
+        fuzzy = input('Allow typos? (y/N): ').strip().lower() == 'y'
+        self.print_books(self.diary.search_by_title(query, fuzzy))
+    
+    def search_books_by_author(self):
+        print(">>> Search books by author ========================")
+        query = input('Enter author or its beginning: ')
+        fuzzy = input('Allow typos? (y/N): ').strip().lower() == 'y'
+        self.print_books(self.diary.search_by_author(query, fuzzy))
+    
+    def edit_note(self):
+        print(">>> Edit note ========================")
+        isbn = input(UIConsole.ENTER_ISBN)
+        book = self.diary.search_by_isbn(isbn)
+        if not book:
+            print(UIConsole.BOOK_NOT_FOUND)
+            return
+        note = book.get_note(int(input('Enter note id: ')))
+        if note is None:
+            print(UIConsole.NOTE_NOT_FOUND)
+            return
+        print(note)
+        text = input('Enter text (empty to keep): ') or None
+        page = input('Enter page (empty to keep): ')
+        date = input('Enter date (YYYY-MM-DD, empty to keep): ')
+        try:
+            date = datetime.strptime(date, '%Y-%m-%d') if date else None
+        except ValueError:
+            print('Invalid date')
+            return
+        if self.diary.update_note(isbn, note.id, text, int(page) if page else None, date):
+            print('Note updated successfully')
+        else:
+            print('Invalid page')
+
+    def delete_note(self):
+        print(">>> Delete note ========================")
+        isbn = input(UIConsole.ENTER_ISBN)
+        if self.diary.search_by_isbn(isbn) is None:
+            print(UIConsole.BOOK_NOT_FOUND)
+            return
+        if self.diary.remove_note(isbn, int(input('Enter note id: '))):
+            print('Note deleted successfully')
+        else:
+            print(UIConsole.NOTE_NOT_FOUND)
+
+    def show_stats(self):
+        print(">>> Show stats ========================")
+        if is_enabled():
+            print(METRICS.report())
+        else:
+            print('Stats are disabled; start the app with --stats')
+
+    def print_books(self, books):
+        if books:
+            for book in books:
+                print(book)
+                print()
+        else:
+            print(UIConsole.BOOK_NOT_FOUND)
+    
     def exit(self):
+        if self.path is not None:
+            self.diary.compact()
+            self.diary.close()
+            print(f"Diary saved to {self.path}")
         print("\nGoodbye!")
         sys.exit(0)
@@ -0,0 +1,74 @@
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from readingdiary.analytics import analyze, shard_books
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import Book, ReadingDiary
+
+
+def fill(diary, num_books=12):
+    rng = random.Random(3)
+    start = datetime(2021, 1, 1, 12)
+    for i in range(num_books):
+        isbn = f"isbn-{i}"
+        diary.add_book(isbn, f"Title {i}", "Author X", 100)
+        diary.rate_book(isbn, rng.choice([Book.EXCELLENT, Book.GOOD, Book.BAD, Book.UNRATED]))
+        for j in range(rng.randrange(0, 40)):
+            diary.add_note_to_book(isbn, f"Note {j}", rng.randrange(1, 100), start + timedelta(hours=rng.randrange(96)))
+    return diary
+
+
+def expected_report(diary):
+    books = [diary.search_by_isbn(isbn) for isbn in diary.books]
+    notes = [note for book in books for note in book.notes]
+    return {
+        'page_with_most_notes': {book.isbn: book.page_with_most_notes() for book in books},
+        'density': Counter(note.page // 10 * 10 for note in notes),
+        'ratings': Counter(book.rating for book in books),
+        'notes_per_day': Counter(note.date.date() for note in notes),
+        'total_notes': len(notes),
+    }
+
+
+def as_dict(report):
+    return {name: getattr(report, name) for name in
+            ('page_with_most_notes', 'density', 'ratings', 'notes_per_day', 'total_notes')}
+
+
+@pytest.mark.parametrize("book_type", [Book, ColumnarBook])
+def test_analyze_inline_matches_model(book_type):
+    diary = fill(ReadingDiary(book_type))
+    assert as_dict(analyze(diary, workers=1)) == expected_report(diary)
+
+
+def test_analyze_in_process_pool_matches_model():
+    diary = fill(ReadingDiary())
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        report = analyze(diary, workers=2, executor=executor)
+    assert as_dict(report) == expected_report(diary)
+
+
+def test_analyze_uses_bucket_size():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    for page in (1, 24, 25, 49, 50):
+        diary.add_note_to_book("1234", "Note", page, datetime(2021, 1, 1))
+    assert analyze(diary, workers=1, bucket_size=25).density == {0: 2, 25: 2, 50: 1}
+
+
+def test_analyze_empty_diary():
+    report = analyze(ReadingDiary(), workers=2)
+    assert report.total_notes == 0
+    assert report.page_with_most_notes == {}
+
+
+def test_shard_books_balances_note_counts():
+    diary = fill(ReadingDiary(), num_books=40)
+    shards = shard_books(diary, 4)
+    assert sorted(isbn for shard in shards for isbn, *_ in shard) == sorted(diary.books)
+    loads = [sum(len(pages) for _, _, pages, _ in shard) for shard in shards]
+    assert max(loads) - min(loads) <= max(len(book.notes) for book in diary.books.values()) + 1
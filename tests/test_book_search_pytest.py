@@ -0,0 +1,130 @@
+import pytest
+
+from readingdiary.model import ReadingDiary
+from readingdiary.search import FuzzyIndex, PrefixIndex
+from readingdiary.sqlstore import SQLiteReadingDiary
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def diary(request, tmp_path):
+    diary = ReadingDiary() if request.param == "memory" else SQLiteReadingDiary(str(tmp_path / "diary.sqlite"))
+    diary.add_book("1111", "The Lord of the Rings", "J. R. R. Tolkien", 1200)
+    diary.add_book("2222", "The Hobbit", "J. R. R. Tolkien", 300)
+    diary.add_book("3333", "Lord Jim", "Joseph Conrad", 400)
+    diary.add_book("4444", "War and Peace", "Leo Tolstoy", 1300)
+    diary.add_book("5555", "Walden", "Henry David Thoreau", 300)
+    return diary
+
+
+def isbns(books):
+    return [book.isbn for book in books]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("hobbit", ["2222"]),
+    ("HOB", ["2222"]),
+    ("lord of", ["1111"]),
+    ("wal", ["5555"]),
+    ("kraken", []),
+    ("", []),
+])
+def test_search_by_title_prefix(diary, query, expected):
+    assert isbns(diary.search_by_title(query)) == expected
+
+
+def test_search_by_title_prefix_matches_any_word_start(diary):
+    assert sorted(isbns(diary.search_by_title("lord"))) == ["1111", "3333"]
+
+
+def test_search_by_author_prefix(diary):
+    assert sorted(isbns(diary.search_by_author("tolk"))) == ["1111", "2222"]
+    assert isbns(diary.search_by_author("tolk", limit=1)) in (["1111"], ["2222"])
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("tolstoi", ["4444"]),
+    ("thoreu henry", ["5555"]),
+    ("conard", ["3333"]),
+    ("zzzzzz", []),
+])
+def test_search_by_author_fuzzy(diary, query, expected):
+    assert isbns(diary.search_by_author(query, fuzzy=True)) == expected
+
+
+def test_search_by_title_fuzzy(diary):
+    assert isbns(diary.search_by_title("hobit", fuzzy=True)) == ["2222"]
+    assert isbns(diary.search_by_title("peace kraken", fuzzy=True)) == []
+    assert isbns(diary.search_by_title("wars peace", fuzzy=True)) == ["4444"]
+
+
+@pytest.mark.parametrize("diary", ["memory"], indirect=True)
+def test_catalog_is_built_on_first_search(diary):
+    assert not diary._catalog_built
+    assert isbns(diary.search_by_author("conard", fuzzy=True)) == ["3333"]
+    assert diary._catalog_built
+    diary.add_book("6666", "The Silmarillion", "J. R. R. Tolkien", 400)
+    assert sorted(isbns(diary.search_by_author("tolk"))) == ["1111", "2222", "6666"]
+    assert diary.undo()
+    assert sorted(isbns(diary.search_by_author("tolk"))) == ["1111", "2222"]
+    assert isbns(diary.search_by_title("silmarilion", fuzzy=True)) == []
+
+
+@pytest.mark.parametrize("diary", ["memory"], indirect=True)
+def test_catalog_built_inside_a_batch_forgets_rolled_back_books(diary):
+    with pytest.raises(RuntimeError):
+        with diary.batch():
+            diary.add_book("6666", "The Silmarillion", "J. R. R. Tolkien", 400)
+            assert isbns(diary.search_by_title("silm")) == ["6666"]
+            raise RuntimeError("Rolled back")
+    assert diary.search_by_title("silm") == []
+    assert diary.search_by_title("silmarilion", fuzzy=True) == []
+
+
+def test_prefix_index_returns_each_item_once():
+    index = PrefixIndex()
+    index.add("a", "Lord of Lords")
+    index.add("b", "Lordship")
+    assert index.search("lord") == ["a", "b"]
+
+
+def test_prefix_index_merges_new_entries_between_searches():
+    index = PrefixIndex()
+    index.TAIL_SIZE = 2
+    titles = ["Lord of Lords", "Lordship", "Lore", "The Lord", "Landlord", "Lord Jim"]
+    for item, title in enumerate(titles):
+        index.add(item, title)
+        rebuilt = PrefixIndex()
+        for other, other_title in enumerate(titles[:item + 1]):
+            rebuilt.add(other, other_title)
+        assert index.search("lor", limit=3) == rebuilt.search("lor", limit=3)
+    assert index.search("lord") == [3, 5, 0, 1]
+    index.remove(3)
+    assert index.search("lord") == [5, 0, 1]
+
+
+def test_prefix_index_skips_removed_items_until_compacted():
+    index = PrefixIndex()
+    for item in range(6):
+        index.add(item, f"Lord {item}")
+    index.remove_all({1, 4})
+    assert index.search("lord") == [0, 2, 3, 5]
+    index.remove_all({0, 2})
+    assert index.search("lord") == [3, 5]
+    index.add(1, "Lord again")
+    assert index.search("lord") == [3, 5, 1]
+
+
+def test_fuzzy_index_skips_removed_items():
+    index = FuzzyIndex()
+    index.add("a", "Tolkien")
+    index.add("b", "Tolkien Reader")
+    index.remove_all({"a"})
+    assert index.search("tolkein") == ["b"]
+
+
+def test_fuzzy_index_ranks_closer_matches_first():
+    index = FuzzyIndex()
+    index.add("a", "Tolstoy")
+    index.add("b", "Tolkien")
+    assert index.search("tolkein") == ["b"]
+    assert index.search("") == []
@@ -0,0 +1,158 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from readingdiary.bulk import ImportReport, import_books, import_notes, read_csv, read_jsonl, read_rows
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import Book, ReadingDiary
+
+
+@pytest.fixture
+def diary():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    return diary
+
+
+def test_import_books_reports_rejected_rows(diary):
+    rows = [
+        {"isbn": "5678", "title": "Another Book", "author": "Author Y", "pages": "200", "rating": "3"},
+        {"isbn": "1234", "title": "Test Book", "author": "Author X", "pages": "100"},
+        {"isbn": "9012", "title": "Third Book", "author": "Author Z", "pages": "many"},
+        {"isbn": "3456", "title": "Fourth Book", "author": "Author W", "pages": "10", "rating": "4"},
+        {"isbn": "7890", "title": "Fifth Book", "pages": "10"},
+        {"isbn": "1111", "title": "Sixth Book", "author": "Author V", "pages": 10, "rating": ""},
+    ]
+    report = import_books(diary, rows)
+    assert report.accepted == 2
+    assert report.rejected == [
+        (2, "Book already exists"),
+        (3, "Invalid number"),
+        (4, "Invalid rating"),
+        (5, "Missing field: author"),
+    ]
+    assert diary.search_by_isbn("5678").rating == Book.EXCELLENT
+    assert diary.search_by_isbn("1111").rating == Book.UNRATED
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 10_000])
+def test_import_notes_reports_rejected_rows(diary, batch_size):
+    rows = [
+        {"isbn": "1234", "text": "Note 1", "page": "1", "date": "2021-01-01"},
+        {"isbn": "0000", "text": "Note 2", "page": "1", "date": "2021-01-02"},
+        {"isbn": "1234", "text": "Note 3", "page": "101", "date": "2021-01-03"},
+        {"isbn": "1234", "text": "Note 4", "page": "1", "date": "yesterday"},
+        {"isbn": "1234", "text": "Note 5", "page": 2, "date": "2021-01-05T10:30:00"},
+        {"isbn": "1234", "page": "2", "date": "2021-01-06"},
+    ]
+    report = import_notes(diary, rows, batch_size)
+    assert report.accepted == 2
+    assert report.rejected == [
+        (2, "Book not found"),
+        (3, "Invalid page"),
+        (4, "Invalid date"),
+        (6, "Missing field: text"),
+    ]
+    notes = diary.search_by_isbn("1234").notes
+    assert [(note.text, note.page, note.date) for note in notes] == [
+        ("Note 1", 1, datetime(2021, 1, 1)),
+        ("Note 5", 2, datetime(2021, 1, 5, 10, 30)),
+    ]
+
+
+def test_import_books_rejects_rows_of_the_wrong_type(diary):
+    rows = [
+        {"isbn": 5678, "title": "Another Book", "author": "Author Y", "pages": 200},
+        {"isbn": "5678", "title": ["Another Book"], "author": "Author Y", "pages": 200},
+        {"isbn": "5678", "title": "Another Book", "author": "Author Y", "pages": 200.5},
+        {"isbn": "5678", "title": "Another Book", "author": "Author Y", "pages": True},
+        {"isbn": "5678", "title": "Another Book", "author": "Author Y", "pages": 200, "rating": 1.0},
+        ["5678", "Another Book", "Author Y", 200],
+        {"isbn": "5678", "title": "Another Book", "author": "Author Y", "pages": 200},
+    ]
+    report = import_books(diary, rows)
+    assert report.accepted == 1
+    assert report.rejected == [
+        (1, "Invalid field: isbn"),
+        (2, "Invalid field: title"),
+        (3, "Invalid number"),
+        (4, "Invalid number"),
+        (5, "Invalid number"),
+        (6, "Invalid row"),
+    ]
+    assert diary.search_by_isbn("5678").title == "Another Book"
+
+
+@pytest.mark.parametrize("batch_size", [1, 10_000])
+def test_import_notes_rejects_rows_of_the_wrong_type_without_dropping_the_batch(diary, batch_size):
+    rows = [
+        {"isbn": "1234", "text": "Note 1", "page": 1, "date": "2021-01-01"},
+        {"isbn": "1234", "text": 7, "page": 1, "date": "2021-01-02"},
+        {"isbn": "1234", "text": "Note 3", "page": 1.5, "date": "2021-01-03"},
+        {"isbn": "1234", "text": "Note 4", "page": False, "date": "2021-01-04"},
+        {"isbn": "1234", "text": "Note 5", "page": 1, "date": 20210105},
+        {"isbn": 1234, "text": "Note 6", "page": 1, "date": "2021-01-06"},
+        {"isbn": "1234", "text": "Note 7", "page": 2, "date": "2021-01-07"},
+    ]
+    report = import_notes(diary, rows, batch_size)
+    assert report.accepted == 2
+    assert report.rejected == [
+        (2, "Invalid field: text"),
+        (3, "Invalid number"),
+        (4, "Invalid number"),
+        (5, "Invalid field: date"),
+        (6, "Invalid field: isbn"),
+    ]
+    assert [note.text for note in diary.search_by_isbn("1234").notes] == ["Note 1", "Note 7"]
+
+
+def test_import_notes_rejects_rows_the_book_cannot_store():
+    diary = ReadingDiary(ColumnarBook)
+    diary.add_book("1234", "Test Book", "Author X", 10 ** 30)
+    rows = [
+        {"isbn": "1234", "text": "Note 1", "page": "1", "date": "2021-01-01"},
+        {"isbn": "1234", "text": "Note 2", "page": str(10 ** 20), "date": "2021-01-02"},
+        {"isbn": "1234", "text": "Note 3", "page": "3", "date": "2021-01-03"},
+    ]
+    report = import_notes(diary, rows)
+    assert report.accepted == 2
+    assert [row_number for row_number, _ in report.rejected] == [2]
+    assert report.rejected[0][1].startswith("Invalid note: ")
+    assert [note.text for note in diary.search_by_isbn("1234").notes] == ["Note 1", "Note 3"]
+
+
+def test_import_notes_counts_only_batches_that_commit(diary):
+    def rows():
+        for i in range(3):
+            yield {"isbn": "1234", "text": f"Note {i}", "page": "1", "date": "2021-01-01"}
+        raise OSError("Read failed")
+
+    report = ImportReport()
+    with pytest.raises(OSError):
+        import_notes(diary, rows(), batch_size=2, report=report)
+    assert report.accepted == 2
+    assert [note.text for note in diary.search_by_isbn("1234").notes] == ["Note 0", "Note 1"]
+
+
+def test_import_notes_consumes_rows_lazily(diary):
+    consumed = []
+
+    def rows():
+        for i in range(5):
+            consumed.append(i)
+            yield {"isbn": "1234", "text": f"Note {i}", "page": "1", "date": "2021-01-01"}
+
+    assert import_notes(diary, rows(), batch_size=2).accepted == 5
+    assert consumed == [0, 1, 2, 3, 4]
+
+
+def test_read_rows_streams_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "notes.csv"
+    csv_path.write_text("isbn,text,page,date\n1234,\"Note, 1\",1,2021-01-01\n", encoding="utf-8")
+    jsonl_path = tmp_path / "notes.jsonl"
+    jsonl_path.write_text(json.dumps({"isbn": "1234", "text": "Note 2", "page": 2, "date": "2021-01-02"}) + "\n\n", encoding="utf-8")
+
+    assert list(read_csv(str(csv_path))) == [{"isbn": "1234", "text": "Note, 1", "page": "1", "date": "2021-01-01"}]
+    assert list(read_jsonl(str(jsonl_path))) == [{"isbn": "1234", "text": "Note 2", "page": 2, "date": "2021-01-02"}]
+    assert list(read_rows(str(jsonl_path))) == list(read_jsonl(str(jsonl_path)))
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from readingdiary.columnar import ColumnarBook, NoteColumns
+from readingdiary.model import Book, ReadingDiary
+
+
+NOTES = [
+    ("Note 1", 1, datetime(2021, 1, 1)),
+    ("Note 2", 2, datetime(2021, 1, 2, 10, 30)),
+    ("Nota ñ 3", 1, datetime(2021, 1, 3, 0, 0, 0, 5)),
+    ("", 2, datetime(1960, 5, 5)),
+    ("Note 5", 2, datetime(2021, 1, 5)),
+]
+
+
+@pytest.fixture
+def books():
+    book = Book("1234", "Test Book", "Author X", 100)
+    columnar_book = ColumnarBook("1234", "Test Book", "Author X", 100)
+    for text, page, date in NOTES:
+        book.add_note(text, page, date)
+        columnar_book.add_note(text, page, date)
+    return book, columnar_book
+
+
+def as_tuples(notes):
+    return [(note.text, note.page, note.date) for note in notes]
+
+
+def test_columnar_book_notes_match_book(books):
+    book, columnar_book = books
+    assert as_tuples(columnar_book.notes) == as_tuples(book.notes)
+
+
+@pytest.mark.parametrize("page", [1, 2, 3])
+def test_columnar_book_get_notes_of_page_matches_book(books, page):
+    book, columnar_book = books
+    assert as_tuples(columnar_book.get_notes_of_page(page)) == as_tuples(book.get_notes_of_page(page))
+
+
+def test_columnar_book_page_with_most_notes_matches_book(books):
+    book, columnar_book = books
+    assert columnar_book.page_with_most_notes() == book.page_with_most_notes() == 2
+
+
+def test_columnar_book_page_with_most_notes_returns_minus_one_when_no_notes():
+    assert ColumnarBook("1234", "Test Book", "Author X", 100).page_with_most_notes() == -1
+
+
+def test_columnar_book_add_note_returns_false_when_page_out_of_range():
+    book = ColumnarBook("1234", "Test Book", "Author X", 100)
+    assert not book.add_note("Note", 101, datetime(2021, 1, 1))
+    assert book.notes == []
+
+
+def test_columnar_book_str_matches_book(books):
+    book, columnar_book = books
+    assert str(columnar_book) == str(book)
+
+
+def test_note_columns_keep_utc_offsets_of_aware_dates():
+    zone = timezone(timedelta(hours=2))
+    columns = NoteColumns()
+    columns.append("Naive", 1, datetime(2021, 1, 1, 12))
+    assert columns.zones is None
+    columns.append("Aware", 1, datetime(2021, 1, 1, 12, tzinfo=zone))
+    columns.insert(1, 5, "Inserted", 1, datetime(2021, 1, 2, tzinfo=timezone.utc))
+    assert [columns.note_at(index).date for index in range(len(columns))] == [
+        datetime(2021, 1, 1, 12), datetime(2021, 1, 2, tzinfo=timezone.utc), datetime(2021, 1, 1, 12, tzinfo=zone)]
+    assert columns.note_at(2).date.utcoffset() == timedelta(hours=2)
+    assert columns.note_at(0).date.tzinfo is None
+    assert list(columns.dates)[2] == list(columns.dates)[0] - 2 * 3600 * 10 ** 6
+    columns.delete(1)
+    assert [columns.text_at(index) for index in range(len(columns))] == ["Naive", "Aware"]
+    assert columns.note_at(1).date.utcoffset() == timedelta(hours=2)
+
+
+def test_reading_diary_with_columnar_books():
+    diary = ReadingDiary(book_type=ColumnarBook)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_book("5678", "Another Book", "Author Y", 200)
+    assert isinstance(diary.search_by_isbn("1234"), ColumnarBook)
+    diary.add_note_to_book("5678", "Note 1", 1, datetime(2021, 1, 1))
+    diary.add_note_to_book("5678", "Note 2", 1, datetime(2021, 1, 2))
+    diary.add_note_to_book("1234", "Note 3", 1, datetime(2021, 1, 3))
+    assert diary.book_with_most_notes().isbn == "5678"
+    assert diary.search_by_isbn("5678").page_with_most_notes() == 1
+
+
+@pytest.mark.parametrize("n", [0, 2, 10])
+def test_columnar_book_latest_notes_matches_book(books, n):
+    book, columnar_book = books
+    assert as_tuples(columnar_book.latest_notes(n)) == as_tuples(book.latest_notes(n))
+
+
+def test_columnar_book_iter_notes_between_matches_book(books):
+    book, columnar_book = books
+    start, end = datetime(1900, 1, 1), datetime(2021, 1, 3)
+    assert as_tuples(columnar_book.iter_notes_between(start, end)) == as_tuples(book.iter_notes_between(start, end))
+
+
+def test_columnar_book_undo_and_rollback():
+    diary = ReadingDiary(ColumnarBook)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    for text, page, date in NOTES:
+        diary.add_note_to_book("1234", text, page, date)
+    with pytest.raises(ValueError):
+        with diary.batch():
+            diary.add_note_to_book("1234", "Dropped", 3, datetime(2021, 2, 1))
+            raise ValueError
+    diary.undo()
+    diary.undo()
+
+    book = diary.search_by_isbn("1234")
+    assert as_tuples(book.notes) == NOTES[:3]
+    assert book.page_with_most_notes() == 1
+    assert len(diary.latest_notes(10)) == 3
+    assert sorted(note.text for _, note in diary.search_notes("note")) == ["Note 1", "Note 2"]
+
+
+def test_columnar_book_note_edits_match_book(books):
+    for book in books:
+        assert book.remove_note(1)
+        assert book.update_note(3, text="Edited ñ", page=1)
+        assert book.remove_note(4)
+        book.add_note("Note 6", 2, datetime(2021, 1, 6))
+    book, columnar_book = books
+    assert [note.id for note in columnar_book.notes] == [note.id for note in book.notes] == [0, 2, 3, 5]
+    assert as_tuples(columnar_book.notes) == as_tuples(book.notes)
+    assert as_tuples(columnar_book.latest_notes(5)) == as_tuples(book.latest_notes(5))
+    assert columnar_book.page_with_most_notes() == book.page_with_most_notes() == 1
+    assert columnar_book.get_note(3).text == "Edited ñ"
+
+
+def test_note_columns_compact_text_after_deletes():
+    columns = NoteColumns()
+    for i in range(10):
+        columns.append(f"Note {i}", i, datetime(2021, 1, 1))
+    for note_id in range(5):
+        columns.delete(columns.index_of(note_id))
+    assert len(columns.text) == 60
+    columns.delete(columns.index_of(5))
+    assert len(columns.text) == 24
+    assert [columns.text_at(index) for index in range(len(columns))] == ["Note 6", "Note 7", "Note 8", "Note 9"]
@@ -0,0 +1,199 @@
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from readingdiary.journal import OP_ADD_BOOK, Journal, JournaledDiary
+from readingdiary.model import ReadingDiary
+
+NUM_THREADS = 8
+NOTES_PER_THREAD = 500
+ISBNS = [f"isbn-{i}" for i in range(5)]
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target):
+    barrier = threading.Barrier(NUM_THREADS)
+    errors = []
+
+    def worker(n):
+        barrier.wait()
+        try:
+            target(n)
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(NUM_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def write_notes(diary, added_books):
+    def target(n):
+        for isbn in ISBNS:
+            if diary.add_book(isbn, f"Title {isbn}", "Author X", 100):
+                added_books.append(isbn)
+        for i in range(NOTES_PER_THREAD):
+            isbn = ISBNS[(n + i) % len(ISBNS)]
+            date = datetime(2021, 1, 1) + timedelta(minutes=i)
+            assert diary.add_note_to_book(isbn, f"thread{n} note{i}", i % 10, date)
+    return target
+
+
+def test_concurrent_writers_keep_diary_consistent():
+    diary = ReadingDiary()
+    added_books = []
+    run_threads(write_notes(diary, added_books))
+
+    assert sorted(added_books) == sorted(ISBNS)
+    total = NUM_THREADS * NOTES_PER_THREAD
+    assert sum(len(book.notes) for book in diary.books.values()) == total
+    assert len(diary.latest_notes(total + 1)) == total
+
+    counts = {book: len(book.notes) for book in diary.books.values()}
+    assert diary.most_annotated_books(len(ISBNS)) == sorted(counts, key=counts.get, reverse=True)
+    for book in diary.books.values():
+        assert sum(len(book.get_notes_of_page(page)) for page in range(10)) == len(book.notes)
+        assert len(book.latest_notes(len(book.notes))) == len(book.notes)
+        page_counts = Counter(note.page for note in book.notes)
+        assert page_counts[book.page_with_most_notes()] == max(page_counts.values())
+        expected = sum(note.text.endswith(" note0") for note in book.notes)
+        assert len(diary.search_notes("note0", isbn=book.isbn, limit=total)) == expected
+
+
+def test_concurrent_writers_journal_every_note(tmp_path):
+    path = str(tmp_path / "diary.rdry")
+    diary = JournaledDiary(path)
+    run_threads(write_notes(diary, []))
+    diary.close()
+
+    reopened = JournaledDiary(path)
+    assert {isbn: len(reopened.search_by_isbn(isbn).notes) for isbn in ISBNS} == {
+        isbn: len(book.notes) for isbn, book in diary.books.items()}
+    reopened.close()
+
+
+def test_concurrent_readers_load_deferred_notes_once(tmp_path):
+    path = str(tmp_path / "diary.rdry")
+    diary = JournaledDiary(path)
+    run_threads(write_notes(diary, []))
+    diary.compact()
+    diary.close()
+
+    reopened = JournaledDiary(path)
+    run_threads(lambda n: [reopened.search_by_isbn(isbn) for isbn in ISBNS])
+    assert len(reopened.latest_notes(NUM_THREADS * NOTES_PER_THREAD + 1)) == NUM_THREADS * NOTES_PER_THREAD
+    reopened.close()
+
+
+def test_concurrent_writers_add_one_book_per_isbn_form():
+    forms = ["0306406152", "9780306406157", "978-0-306-40615-7", "0-306-40615-2"]
+    for _ in range(20):
+        diary = ReadingDiary()
+        added = []
+        run_threads(lambda n: added.extend(form for form in forms[n % 4:] + forms[:n % 4]
+                                           if diary.add_book(form, "Title", "Author", 100)))
+
+        assert len(added) == 1
+        assert list(diary.books) == added
+
+
+def test_concurrent_writers_keep_undo_history_consistent():
+    diary = ReadingDiary()
+
+    def target(n):
+        diary.add_book(f"own-{n}", "Own Book", "Author X", 100)
+        for i in range(2 * NOTES_PER_THREAD):
+            diary.add_note_to_book(f"own-{n}", f"note{i}", 1, datetime(2021, 1, 1))
+            diary.rate_book(f"own-{n}", 1 + i % 3)
+
+    run_threads(target)
+    assert diary._history_size == sum(len(records) for records in diary._history) == diary.HISTORY_SIZE
+    run_threads(lambda n: [diary.undo() for _ in range(50)])
+    assert diary._history_size == sum(len(records) for records in diary._history)
+    assert len(diary._redo) == NUM_THREADS * 50
+
+
+def test_book_is_journaled_before_notes_added_while_it_is_logged(tmp_path, monkeypatch):
+    path = str(tmp_path / "diary.rdry")
+    diary = JournaledDiary(path, sync_every=1)
+    logging, release = threading.Event(), threading.Event()
+    append = Journal.append
+
+    def slow_append(journal, payload):
+        if payload[0] == OP_ADD_BOOK:
+            logging.set()
+            release.wait(5)
+        append(journal, payload)
+
+    monkeypatch.setattr(Journal, "append", slow_append)
+    adder = threading.Thread(target=diary.add_book, args=("9780306406157", "Title", "Author", 100))
+    adder.start()
+    assert logging.wait(5)
+    added = []
+    writer = threading.Thread(target=lambda: added.append(
+        diary.add_note_to_book("9780306406157", "Note", 1, datetime(2021, 1, 1))))
+    writer.start()
+    writer.join(0.2)
+    release.set()
+    adder.join()
+    writer.join()
+    diary.close()
+
+    assert added == [True]
+    reopened = JournaledDiary(path)
+    assert [note.text for note in reopened.search_by_isbn("9780306406157").notes] == ["Note"]
+    reopened.close()
+
+
+def test_batch_of_one_thread_neither_records_nor_reverts_writes_of_another():
+    diary = ReadingDiary()
+    diary.add_book("a", "Title A", "Author X", 100)
+    diary.add_book("b", "Title B", "Author X", 100)
+    opened, failed = threading.Event(), threading.Event()
+    results = []
+
+    def batch_writer():
+        try:
+            with diary.batch():
+                diary.add_note_to_book("a", "Batched", 1, datetime(2021, 1, 1))
+                opened.set()
+                failed.wait(5)
+                raise ValueError("Rolled back")
+        except ValueError:
+            pass
+
+    def other_batch():
+        with diary.batch():
+            results.append(diary.add_note_to_book("a", "Own batch", 2, datetime(2021, 1, 2)))
+
+    owner = threading.Thread(target=batch_writer)
+    owner.start()
+    assert opened.wait(5)
+    others = [threading.Thread(target=lambda: results.append(
+        diary.add_note_to_book("b", "Outside", 1, datetime(2021, 1, 1)))), threading.Thread(target=other_batch)]
+    for thread in others:
+        thread.start()
+    others[0].join(0.2)
+    failed.set()
+    owner.join()
+    for thread in others:
+        thread.join()
+
+    assert results == [True, True]
+    assert [note.text for note in diary.search_by_isbn("a").notes] == ["Own batch"]
+    assert [note.text for note in diary.search_by_isbn("b").notes] == ["Outside"]
+    assert diary.undo() and diary.undo()
+    assert not diary.search_by_isbn("a").notes and not diary.search_by_isbn("b").notes
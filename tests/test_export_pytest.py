@@ -0,0 +1,96 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from readingdiary.bulk import import_notes, read_csv, read_jsonl
+from readingdiary.columnar import ColumnarBook
+from readingdiary.export import WRITE_CHUNK, export_csv, export_jsonl, write_notes
+from readingdiary.model import ReadingDiary
+
+
+@pytest.fixture(params=[None, ColumnarBook], ids=["book", "columnar"])
+def diary(request):
+    diary = ReadingDiary() if request.param is None else ReadingDiary(request.param)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_book("5678", "Another Book", "Author Y", 200)
+    diary.add_note_to_book("1234", "Note 1", 3, datetime(2021, 1, 1))
+    diary.add_note_to_book("5678", "Note 2", 1, datetime(2021, 1, 2))
+    diary.add_note_to_book("1234", "Note, \"3\"", 1, datetime(2021, 1, 3, 9, 15))
+    diary.add_note_to_book("1234", "Note 4", 3, datetime(2021, 1, 4))
+    diary.add_note_to_book("1234", "Note 5", 7, datetime(2021, 1, 5))
+    return diary
+
+
+def texts(notes):
+    return [note.text for note in notes]
+
+
+def test_book_iter_notes_of_page_is_lazy(diary):
+    notes = diary.search_by_isbn("1234").iter_notes_of_page(3)
+    assert not isinstance(notes, list)
+    assert texts(notes) == ["Note 1", "Note 4"]
+
+
+@pytest.mark.parametrize("first, last, expected", [
+    (1, 3, ["Note, \"3\"", "Note 1", "Note 4"]),
+    (2, 100, ["Note 1", "Note 4", "Note 5"]),
+    (4, 6, []),
+    (3, 1, []),
+])
+def test_book_iter_notes_in_pages(diary, first, last, expected):
+    assert texts(diary.search_by_isbn("1234").iter_notes_in_pages(first, last)) == expected
+
+
+def test_book_iter_notes_between_excludes_end(diary):
+    notes = diary.search_by_isbn("1234").iter_notes_between(datetime(2021, 1, 1), datetime(2021, 1, 4))
+    assert texts(notes) == ["Note 1", "Note, \"3\""]
+
+
+def test_diary_iter_notes_yields_every_note(diary):
+    assert [(book.isbn, note.text) for book, note in diary.iter_notes()] == [
+        ("1234", "Note 1"), ("1234", "Note, \"3\""), ("1234", "Note 4"), ("1234", "Note 5"), ("5678", "Note 2"),
+    ]
+
+
+def test_diary_iter_notes_between(diary):
+    rows = diary.iter_notes_between(datetime(2021, 1, 2), datetime(2021, 1, 4))
+    assert [(book.isbn, note.text) for book, note in rows] == [("5678", "Note 2"), ("1234", "Note, \"3\"")]
+
+
+@pytest.mark.parametrize("export, read", [(export_jsonl, read_jsonl), (export_csv, read_csv)])
+def test_export_round_trips_through_bulk_import(diary, tmp_path, export, read):
+    path = tmp_path / "notes.out"
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        assert export(diary.iter_notes(), stream) == 5
+
+    copy = ReadingDiary()
+    copy.add_book("1234", "Test Book", "Author X", 100)
+    copy.add_book("5678", "Another Book", "Author Y", 200)
+    assert import_notes(copy, read(str(path))).accepted == 5
+    assert [(book.isbn, note.text, note.page, note.date) for book, note in copy.iter_notes()] == \
+        [(book.isbn, note.text, note.page, note.date) for book, note in diary.iter_notes()]
+
+
+def test_export_writes_incrementally(diary):
+    stream = io.StringIO()
+    rows = diary.iter_notes()
+    export_jsonl((next(rows),), stream)
+    assert stream.getvalue().count("\n") == 1
+
+
+def test_write_notes_renders_one_line_per_note(diary):
+    stream = io.StringIO()
+    assert write_notes(diary.search_by_isbn("1234").iter_notes_of_page(3), stream, with_ids=True) == 2
+    assert stream.getvalue() == ("[0] 2021-01-01 00:00:00 - page 3: Note 1\n"
+                                 "[2] 2021-01-04 00:00:00 - page 3: Note 4\n")
+    assert write_notes([], stream) == 0
+
+
+def test_write_notes_writes_in_chunks(diary):
+    book = diary.search_by_isbn("5678")
+    for i in range(WRITE_CHUNK + 10):
+        book.add_note(f"Note {i}", 1, datetime(2021, 1, 1))
+    stream = io.StringIO()
+    assert write_notes(book.iter_notes(), stream) == WRITE_CHUNK + 11
+    assert stream.getvalue().splitlines() == [str(note) for note in book.iter_notes()]
@@ -0,0 +1,38 @@
+import pytest
+
+from readingdiary.isbn import INVALID_KEY, is_valid_isbn, isbn_key, isbn_keys, normalize_isbn
+
+ISBNS = [
+    ("978-0-13-235088-4", 9780132350884),
+    ("978 0 13 235088 4", 9780132350884),
+    ("0-13-235088-2", 9780132350884),
+    ("080442957X", 9780804429573),
+    ("0-8044-2957-x", 9780804429573),
+    ("979-10-90636-07-1", 9791090636071),
+    ("9780132350885", INVALID_KEY),
+    ("0132350883", INVALID_KEY),
+    ("978013235088X", INVALID_KEY),
+    ("97801323508840", INVALID_KEY),
+    ("1234", INVALID_KEY),
+    ("", INVALID_KEY),
+]
+
+
+@pytest.mark.parametrize("isbn, key", ISBNS)
+def test_isbn_key_normalizes_and_validates(isbn, key):
+    assert isbn_key(isbn) == key
+    assert is_valid_isbn(isbn) == (key != INVALID_KEY)
+
+
+def test_normalize_isbn_returns_isbn13_digits():
+    assert normalize_isbn("0-13-235088-2") == "9780132350884"
+    with pytest.raises(ValueError):
+        normalize_isbn("0-13-235088-3")
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_isbn_keys_matches_isbn_key(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    isbns = [isbn for isbn, _ in ISBNS] + [f"{i:013d}" for i in range(0, 10**13, 10**10 + 7)]
+    assert list(isbn_keys(isbns, use_numpy)) == [isbn_key(isbn) for isbn in isbns]
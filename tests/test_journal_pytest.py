@@ -0,0 +1,211 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from readingdiary.journal import OP_BATCH, JournaledDiary, read_journal
+from readingdiary.model import Book
+from readingdiary.storage import save_diary
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "diary.rdry")
+
+
+def fill(diary):
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_book("5678", "Another Book", "Author Y", 200)
+    diary.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    diary.search_by_isbn("1234").add_note("Note 2", 2, datetime(2021, 1, 2))
+    diary.rate_book("1234", Book.GOOD)
+    diary.search_by_isbn("5678").set_rating(Book.EXCELLENT)
+
+
+def as_tuples(diary):
+    return [
+        (book.isbn, book.title, book.author, book.pages, book.rating,
+         [(note.text, note.page, note.date) for note in book.notes])
+        for book in (diary.search_by_isbn(isbn) for isbn in diary.books)
+    ]
+
+
+def test_journaled_diary_replays_log_after_crash(path):
+    diary = JournaledDiary(path, sync_every=1000, sync_interval=1000)
+    fill(diary)
+    diary.sync()
+    expected = as_tuples(diary)
+
+    assert not os.path.exists(path)
+    assert as_tuples(JournaledDiary(path)) == expected
+
+
+def test_journaled_diary_ignores_torn_tail(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    expected = as_tuples(diary)
+    diary.add_note_to_book("5678", "Lost note", 1, datetime(2021, 1, 3))
+    diary.close()
+    os.truncate(diary.log_path, os.path.getsize(diary.log_path) - 3)
+
+    reopened = JournaledDiary(path)
+    assert as_tuples(reopened) == expected
+    reopened.add_note_to_book("5678", "Kept note", 1, datetime(2021, 1, 4))
+    reopened.close()
+    assert [note.text for note in JournaledDiary(path).search_by_isbn("5678").notes] == ["Kept note"]
+
+
+def test_journaled_diary_compact_folds_log_into_snapshot(path):
+    diary = JournaledDiary(path)
+    fill(diary)
+    diary.compact()
+    diary.add_book("9012", "Third Book", "Author Z", 300)
+    diary.close()
+    expected = as_tuples(diary)
+
+    assert os.path.exists(path)
+    assert as_tuples(JournaledDiary(path)) == expected
+
+
+def test_journaled_diary_discards_log_already_in_snapshot(path):
+    diary = JournaledDiary(path)
+    fill(diary)
+    diary.close()
+    save_diary(diary, path, 1)
+
+    assert as_tuples(JournaledDiary(path)) == as_tuples(diary)
+
+
+def test_journaled_diary_does_not_log_rejected_operations(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    size = os.path.getsize(diary.log_path)
+    assert not diary.add_book("1234", "Test Book", "Author X", 100)
+    assert not diary.add_note_to_book("1234", "Note", 101, datetime(2021, 1, 1))
+    assert not diary.rate_book("1234", 7)
+    assert os.path.getsize(diary.log_path) == size
+
+
+def test_journaled_diary_logs_batch_as_one_record(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    size = os.path.getsize(diary.log_path)
+    with diary.batch():
+        diary.add_book("9012", "Third Book", "Author Z", 300)
+        diary.add_note_to_book("9012", "Note 3", 3, datetime(2021, 1, 3))
+        diary.rate_book("9012", Book.BAD)
+    _, records, _ = read_journal(diary.log_path)
+    expected = as_tuples(diary)
+    diary.close()
+
+    assert os.path.getsize(diary.log_path) > size
+    assert records[-1][0] == OP_BATCH
+    assert as_tuples(JournaledDiary(path)) == expected
+
+
+def test_journaled_diary_drops_torn_batch(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    expected = as_tuples(diary)
+    size = os.path.getsize(diary.log_path)
+    with diary.batch():
+        diary.add_book("9012", "Third Book", "Author Z", 300)
+        diary.add_note_to_book("9012", "Note 3", 3, datetime(2021, 1, 3))
+    diary.close()
+    os.truncate(diary.log_path, os.path.getsize(diary.log_path) - 1)
+
+    assert os.path.getsize(diary.log_path) > size
+    assert as_tuples(JournaledDiary(path)) == expected
+
+
+def test_journaled_diary_does_not_log_rolled_back_batch(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    size = os.path.getsize(diary.log_path)
+    with pytest.raises(RuntimeError):
+        with diary.batch():
+            diary.add_book("9012", "Third Book", "Author Z", 300)
+            raise RuntimeError
+    assert os.path.getsize(diary.log_path) == size
+
+
+def test_journaled_diary_replays_undo_and_redo(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    with diary.batch():
+        diary.add_book("9012", "Third Book", "Author Z", 300)
+        diary.add_note_to_book("9012", "Note 3", 3, datetime(2021, 1, 3))
+    diary.undo()
+    diary.undo()
+    diary.undo()
+    diary.redo()
+    expected = as_tuples(diary)
+    diary.close()
+
+    reopened = JournaledDiary(path)
+    assert as_tuples(reopened) == expected
+    assert reopened.search_by_isbn("5678").rating == Book.UNRATED
+    assert not reopened.undo()
+
+
+def test_journaled_diary_replays_note_edits(path):
+    diary = JournaledDiary(path, sync_every=1)
+    fill(diary)
+    diary.add_note_to_book("1234", "Note 3", 3, datetime(2021, 1, 3))
+    diary.update_note("1234", 0, text="Edited", date=datetime(2021, 1, 4))
+    diary.remove_note("1234", 1)
+    diary.remove_note("1234", 2)
+    diary.undo()
+    diary.add_note_to_book("1234", "Note 4", 4, datetime(2021, 1, 5))
+    expected = [(note.id, note.text, note.page, note.date) for note in diary.search_by_isbn("1234").notes]
+    diary.close()
+
+    reopened = JournaledDiary(path)
+    assert [(note.id, note.text, note.page, note.date) for note in reopened.search_by_isbn("1234").notes] == expected
+    assert [note.id for note in reopened.search_by_isbn("1234").notes] == [0, 2, 3]
+
+
+def test_journaled_diary_replays_books_logged_under_two_forms_of_one_isbn(path):
+    diary = JournaledDiary(path, sync_every=1)
+    diary._add_book("0306406152", "Short Form", "Author X", 100)
+    diary._add_book("978-0-306-40615-7", "Long Form", "Author X", 100)
+    diary.add_note_to_book("978-0-306-40615-7", "Note 1", 1, datetime(2021, 1, 1))
+    expected = as_tuples(diary)
+    diary.close()
+
+    reopened = JournaledDiary(path)
+    assert as_tuples(reopened) == expected
+    reopened.close()
+
+
+def test_journaled_diary_replays_utc_offsets(path):
+    zone = timezone(timedelta(hours=-5))
+    diary = JournaledDiary(path, sync_every=1)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_note_to_book("1234", "Aware", 1, datetime(2021, 1, 1, 8, tzinfo=zone))
+    diary.add_note_to_book("1234", "Naive", 1, datetime(2021, 1, 2))
+    diary.update_note("1234", 1, date=datetime(2021, 1, 3, tzinfo=timezone.utc))
+    diary.remove_note("1234", 0)
+    diary.undo()
+    expected = [str(note) for note in diary.search_by_isbn("1234").notes]
+    diary.close()
+
+    reopened = JournaledDiary(path)
+    assert [str(note) for note in reopened.search_by_isbn("1234").notes] == expected
+    assert reopened.search_by_isbn("1234").get_note(0).date.utcoffset() == timedelta(hours=-5)
+    reopened.close()
+
+
+def test_journal_flushes_buffered_records_after_the_sync_interval(path):
+    diary = JournaledDiary(path, sync_every=1000, sync_interval=0.05)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    size = os.path.getsize(diary.log_path)
+    deadline = time.monotonic() + 5
+    while len(read_journal(diary.log_path)[1]) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(read_journal(diary.log_path)[1]) == 2
+    assert os.path.getsize(diary.log_path) > size
+    diary.close()
+    assert as_tuples(JournaledDiary(path)) == as_tuples(diary)
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from readingdiary import metrics
+from readingdiary.columnar import ColumnarBook
+from readingdiary.metrics import Histogram, Metrics
+from readingdiary.model import Book, ReadingDiary
+
+
+@pytest.fixture
+def recorder():
+    with metrics.enabled(Metrics()) as recorder:
+        yield recorder
+
+
+def fill(diary):
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    diary.add_note_to_book("1234", "Note 2", 1, datetime(2021, 1, 2))
+    diary.add_note_to_book("1234", "Too far", 101, datetime(2021, 1, 3))
+    diary.search_by_isbn("1234").get_notes_of_page(1)
+
+
+def test_disabled_metrics_leave_methods_untouched():
+    add_note = Book.add_note
+    with metrics.enabled(Metrics()):
+        assert Book.add_note is not add_note
+        assert metrics.is_enabled()
+    assert Book.add_note is add_note
+    assert not metrics.is_enabled()
+
+
+def test_nested_enables_keep_methods_instrumented_until_the_outermost_exit(recorder):
+    with metrics.enabled(recorder):
+        ReadingDiary().add_book("1234", "Test Book", "Author X", 100)
+    assert metrics.is_enabled()
+    ReadingDiary().add_book("1234", "Test Book", "Author X", 100)
+    assert recorder.snapshot()["ReadingDiary.add_book"]["calls"] == 2
+
+
+def test_enabling_another_metrics_instance_while_enabled_raises(recorder):
+    with pytest.raises(RuntimeError):
+        with metrics.enabled(Metrics()):
+            pass
+    assert metrics.is_enabled()
+    ReadingDiary().add_book("1234", "Test Book", "Author X", 100)
+    assert recorder.snapshot()["ReadingDiary.add_book"]["calls"] == 1
+
+
+def test_metrics_count_calls_and_rejections(recorder):
+    fill(ReadingDiary())
+    stats = recorder.snapshot()
+    assert stats["ReadingDiary.add_note_to_book"]["calls"] == 3
+    assert stats["ReadingDiary.add_note_to_book"]["rejected"] == 1
+    assert stats["Book.add_note"]["calls"] == 3
+    assert stats["Book.get_notes_of_page"]["calls"] == 1
+    assert stats["ReadingDiary.search_by_isbn"]["calls"] == 4
+    assert "ReadingDiary.add_note_to_book" in recorder.report()
+
+
+def test_metrics_name_subclass_overrides(recorder):
+    fill(ReadingDiary(ColumnarBook))
+    stats = recorder.snapshot()
+    assert stats["ColumnarBook.get_notes_of_page"]["calls"] == 1
+    assert "Book.get_notes_of_page" not in stats
+
+
+def test_metrics_count_errors_and_call_tracers(recorder):
+    traced = []
+    recorder.add_tracer(lambda name, started, elapsed: traced.append(name))
+    diary = ReadingDiary()
+    with pytest.raises(RuntimeError):
+        with diary.batch():
+            diary.undo()
+    assert recorder.snapshot()["ReadingDiary.undo"]["errors"] == 1
+    assert traced == ["ReadingDiary.undo"]
+
+
+def test_histogram_percentiles_are_bounded_by_max():
+    histogram = Histogram()
+    for nanoseconds in (100, 200, 300, 5_000):
+        histogram.record(nanoseconds)
+    assert histogram.percentile(0.5) == 256
+    assert histogram.percentile(0.99) == 5_000
+    assert Metrics().report() == "No operations recorded"
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, strategies as st
+
+from readingdiary.model import Book, ReadingDiary
+
+
+def recompute_page_with_most_notes(book: Book) -> int:
+    notes_of_page = {}
+
+    for note in book.notes:
+        if note.page not in notes_of_page:
+            notes_of_page[note.page] = 1
+        else:
+            notes_of_page[note.page] += 1
+
+    if not notes_of_page:
+        return -1
+
+    max_page = None
+    max_count = -1
+
+    for page, count in notes_of_page.items():
+        if count > max_count:
+            max_count = count
+            max_page = page
+
+    return max_page
+
+
+@given(st.lists(st.integers(min_value=-5, max_value=15)))
+def test_page_with_most_notes_matches_full_recompute(pages):
+    book = Book("1234", "Test Book", "Author X", 10)
+    for page in pages:
+        book.add_note("Note", page, datetime(2021, 1, 1))
+        assert book.page_with_most_notes() == recompute_page_with_most_notes(book)
+
+
+@given(st.lists(st.integers(min_value=1, max_value=10), min_size=1))
+def test_get_notes_of_page_matches_linear_scan(pages):
+    book = Book("1234", "Test Book", "Author X", 10)
+    for i, page in enumerate(pages):
+        book.add_note(f"Note {i}", page, datetime(2021, 1, 1))
+    for page in set(pages):
+        assert book.get_notes_of_page(page) == [note for note in book.notes if note.page == page]
+
+
+@given(st.integers(min_value=1, max_value=6), st.lists(st.integers(min_value=0, max_value=5)))
+def test_book_with_most_notes_matches_full_scan(num_books, isbns):
+    diary = ReadingDiary()
+    for isbn in range(num_books):
+        diary.add_book(str(isbn), "Title", "Author", 10)
+    for isbn in isbns:
+        diary.add_note_to_book(str(isbn), "Note", 1, datetime(2021, 1, 1))
+        expected = max(diary.books.values(), key=lambda book: len(book.notes))
+        assert diary.book_with_most_notes() is (expected if expected.notes else None)
+
+
+@given(st.lists(st.integers(min_value=0, max_value=20)), st.integers(min_value=0, max_value=20),
+       st.integers(min_value=0, max_value=20), st.integers(min_value=0, max_value=25))
+def test_date_index_matches_filter_and_sort(days, start, end, n):
+    diary = ReadingDiary()
+    diary.add_book("1234", "Title", "Author", 10)
+    diary.add_book("5678", "Title", "Author", 10)
+    origin = datetime(2021, 1, 1)
+    for i, day in enumerate(days):
+        diary.add_note_to_book("1234" if i % 3 else "5678", f"Note {i}", 1, origin + timedelta(days=day))
+    start, end = origin + timedelta(days=start), origin + timedelta(days=end)
+
+    rows = [(book, note) for book in diary.books.values() for note in book.notes]
+    rows.sort(key=lambda row: int(row[1].text.split()[1]))
+    by_date = sorted(rows, key=lambda row: row[1].date)
+    assert list(diary.iter_notes_between(start, end)) == [row for row in by_date if start <= row[1].date < end]
+    assert diary.latest_notes(n) == by_date[::-1][:n]
+
+    book = diary.books["1234"]
+    assert list(book.iter_notes_between(start, end)) == sorted(
+        (note for note in book.notes if start <= note.date < end), key=lambda note: note.date)
+
+
+def diary_state(diary):
+    return [(book.isbn, book.rating, [(note.text, note.page, note.date) for note in book.notes],
+             book.page_with_most_notes()) for book in diary.books.values()]
+
+
+@given(st.lists(st.tuples(st.integers(min_value=0, max_value=3), st.integers(min_value=1, max_value=5),
+                          st.booleans()), max_size=30))
+def test_undo_restores_every_earlier_state(operations):
+    diary = ReadingDiary()
+    states = [diary_state(diary)]
+    for i, (isbn, page, rate) in enumerate(operations):
+        if str(isbn) not in diary.books:
+            diary.add_book(str(isbn), "Title", "Author", 10)
+        elif rate:
+            diary.rate_book(str(isbn), page % 3 + 1)
+        else:
+            diary.add_note_to_book(str(isbn), f"Note {i}", page, datetime(2021, 1, 1) + timedelta(days=page))
+        states.append(diary_state(diary))
+
+    for state in reversed(states[:-1]):
+        if not diary.undo():
+            break
+        assert diary_state(diary) == state
+        assert sum(len(notes) for _, _, notes, _ in state) == len(diary.latest_notes(100))
+
+    while diary.redo():
+        pass
+    assert diary_state(diary) == states[-1]
+
+
+@given(st.lists(st.tuples(st.sampled_from(["add", "remove", "update"]), st.integers(min_value=0, max_value=12),
+                          st.integers(min_value=1, max_value=5)), max_size=40))
+def test_note_edits_keep_book_indexes_consistent(operations):
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 10)
+    book = diary.search_by_isbn("1234")
+    for i, (op, note_id, page) in enumerate(operations):
+        if op == "add":
+            book.add_note(f"Note {i}", page, datetime(2021, 1, 1) + timedelta(days=page))
+        elif op == "remove":
+            book.remove_note(note_id)
+        else:
+            book.update_note(note_id, f"Edit {i}", page, datetime(2021, 1, 1) + timedelta(days=i % 3))
+        assert book.page_with_most_notes() == recompute_page_with_most_notes(book)
+
+    assert [note.id for note in book.notes] == sorted({note.id for note in book.notes})
+    for page in range(1, 6):
+        assert book.get_notes_of_page(page) == [note for note in book.notes if note.page == page]
+    assert book.latest_notes(50) == sorted(book.notes, key=lambda note: (note.date, note.id), reverse=True)
+    assert len(diary.latest_notes(50)) == len(book.notes)
+    assert {note.id for _, note in diary.search_notes("note edit", limit=50)} == {note.id for note in book.notes}
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import inspect
 
 import pytest
@@ -74,6 +74,20 @@ def test_note_class_initializes_attributes(text, page, date):
 def test_note_class_str_method(note):
     assert str(note) == "2021-01-01 00:00:00 - page 1: This is a note"
 
+@pytest.mark.skipif(not note_defined, reason="Note class not defined")
+def test_note_class_str_method_follows_field_changes(note):
+    str(note)
+    note.text = "Edited"
+    assert str(note) == "2021-01-01 00:00:00 - page 1: Edited"
+    note.date = datetime(2021, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+    assert str(note) == "2021-01-01 02:00:00+02:00 - page 1: Edited"
+    note.date = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    assert str(note) == "2021-01-01 00:00:00+00:00 - page 1: Edited"
+
+@pytest.mark.skipif(not note_defined, reason="Note class not defined")
+def test_note_class_has_no_instance_dict(note):
+    assert not hasattr(note, "__dict__")
+
 # Test Book class
 @pytest.mark.skipif(not book_defined, reason="Book class not defined")
 @pytest.mark.parametrize("const_name, const_value", [
@@ -163,6 +177,63 @@ def test_class_book_get_notes_of_page_method_returns_notes_of_given_page(book_wi
 def test_class_book_get_notes_of_page_method_returns_empty_list_when_no_notes(book_without_notes):
     assert book_without_notes.get_notes_of_page(1) == []
 
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_get_notes_of_page_method_keeps_insertion_order(book_with_notes):
+    assert [note.text for note in book_with_notes.get_notes_of_page(1)] == ["Note 1", "Note 3"]
+    assert [note.text for note in book_with_notes.notes] == ["Note 1", "Note 2", "Note 3"]
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_get_notes_of_page_method_returns_a_new_list(book_with_notes):
+    book_with_notes.get_notes_of_page(1).clear()
+    assert len(book_with_notes.get_notes_of_page(1)) == 2
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_iter_notes_between_method_returns_notes_in_date_order(book_without_notes):
+    book_without_notes.add_note("Note 1", 1, datetime(2021, 1, 3))
+    book_without_notes.add_note("Note 2", 1, datetime(2021, 1, 1))
+    book_without_notes.add_note("Note 3", 1, datetime(2021, 1, 2))
+    book_without_notes.add_note("Note 4", 1, datetime(2021, 1, 2))
+    notes = book_without_notes.iter_notes_between(datetime(2021, 1, 2), datetime(2021, 1, 3))
+    assert [note.text for note in notes] == ["Note 3", "Note 4"]
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_orders_naive_and_aware_dates_together(book_without_notes):
+    assert book_without_notes.add_note("Naive noon", 1, datetime(2021, 1, 1, 12))
+    assert book_without_notes.add_note("Aware eleven", 2, datetime(2021, 1, 1, 13, tzinfo=timezone(timedelta(hours=2))))
+    assert book_without_notes.add_note("Naive half past", 1, datetime(2021, 1, 1, 11, 30))
+    assert [note.text for note in book_without_notes.latest_notes(3)] == ["Naive noon", "Naive half past", "Aware eleven"]
+    notes = book_without_notes.iter_notes_between(datetime(2021, 1, 1, 11, 15, tzinfo=timezone.utc), datetime(2021, 1, 1, 12))
+    assert [note.text for note in notes] == ["Naive half past"]
+    assert book_without_notes.remove_note(1)
+    assert [note.text for note in book_without_notes.latest_notes(3)] == ["Naive noon", "Naive half past"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_book_restores_notes_of_one_date_in_id_order(diary_with_books):
+    for text in ("First", "Second", "Third"):
+        assert diary_with_books.add_note_to_book("1234", text, 1, datetime(2021, 1, 9))
+    assert diary_with_books.remove_note("1234", 1)
+    assert diary_with_books.undo()
+    book = diary_with_books.search_by_isbn("1234")
+    assert [note.text for note in book.latest_notes(3)] == ["Third", "Second", "First"]
+    assert [note.text for note in book.iter_notes_between(datetime(2021, 1, 9), datetime(2021, 1, 10))] == [
+        "First", "Second", "Third"]
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_add_note_method_leaves_book_untouched_when_date_is_invalid(book_with_notes):
+    with pytest.raises(AttributeError):
+        book_with_notes.add_note("Broken", 1, "2021-01-04")
+    assert [note.id for note in book_with_notes.notes] == [0, 1, 2]
+    assert len(book_with_notes.get_notes_of_page(1)) == 2
+    assert len(book_with_notes.latest_notes(10)) == 3
+    assert book_with_notes.add_note("Note 4", 1, datetime(2021, 1, 4))
+    assert book_with_notes.notes[-1].id == 3
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_latest_notes_method_returns_newest_first(book_with_notes):
+    assert [note.text for note in book_with_notes.latest_notes(2)] == ["Note 3", "Note 2"]
+    assert len(book_with_notes.latest_notes(10)) == 3
+    assert book_with_notes.latest_notes(0) == []
+
 @pytest.mark.skipif(not book_defined, reason="Book class not defined")
 def test_class_book_page_with_most_notes_method_returns_page_with_most_notes(book_with_notes):
     assert book_with_notes.page_with_most_notes() == 1
@@ -171,9 +242,55 @@ def test_class_book_page_with_most_notes_method_returns_page_with_most_notes(boo
 def test_class_book_page_with_most_notes_method_returns_minus_one_when_no_notes(book_without_notes):
     assert book_without_notes.page_with_most_notes() == -1
 
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_add_note_method_assigns_increasing_ids(book_with_notes):
+    assert [note.id for note in book_with_notes.notes] == [0, 1, 2]
+    assert book_with_notes.get_note(1).text == "Note 2"
+    assert book_with_notes.get_note(3) is None
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_remove_note_method_removes_note_from_every_view(book_with_notes):
+    assert book_with_notes.remove_note(0)
+    assert not book_with_notes.remove_note(0)
+    assert [note.text for note in book_with_notes.notes] == ["Note 2", "Note 3"]
+    assert [note.text for note in book_with_notes.get_notes_of_page(1)] == ["Note 3"]
+    assert book_with_notes.page_with_most_notes() == 2
+    assert [note.text for note in book_with_notes.latest_notes(5)] == ["Note 3", "Note 2"]
+    book_with_notes.add_note("Note 4", 1, datetime(2021, 1, 4))
+    assert book_with_notes.notes[-1].id == 3
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_update_note_method_keeps_note_id(book_with_notes):
+    assert book_with_notes.update_note(2, page=2, date=datetime(2020, 12, 31))
+    note = book_with_notes.get_note(2)
+    assert (note.text, note.page, note.date) == ("Note 3", 2, datetime(2020, 12, 31))
+    assert [note.id for note in book_with_notes.get_notes_of_page(2)] == [1, 2]
+    assert book_with_notes.page_with_most_notes() == 2
+    assert [note.text for note in book_with_notes.latest_notes(5)] == ["Note 2", "Note 1", "Note 3"]
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_update_note_method_returns_false_when_page_out_of_range(book_with_notes):
+    assert not book_with_notes.update_note(0, page=101)
+    assert not book_with_notes.update_note(7, text="Missing")
+    assert book_with_notes.get_note(0).page == 1
+
 @pytest.mark.skipif(not book_defined, reason="Book class not defined")
 def test_class_book_str_method(book_without_notes):
     assert str(book_without_notes) == "ISBN: 1234\nTitle: Test Book\nAuthor: Author X\nPages: 100\nRating: unrated"
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_str_method_follows_rating_changes(book_without_notes):
+    str(book_without_notes)
+    book_without_notes.set_rating(Book.GOOD)
+    assert str(book_without_notes).endswith("Rating: good")
+    book_without_notes.set_rating(Book.EXCELLENT)
+    assert str(book_without_notes).endswith("Rating: excellent")
+    book_without_notes.rating = 7
+    assert str(book_without_notes).endswith("Rating: unrated")
+
+@pytest.mark.skipif(not book_defined, reason="Book class not defined")
+def test_class_book_has_no_instance_dict(book_without_notes):
+    assert not hasattr(book_without_notes, "__dict__")
     
 # Test ReadingDiary class
 @pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
@@ -230,6 +347,14 @@ def test_class_reading_diary_search_by_isbn_method_returns_book(diary_with_books
 def test_class_reading_diary_search_by_isbn_method_returns_none_when_isbn_not_found(diary_with_books):
     assert diary_with_books.search_by_isbn("9999") is None
 
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+@pytest.mark.parametrize("isbn", ["978-0-13-235088-4", "9780132350884", "0-13-235088-2", "0132350882"])
+def test_class_reading_diary_search_by_isbn_method_accepts_any_isbn_form(empty_diary, isbn):
+    empty_diary.add_book("978-0132350884", "Clean Code", "Robert C. Martin", 464)
+    assert empty_diary.search_by_isbn(isbn).isbn == "978-0132350884"
+    assert not empty_diary.add_book(isbn, "Clean Code", "Robert C. Martin", 464)
+    assert empty_diary.search_by_isbn("9780132350885") is None
+
 @pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
 @pytest.mark.parametrize("isbn, text, page, date", [
     ("1234", "This is a note", 1, datetime(2021, 1, 1)),
@@ -275,4 +400,200 @@ def test_class_reading_diary_book_with_most_notes_method_returns_none_when_no_bo
 
 @pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
 def test_class_reading_diary_book_with_most_notes_method_returns_none_when_no_notes(diary_with_books):
-    assert diary_with_books.book_with_most_notes() is None
\ No newline at end of file
+    assert diary_with_books.book_with_most_notes() is None
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_book_with_most_notes_method_counts_notes_added_through_book(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    diary_with_books.search_by_isbn("5678").add_note("Note 2", 1, datetime(2021, 1, 2))
+    diary_with_books.search_by_isbn("5678").add_note("Note 3", 2, datetime(2021, 1, 3))
+    assert diary_with_books.book_with_most_notes().isbn == "5678"
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_book_with_most_notes_method_prefers_first_added_book_on_tie(diary_with_books):
+    diary_with_books.add_note_to_book("5678", "Note 1", 1, datetime(2021, 1, 1))
+    diary_with_books.add_note_to_book("1234", "Note 2", 1, datetime(2021, 1, 2))
+    assert diary_with_books.book_with_most_notes().isbn == "1234"
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_most_annotated_books_method_returns_books_by_note_count(diary_with_books):
+    diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+    diary_with_books.add_note_to_book("5678", "Note 1", 1, datetime(2021, 1, 1))
+    diary_with_books.add_note_to_book("9012", "Note 2", 1, datetime(2021, 1, 2))
+    diary_with_books.add_note_to_book("9012", "Note 3", 1, datetime(2021, 1, 3))
+    assert [book.isbn for book in diary_with_books.most_annotated_books(10)] == ["9012", "5678"]
+    assert [book.isbn for book in diary_with_books.most_annotated_books(1)] == ["9012"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_latest_notes_method_returns_newest_notes_across_books(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    diary_with_books.add_note_to_book("5678", "Note 2", 1, datetime(2021, 1, 3))
+    diary_with_books.add_note_to_book("1234", "Note 3", 1, datetime(2021, 1, 2))
+    assert [(book.isbn, note.text) for book, note in diary_with_books.latest_notes(2)] == [("5678", "Note 2"), ("1234", "Note 3")]
+    rows = diary_with_books.iter_notes_between(datetime(2021, 1, 1), datetime(2021, 1, 3))
+    assert [note.text for _, note in rows] == ["Note 1", "Note 3"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_orders_naive_and_aware_dates_across_books(diary_with_books):
+    assert diary_with_books.add_note_to_book("1234", "Naive", 1, datetime(2021, 1, 1, 12))
+    assert diary_with_books.add_note_to_book("5678", "Aware", 1, datetime(2021, 1, 1, 13, tzinfo=timezone(timedelta(hours=2))))
+    assert [note.text for _, note in diary_with_books.latest_notes(2)] == ["Naive", "Aware"]
+    rows = diary_with_books.iter_notes_between(datetime(2021, 1, 1, 10, 30), datetime(2021, 1, 1, 11, 30))
+    assert [note.text for _, note in rows] == ["Aware"]
+    assert diary_with_books.remove_note("5678", 0)
+    assert [note.text for _, note in diary_with_books.latest_notes(2)] == ["Naive"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_batch_method_applies_changes_on_exit(diary_with_books):
+    with diary_with_books.batch():
+        diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+        diary_with_books.add_note_to_book("9012", "Note 1", 1, datetime(2021, 1, 2))
+        diary_with_books.add_note_to_book("1234", "Note 2", 1, datetime(2021, 1, 1))
+        diary_with_books.add_note_to_book("9012", "Note 3", 2, datetime(2021, 1, 3))
+        diary_with_books.rate_book("1234", Book.GOOD)
+        assert diary_with_books.book_with_most_notes() is None
+    assert diary_with_books.book_with_most_notes().isbn == "9012"
+    assert [note.text for _, note in diary_with_books.latest_notes(3)] == ["Note 3", "Note 1", "Note 2"]
+    assert [book.isbn for book in diary_with_books.search_by_title("third")] == ["9012"]
+    assert diary_with_books.search_by_isbn("1234").rating == Book.GOOD
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_batch_method_rolls_back_on_error(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Kept", 1, datetime(2021, 1, 1))
+    with pytest.raises(KeyError):
+        with diary_with_books.batch():
+            diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+            diary_with_books.add_note_to_book("1234", "Dropped", 2, datetime(2021, 1, 2))
+            diary_with_books.rate_book("1234", Book.BAD)
+            raise KeyError("9012")
+    assert "9012" not in diary_with_books.books
+    book = diary_with_books.search_by_isbn("1234")
+    assert [note.text for note in book.notes] == ["Kept"]
+    assert book.get_notes_of_page(2) == []
+    assert book.rating == Book.UNRATED
+    assert [note.text for _, note in diary_with_books.latest_notes(5)] == ["Kept"]
+    assert diary_with_books.search_by_title("third") == []
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_note_edits_update_diary_indexes(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Alpha note", 1, datetime(2021, 1, 1))
+    diary_with_books.add_note_to_book("1234", "Beta note", 1, datetime(2021, 1, 2))
+    diary_with_books.add_note_to_book("5678", "Gamma note", 1, datetime(2021, 1, 3))
+    assert diary_with_books.remove_note("1234", 0)
+    assert diary_with_books.update_note("5678", 0, text="Delta note", date=datetime(2020, 1, 1))
+    assert not diary_with_books.remove_note("0000", 0)
+    assert [book.isbn for book in diary_with_books.most_annotated_books(2)] == ["1234", "5678"]
+    assert [note.text for _, note in diary_with_books.latest_notes(5)] == ["Beta note", "Delta note"]
+    assert diary_with_books.search_notes("alpha") == []
+    assert diary_with_books.search_notes("gamma") == []
+    assert [note.text for _, note in diary_with_books.search_notes("delta")] == ["Delta note"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_batch_method_rolls_back_note_edits(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Kept", 1, datetime(2021, 1, 1))
+    with pytest.raises(KeyError):
+        with diary_with_books.batch():
+            diary_with_books.add_note_to_book("1234", "Dropped", 2, datetime(2021, 1, 2))
+            diary_with_books.update_note("1234", 0, text="Changed")
+            diary_with_books.remove_note("1234", 1)
+            diary_with_books.add_note_to_book("5678", "Dropped", 1, datetime(2021, 1, 3))
+            raise KeyError("1234")
+    book = diary_with_books.search_by_isbn("1234")
+    assert [(note.id, note.text) for note in book.notes] == [(0, "Kept")]
+    assert [note.text for _, note in diary_with_books.latest_notes(5)] == ["Kept"]
+    assert [note.text for _, note in diary_with_books.search_notes("kept changed dropped")] == ["Kept"]
+    assert diary_with_books.most_annotated_books(5) == [book]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_undo_method_reverts_note_edits(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    diary_with_books.add_note_to_book("1234", "Note 2", 2, datetime(2021, 1, 2))
+    diary_with_books.update_note("1234", 1, text="Edited", page=1)
+    diary_with_books.remove_note("1234", 0)
+    assert diary_with_books.undo()
+    assert diary_with_books.undo()
+    book = diary_with_books.search_by_isbn("1234")
+    assert [(note.id, note.text, note.page) for note in book.notes] == [(0, "Note 1", 1), (1, "Note 2", 2)]
+    assert [note.text for _, note in diary_with_books.search_notes("note")] == ["Note 1", "Note 2"]
+    assert diary_with_books.redo()
+    assert [note.text for note in book.get_notes_of_page(1)] == ["Note 1", "Edited"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_undo_method_reverts_last_change(diary_with_books):
+    diary_with_books.add_note_to_book("1234", "Note 1", 3, datetime(2021, 1, 1))
+    diary_with_books.add_note_to_book("1234", "Note 2", 3, datetime(2021, 1, 2))
+    diary_with_books.add_note_to_book("5678", "Note 3", 1, datetime(2021, 1, 3))
+    diary_with_books.rate_book("5678", Book.EXCELLENT)
+
+    assert diary_with_books.undo()
+    assert diary_with_books.search_by_isbn("5678").rating == Book.UNRATED
+    assert diary_with_books.undo()
+    assert diary_with_books.search_by_isbn("5678").notes == []
+    assert [book.isbn for book, _ in diary_with_books.search_notes("note")] == ["1234", "1234"]
+    assert diary_with_books.undo()
+    book = diary_with_books.search_by_isbn("1234")
+    assert [note.text for note in book.notes] == ["Note 1"]
+    assert book.page_with_most_notes() == 3
+    assert [note.text for _, note in diary_with_books.latest_notes(5)] == ["Note 1"]
+    assert diary_with_books.most_annotated_books(5) == [book]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_undo_method_reverts_whole_batch(diary_with_books):
+    with diary_with_books.batch():
+        diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+        diary_with_books.add_note_to_book("9012", "Note 1", 1, datetime(2021, 1, 1))
+    assert diary_with_books.undo()
+    assert "9012" not in diary_with_books.books
+    assert diary_with_books.book_with_most_notes() is None
+    assert diary_with_books.search_by_title("third") == []
+    assert diary_with_books.search_by_title("third", fuzzy=True) == []
+    assert diary_with_books.undo()
+    assert diary_with_books.undo()
+    assert diary_with_books.books == {}
+    assert not diary_with_books.undo()
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_undo_method_hides_notes_of_removed_book(diary_with_books):
+    for day in (1, 3, 5):
+        diary_with_books.add_note_to_book("1234", f"Note {day}", 1, datetime(2021, 1, day))
+    with diary_with_books.batch():
+        diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+        diary_with_books.add_note_to_book("9012", "Note 4", 1, datetime(2021, 1, 4))
+    assert diary_with_books.undo()
+    assert [note.text for _, note in diary_with_books.latest_notes(3)] == ["Note 5", "Note 3", "Note 1"]
+    rows = diary_with_books.iter_notes_between(datetime(2021, 1, 2), datetime(2021, 1, 6))
+    assert [note.text for _, note in rows] == ["Note 3", "Note 5"]
+    assert [book.isbn for book, _ in diary_with_books.search_notes("note")] == ["1234"] * 3
+    assert diary_with_books.redo()
+    assert [note.text for _, note in diary_with_books.latest_notes(2)] == ["Note 5", "Note 4"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_redo_method_reapplies_undone_change(diary_with_books):
+    with diary_with_books.batch():
+        diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+        diary_with_books.add_note_to_book("9012", "Note 1", 1, datetime(2021, 1, 1))
+    diary_with_books.undo()
+    assert diary_with_books.redo()
+    assert not diary_with_books.redo()
+    assert [note.text for note in diary_with_books.search_by_isbn("9012").notes] == ["Note 1"]
+    assert diary_with_books.book_with_most_notes().isbn == "9012"
+    assert [book.isbn for book, _ in diary_with_books.search_notes("note")] == ["9012"]
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_new_change_clears_redo(diary_with_books):
+    diary_with_books.rate_book("1234", Book.GOOD)
+    diary_with_books.undo()
+    diary_with_books.rate_book("1234", Book.BAD)
+    assert not diary_with_books.redo()
+    assert diary_with_books.search_by_isbn("1234").rating == Book.BAD
+
+@pytest.mark.skipif(not reading_diary_defined, reason="ReadingDiary class not defined")
+def test_class_reading_diary_history_is_bounded(empty_diary):
+    empty_diary.add_book("1234", "Test Book", "Author X", 100)
+    for i in range(ReadingDiary.HISTORY_SIZE + 10):
+        empty_diary.add_note_to_book("1234", f"Note {i}", 1, datetime(2021, 1, 1))
+    undone = 0
+    while empty_diary.undo():
+        undone += 1
+    assert undone == ReadingDiary.HISTORY_SIZE
+    assert len(empty_diary.search_by_isbn("1234").notes) == 10
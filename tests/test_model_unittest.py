@@ -1,5 +1,5 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import inspect
 
 import readingdiary.model
@@ -55,6 +55,20 @@ class TestModel(unittest.TestCase):
     def test_note_class_str_method(self):
         self.assertEqual(str(self.note), "2021-01-01 00:00:00 - page 1: This is a note")
 
+    @unittest.skipUnless(note_defined, "Note class not defined")
+    def test_note_class_str_method_follows_field_changes(self):
+        str(self.note)
+        self.note.text = "Edited"
+        self.assertEqual(str(self.note), "2021-01-01 00:00:00 - page 1: Edited")
+        self.note.date = datetime(2021, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+        self.assertEqual(str(self.note), "2021-01-01 02:00:00+02:00 - page 1: Edited")
+        self.note.date = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(str(self.note), "2021-01-01 00:00:00+00:00 - page 1: Edited")
+
+    @unittest.skipUnless(note_defined, "Note class not defined")
+    def test_note_class_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.note, "__dict__"))
+
     @unittest.skipUnless(book_defined, "Book class not defined")
     def test_book_class_has_constants(self):
         for const_name, const_value in [("EXCELLENT", 3), ("GOOD", 2), ("BAD", 1), ("UNRATED", -1)]:
@@ -126,6 +140,54 @@ class TestModel(unittest.TestCase):
     def test_class_book_get_notes_of_page_method_returns_empty_list_when_no_notes(self):
         self.assertEqual(self.book_without_notes.get_notes_of_page(1), [])
 
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_get_notes_of_page_method_keeps_insertion_order(self):
+        self.assertEqual([note.text for note in self.book_with_notes.get_notes_of_page(1)], ["Note 1", "Note 3"])
+        self.assertEqual([note.text for note in self.book_with_notes.notes], ["Note 1", "Note 2", "Note 3"])
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_get_notes_of_page_method_returns_a_new_list(self):
+        self.book_with_notes.get_notes_of_page(1).clear()
+        self.assertEqual(len(self.book_with_notes.get_notes_of_page(1)), 2)
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_iter_notes_between_method_returns_notes_in_date_order(self):
+        self.book_without_notes.add_note("Note 1", 1, datetime(2021, 1, 3))
+        self.book_without_notes.add_note("Note 2", 1, datetime(2021, 1, 1))
+        self.book_without_notes.add_note("Note 3", 1, datetime(2021, 1, 2))
+        self.book_without_notes.add_note("Note 4", 1, datetime(2021, 1, 2))
+        notes = self.book_without_notes.iter_notes_between(datetime(2021, 1, 2), datetime(2021, 1, 3))
+        self.assertEqual([note.text for note in notes], ["Note 3", "Note 4"])
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_orders_naive_and_aware_dates_together(self):
+        book = self.book_without_notes
+        self.assertTrue(book.add_note("Naive noon", 1, datetime(2021, 1, 1, 12)))
+        self.assertTrue(book.add_note("Aware eleven", 2, datetime(2021, 1, 1, 13, tzinfo=timezone(timedelta(hours=2)))))
+        self.assertTrue(book.add_note("Naive half past", 1, datetime(2021, 1, 1, 11, 30)))
+        self.assertEqual([note.text for note in book.latest_notes(3)], ["Naive noon", "Naive half past", "Aware eleven"])
+        notes = book.iter_notes_between(datetime(2021, 1, 1, 11, 15, tzinfo=timezone.utc), datetime(2021, 1, 1, 12))
+        self.assertEqual([note.text for note in notes], ["Naive half past"])
+        self.assertTrue(book.remove_note(1))
+        self.assertEqual([note.text for note in book.latest_notes(3)], ["Naive noon", "Naive half past"])
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_add_note_method_leaves_book_untouched_when_date_is_invalid(self):
+        book = self.book_with_notes
+        with self.assertRaises(AttributeError):
+            book.add_note("Broken", 1, "2021-01-04")
+        self.assertEqual([note.id for note in book.notes], [0, 1, 2])
+        self.assertEqual(len(book.get_notes_of_page(1)), 2)
+        self.assertEqual(len(book.latest_notes(10)), 3)
+        self.assertTrue(book.add_note("Note 4", 1, datetime(2021, 1, 4)))
+        self.assertEqual(book.notes[-1].id, 3)
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_latest_notes_method_returns_newest_first(self):
+        self.assertEqual([note.text for note in self.book_with_notes.latest_notes(2)], ["Note 3", "Note 2"])
+        self.assertEqual(len(self.book_with_notes.latest_notes(10)), 3)
+        self.assertEqual(self.book_with_notes.latest_notes(0), [])
+
     @unittest.skipUnless(book_defined, "Book class not defined")
     def test_class_book_page_with_most_notes_method_returns_page_with_most_notes(self):
         self.assertEqual(self.book_with_notes.page_with_most_notes(), 1)
@@ -134,10 +196,58 @@ class TestModel(unittest.TestCase):
     def test_class_book_page_with_most_notes_method_returns_minus_one_when_no_notes(self):
         self.assertEqual(self.book_without_notes.page_with_most_notes(), -1)
 
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_add_note_method_assigns_increasing_ids(self):
+        self.assertEqual([note.id for note in self.book_with_notes.notes], [0, 1, 2])
+        self.assertEqual(self.book_with_notes.get_note(1).text, "Note 2")
+        self.assertIsNone(self.book_with_notes.get_note(3))
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_remove_note_method_removes_note_from_every_view(self):
+        book = self.book_with_notes
+        self.assertTrue(book.remove_note(0))
+        self.assertFalse(book.remove_note(0))
+        self.assertEqual([note.text for note in book.notes], ["Note 2", "Note 3"])
+        self.assertEqual([note.text for note in book.get_notes_of_page(1)], ["Note 3"])
+        self.assertEqual(book.page_with_most_notes(), 2)
+        self.assertEqual([note.text for note in book.latest_notes(5)], ["Note 3", "Note 2"])
+        book.add_note("Note 4", 1, datetime(2021, 1, 4))
+        self.assertEqual(book.notes[-1].id, 3)
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_update_note_method_keeps_note_id(self):
+        book = self.book_with_notes
+        self.assertTrue(book.update_note(2, page=2, date=datetime(2020, 12, 31)))
+        note = book.get_note(2)
+        self.assertEqual((note.text, note.page, note.date), ("Note 3", 2, datetime(2020, 12, 31)))
+        self.assertEqual([note.id for note in book.get_notes_of_page(2)], [1, 2])
+        self.assertEqual(book.page_with_most_notes(), 2)
+        self.assertEqual([note.text for note in book.latest_notes(5)], ["Note 2", "Note 1", "Note 3"])
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_update_note_method_returns_false_when_page_out_of_range(self):
+        self.assertFalse(self.book_with_notes.update_note(0, page=101))
+        self.assertFalse(self.book_with_notes.update_note(7, text="Missing"))
+        self.assertEqual(self.book_with_notes.get_note(0).page, 1)
+
     @unittest.skipUnless(book_defined, "Book class not defined")
     def test_class_book_str_method(self):
         self.assertEqual(str(self.book_without_notes), "ISBN: 1234\nTitle: Test Book\nAuthor: Author X\nPages: 100\nRating: unrated")
 
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_str_method_follows_rating_changes(self):
+        str(self.book_without_notes)
+        self.book_without_notes.set_rating(Book.GOOD)
+        self.assertTrue(str(self.book_without_notes).endswith("Rating: good"))
+        self.book_without_notes.set_rating(Book.EXCELLENT)
+        self.assertTrue(str(self.book_without_notes).endswith("Rating: excellent"))
+        self.book_without_notes.rating = 7
+        self.assertTrue(str(self.book_without_notes).endswith("Rating: unrated"))
+
+    @unittest.skipUnless(book_defined, "Book class not defined")
+    def test_class_book_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.book_without_notes, "__dict__"))
+
     @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
     def test_class_reading_diary_has_attributes(self):
         for attr_name, attr_type in [("books", dict)]:
@@ -182,6 +292,14 @@ class TestModel(unittest.TestCase):
     def test_class_reading_diary_search_by_isbn_method_returns_none_when_isbn_not_found(self):
         self.assertIsNone(self.diary_with_books.search_by_isbn("9999"))
 
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_search_by_isbn_method_accepts_any_isbn_form(self):
+        self.empty_diary.add_book("978-0132350884", "Clean Code", "Robert C. Martin", 464)
+        for isbn in ("978-0-13-235088-4", "9780132350884", "0-13-235088-2", "0132350882"):
+            self.assertEqual(self.empty_diary.search_by_isbn(isbn).isbn, "978-0132350884")
+            self.assertFalse(self.empty_diary.add_book(isbn, "Clean Code", "Robert C. Martin", 464))
+        self.assertIsNone(self.empty_diary.search_by_isbn("9780132350885"))
+
     @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
     def test_class_reading_diary_add_note_to_book_method_adds_note_to_book_and_returns_true(self):
         for isbn, text, page, date in [("1234", "This is a note", 1, datetime(2021, 1, 1)), ("5678", "Another note", 2, datetime(2021, 1, 2))]:
@@ -225,5 +343,213 @@ class TestModel(unittest.TestCase):
     def test_class_reading_diary_book_with_most_notes_method_returns_none_when_no_notes(self):
         self.assertIsNone(self.diary_with_books.book_with_most_notes())
 
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_book_with_most_notes_method_counts_notes_added_through_book(self):
+        self.diary_with_books.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+        self.diary_with_books.search_by_isbn("5678").add_note("Note 2", 1, datetime(2021, 1, 2))
+        self.diary_with_books.search_by_isbn("5678").add_note("Note 3", 2, datetime(2021, 1, 3))
+        self.assertEqual(self.diary_with_books.book_with_most_notes().isbn, "5678")
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_book_with_most_notes_method_prefers_first_added_book_on_tie(self):
+        self.diary_with_books.add_note_to_book("5678", "Note 1", 1, datetime(2021, 1, 1))
+        self.diary_with_books.add_note_to_book("1234", "Note 2", 1, datetime(2021, 1, 2))
+        self.assertEqual(self.diary_with_books.book_with_most_notes().isbn, "1234")
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_most_annotated_books_method_returns_books_by_note_count(self):
+        self.diary_with_books.add_book("9012", "Third Book", "Author Z", 300)
+        self.diary_with_books.add_note_to_book("5678", "Note 1", 1, datetime(2021, 1, 1))
+        self.diary_with_books.add_note_to_book("9012", "Note 2", 1, datetime(2021, 1, 2))
+        self.diary_with_books.add_note_to_book("9012", "Note 3", 1, datetime(2021, 1, 3))
+        self.assertEqual([book.isbn for book in self.diary_with_books.most_annotated_books(10)], ["9012", "5678"])
+        self.assertEqual([book.isbn for book in self.diary_with_books.most_annotated_books(1)], ["9012"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_latest_notes_method_returns_newest_notes_across_books(self):
+        self.diary_with_books.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+        self.diary_with_books.add_note_to_book("5678", "Note 2", 1, datetime(2021, 1, 3))
+        self.diary_with_books.add_note_to_book("1234", "Note 3", 1, datetime(2021, 1, 2))
+        self.assertEqual([(book.isbn, note.text) for book, note in self.diary_with_books.latest_notes(2)], [("5678", "Note 2"), ("1234", "Note 3")])
+        rows = self.diary_with_books.iter_notes_between(datetime(2021, 1, 1), datetime(2021, 1, 3))
+        self.assertEqual([note.text for _, note in rows], ["Note 1", "Note 3"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_orders_naive_and_aware_dates_across_books(self):
+        diary = self.diary_with_books
+        self.assertTrue(diary.add_note_to_book("1234", "Naive", 1, datetime(2021, 1, 1, 12)))
+        self.assertTrue(diary.add_note_to_book("5678", "Aware", 1, datetime(2021, 1, 1, 13, tzinfo=timezone(timedelta(hours=2)))))
+        self.assertEqual([note.text for _, note in diary.latest_notes(2)], ["Naive", "Aware"])
+        rows = diary.iter_notes_between(datetime(2021, 1, 1, 10, 30), datetime(2021, 1, 1, 11, 30))
+        self.assertEqual([note.text for _, note in rows], ["Aware"])
+        self.assertTrue(diary.remove_note("5678", 0))
+        self.assertEqual([note.text for _, note in diary.latest_notes(2)], ["Naive"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_batch_method_applies_changes_on_exit(self):
+        diary = self.diary_with_books
+        with diary.batch():
+            diary.add_book("9012", "Third Book", "Author Z", 300)
+            diary.add_note_to_book("9012", "Note 1", 1, datetime(2021, 1, 2))
+            diary.add_note_to_book("1234", "Note 2", 1, datetime(2021, 1, 1))
+            diary.add_note_to_book("9012", "Note 3", 2, datetime(2021, 1, 3))
+            diary.rate_book("1234", Book.GOOD)
+            self.assertIsNone(diary.book_with_most_notes())
+        self.assertEqual(diary.book_with_most_notes().isbn, "9012")
+        self.assertEqual([note.text for _, note in diary.latest_notes(3)], ["Note 3", "Note 1", "Note 2"])
+        self.assertEqual([book.isbn for book in diary.search_by_title("third")], ["9012"])
+        self.assertEqual(diary.search_by_isbn("1234").rating, Book.GOOD)
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_batch_method_rolls_back_on_error(self):
+        diary = self.diary_with_books
+        diary.add_note_to_book("1234", "Kept", 1, datetime(2021, 1, 1))
+        with self.assertRaises(KeyError):
+            with diary.batch():
+                diary.add_book("9012", "Third Book", "Author Z", 300)
+                diary.add_note_to_book("1234", "Dropped", 2, datetime(2021, 1, 2))
+                diary.rate_book("1234", Book.BAD)
+                raise KeyError("9012")
+        self.assertNotIn("9012", diary.books)
+        book = diary.search_by_isbn("1234")
+        self.assertEqual([note.text for note in book.notes], ["Kept"])
+        self.assertEqual(book.get_notes_of_page(2), [])
+        self.assertEqual(book.rating, Book.UNRATED)
+        self.assertEqual([note.text for _, note in diary.latest_notes(5)], ["Kept"])
+        self.assertEqual(diary.search_by_title("third"), [])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_note_edits_update_diary_indexes(self):
+        diary = self.diary_with_books
+        diary.add_note_to_book("1234", "Alpha note", 1, datetime(2021, 1, 1))
+        diary.add_note_to_book("1234", "Beta note", 1, datetime(2021, 1, 2))
+        diary.add_note_to_book("5678", "Gamma note", 1, datetime(2021, 1, 3))
+        self.assertTrue(diary.remove_note("1234", 0))
+        self.assertTrue(diary.update_note("5678", 0, text="Delta note", date=datetime(2020, 1, 1)))
+        self.assertFalse(diary.remove_note("0000", 0))
+        self.assertEqual([book.isbn for book in diary.most_annotated_books(2)], ["1234", "5678"])
+        self.assertEqual([note.text for _, note in diary.latest_notes(5)], ["Beta note", "Delta note"])
+        self.assertEqual(diary.search_notes("alpha"), [])
+        self.assertEqual(diary.search_notes("gamma"), [])
+        self.assertEqual([note.text for _, note in diary.search_notes("delta")], ["Delta note"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_batch_method_rolls_back_note_edits(self):
+        diary = self.diary_with_books
+        diary.add_note_to_book("1234", "Kept", 1, datetime(2021, 1, 1))
+        with self.assertRaises(KeyError):
+            with diary.batch():
+                diary.add_note_to_book("1234", "Dropped", 2, datetime(2021, 1, 2))
+                diary.update_note("1234", 0, text="Changed")
+                diary.remove_note("1234", 1)
+                diary.add_note_to_book("5678", "Dropped", 1, datetime(2021, 1, 3))
+                raise KeyError("1234")
+        book = diary.search_by_isbn("1234")
+        self.assertEqual([(note.id, note.text) for note in book.notes], [(0, "Kept")])
+        self.assertEqual([note.text for _, note in diary.latest_notes(5)], ["Kept"])
+        self.assertEqual([note.text for _, note in diary.search_notes("kept changed dropped")], ["Kept"])
+        self.assertEqual(diary.most_annotated_books(5), [book])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_undo_method_reverts_note_edits(self):
+        diary = self.diary_with_books
+        diary.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+        diary.add_note_to_book("1234", "Note 2", 2, datetime(2021, 1, 2))
+        diary.update_note("1234", 1, text="Edited", page=1)
+        diary.remove_note("1234", 0)
+        self.assertTrue(diary.undo())
+        self.assertTrue(diary.undo())
+        book = diary.search_by_isbn("1234")
+        self.assertEqual([(note.id, note.text, note.page) for note in book.notes], [(0, "Note 1", 1), (1, "Note 2", 2)])
+        self.assertEqual([note.text for _, note in diary.search_notes("note")], ["Note 1", "Note 2"])
+        self.assertTrue(diary.redo())
+        self.assertEqual([note.text for note in book.get_notes_of_page(1)], ["Note 1", "Edited"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_undo_method_reverts_last_change(self):
+        diary = self.diary_with_books
+        diary.add_note_to_book("1234", "Note 1", 3, datetime(2021, 1, 1))
+        diary.add_note_to_book("1234", "Note 2", 3, datetime(2021, 1, 2))
+        diary.add_note_to_book("5678", "Note 3", 1, datetime(2021, 1, 3))
+        diary.rate_book("5678", Book.EXCELLENT)
+
+        self.assertTrue(diary.undo())
+        self.assertEqual(diary.search_by_isbn("5678").rating, Book.UNRATED)
+        self.assertTrue(diary.undo())
+        self.assertEqual(diary.search_by_isbn("5678").notes, [])
+        self.assertEqual([book.isbn for book, _ in diary.search_notes("note")], ["1234", "1234"])
+        self.assertTrue(diary.undo())
+        book = diary.search_by_isbn("1234")
+        self.assertEqual([note.text for note in book.notes], ["Note 1"])
+        self.assertEqual(book.page_with_most_notes(), 3)
+        self.assertEqual([note.text for _, note in diary.latest_notes(5)], ["Note 1"])
+        self.assertEqual(diary.most_annotated_books(5), [book])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_undo_method_reverts_whole_batch(self):
+        diary = self.diary_with_books
+        with diary.batch():
+            diary.add_book("9012", "Third Book", "Author Z", 300)
+            diary.add_note_to_book("9012", "Note 1", 1, datetime(2021, 1, 1))
+        self.assertTrue(diary.undo())
+        self.assertNotIn("9012", diary.books)
+        self.assertIsNone(diary.book_with_most_notes())
+        self.assertEqual(diary.search_by_title("third"), [])
+        self.assertEqual(diary.search_by_title("third", fuzzy=True), [])
+        self.assertTrue(diary.undo())
+        self.assertTrue(diary.undo())
+        self.assertEqual(diary.books, {})
+        self.assertFalse(diary.undo())
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_undo_method_hides_notes_of_removed_book(self):
+        diary = self.diary_with_books
+        for day in (1, 3, 5):
+            diary.add_note_to_book("1234", f"Note {day}", 1, datetime(2021, 1, day))
+        with diary.batch():
+            diary.add_book("9012", "Third Book", "Author Z", 300)
+            diary.add_note_to_book("9012", "Note 4", 1, datetime(2021, 1, 4))
+        self.assertTrue(diary.undo())
+        self.assertEqual([note.text for _, note in diary.latest_notes(3)], ["Note 5", "Note 3", "Note 1"])
+        rows = diary.iter_notes_between(datetime(2021, 1, 2), datetime(2021, 1, 6))
+        self.assertEqual([note.text for _, note in rows], ["Note 3", "Note 5"])
+        self.assertEqual([book.isbn for book, _ in diary.search_notes("note")], ["1234"] * 3)
+        self.assertTrue(diary.redo())
+        self.assertEqual([note.text for _, note in diary.latest_notes(2)], ["Note 5", "Note 4"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_redo_method_reapplies_undone_change(self):
+        diary = self.diary_with_books
+        with diary.batch():
+            diary.add_book("9012", "Third Book", "Author Z", 300)
+            diary.add_note_to_book("9012", "Note 1", 1, datetime(2021, 1, 1))
+        diary.undo()
+        self.assertTrue(diary.redo())
+        self.assertFalse(diary.redo())
+        self.assertEqual([note.text for note in diary.search_by_isbn("9012").notes], ["Note 1"])
+        self.assertEqual(diary.book_with_most_notes().isbn, "9012")
+        self.assertEqual([book.isbn for book, _ in diary.search_notes("note")], ["9012"])
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_new_change_clears_redo(self):
+        diary = self.diary_with_books
+        diary.rate_book("1234", Book.GOOD)
+        diary.undo()
+        diary.rate_book("1234", Book.BAD)
+        self.assertFalse(diary.redo())
+        self.assertEqual(diary.search_by_isbn("1234").rating, Book.BAD)
+
+    @unittest.skipUnless(reading_diary_defined, "ReadingDiary class not defined")
+    def test_class_reading_diary_history_is_bounded(self):
+        diary = self.empty_diary
+        diary.add_book("1234", "Test Book", "Author X", 100)
+        for i in range(ReadingDiary.HISTORY_SIZE + 10):
+            diary.add_note_to_book("1234", f"Note {i}", 1, datetime(2021, 1, 1))
+        undone = 0
+        while diary.undo():
+            undone += 1
+        self.assertEqual(undone, ReadingDiary.HISTORY_SIZE)
+        self.assertEqual(len(diary.search_by_isbn("1234").notes), 10)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+from datetime import datetime
+
+import pytest
+
+from readingdiary.model import ReadingDiary
+from readingdiary.search import NoteIndex, tokenize
+from readingdiary.sqlstore import SQLiteReadingDiary
+from readingdiary.storage import load_diary, save_diary
+
+
+def test_tokenize_splits_and_casefolds():
+    assert tokenize("The Whale, the WHALE! Straße 42") == ["the", "whale", "the", "whale", "strasse", "42"]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def diary(request, tmp_path):
+    diary = ReadingDiary() if request.param == "memory" else SQLiteReadingDiary(str(tmp_path / "diary.sqlite"))
+    diary.add_book("1234", "Moby Dick", "Herman Melville", 600)
+    diary.add_book("5678", "Walden", "Henry David Thoreau", 300)
+    diary.add_note_to_book("1234", "Call me Ishmael", 1, datetime(2021, 1, 1))
+    diary.add_note_to_book("1234", "The white whale appears, the whale is huge", 120, datetime(2021, 1, 2))
+    diary.add_note_to_book("1234", "A long note about the sea and a whale and ships and sailors", 130, datetime(2021, 1, 3))
+    diary.search_by_isbn("5678").add_note("I went to the woods", 10, datetime(2021, 1, 4))
+    diary.add_note_to_book("5678", "Simplify, simplify", 120, datetime(2021, 1, 5))
+    return diary
+
+
+def texts(results):
+    return [note.text for _, note in results]
+
+
+def test_search_notes_ranks_by_relevance(diary):
+    assert texts(diary.search_notes("whale")) == [
+        "The white whale appears, the whale is huge",
+        "A long note about the sea and a whale and ships and sailors",
+    ]
+
+
+def test_search_notes_matches_any_term(diary):
+    assert sorted(texts(diary.search_notes("ishmael WOODS"))) == ["Call me Ishmael", "I went to the woods"]
+
+
+def test_search_notes_filters_by_isbn_and_page(diary):
+    assert texts(diary.search_notes("the", isbn="5678")) == ["I went to the woods"]
+    assert sorted(texts(diary.search_notes("whale simplify", page=120))) == [
+        "Simplify, simplify", "The white whale appears, the whale is huge"
+    ]
+
+
+def test_search_notes_respects_limit(diary):
+    assert len(diary.search_notes("the", limit=2)) == 2
+
+
+def test_search_notes_returns_empty_list_without_matches(diary):
+    assert diary.search_notes("kraken") == []
+    assert diary.search_notes("  ,, ") == []
+
+
+def test_search_notes_returns_the_book_of_each_note(diary):
+    [(book, note)] = diary.search_notes("ishmael")
+    assert book.isbn == "1234"
+    assert note.page == 1
+
+
+def test_search_notes_covers_lazily_loaded_notes(tmp_path):
+    diary = ReadingDiary()
+    diary.add_book("1234", "Moby Dick", "Herman Melville", 600)
+    diary.add_note_to_book("1234", "Call me Ishmael", 1, datetime(2021, 1, 1))
+    path = str(tmp_path / "diary.rdry")
+    save_diary(diary, path)
+    assert texts(load_diary(path).search_notes("ishmael")) == ["Call me Ishmael"]
+
+
+def test_note_index_on_empty_index():
+    assert NoteIndex().search("anything") == []
+
+
+@pytest.mark.parametrize("diary", ["memory"], indirect=True)
+def test_text_index_is_built_on_first_search(diary):
+    assert diary._text_index is None
+    assert texts(diary.search_notes("ishmael")) == ["Call me Ishmael"]
+    assert len(diary._text_index) == 5
+    diary.add_note_to_book("5678", "Ishmael again", 1, datetime(2021, 1, 6))
+    diary.remove_note("1234", 0)
+    assert texts(diary.search_notes("ishmael")) == ["Ishmael again"]
+    assert len(diary._text_index) == 5
+
+
+@pytest.mark.parametrize("diary", ["memory"], indirect=True)
+def test_text_index_built_inside_a_batch_forgets_rolled_back_notes(diary):
+    with pytest.raises(RuntimeError):
+        with diary.batch():
+            diary.add_note_to_book("1234", "Kraken sighted", 1, datetime(2021, 1, 6))
+            assert texts(diary.search_notes("kraken")) == ["Kraken sighted"]
+            raise RuntimeError("Rolled back")
+    assert diary.search_notes("kraken") == []
+    assert len(diary._text_index) == 5
+
+
+def test_note_index_scores_match_a_rebuilt_index_after_removals():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Moby Dick", "Herman Melville", 600)
+    book = diary.search_by_isbn("1234")
+    for i in range(40):
+        book.add_note(f"whale {'sea ' * (i % 3)}note {i % 7}", 1 + i % 5, datetime(2021, 1, 1))
+    assert diary.search_notes("whale")
+    for note_id in range(0, 40, 4):
+        book.remove_note(note_id)
+    for note_id in range(1, 30, 2):
+        book.remove_note(note_id)
+
+    rebuilt = NoteIndex()
+    for note in book.iter_notes():
+        rebuilt.add(book, note)
+    for query in ("whale", "sea note", "3", "whale 6"):
+        expected = [(score, note.id) for score, (_, note) in rebuilt.scored(query, limit=50)]
+        actual = [(score, note.id) for score, (_, note) in diary._text_index.scored(query, limit=50)]
+        assert actual == expected
+        assert [note.id for _, note in diary._text_index.search(query, page=2, limit=50)] == \
+            [note.id for _, note in rebuilt.search(query, page=2, limit=50)]
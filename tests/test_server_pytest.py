@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import pytest
+
+from readingdiary.loadgen import run_in_process
+from readingdiary.model import ReadingDiary
+from readingdiary.server import DiaryService, start_server
+
+
+@pytest.fixture
+def service():
+    return DiaryService(ReadingDiary())
+
+
+def call(service, request):
+    return json.loads(service.handle_line(json.dumps(request).encode()))
+
+
+def add_book(isbn="1234", title="Test Book"):
+    return {"op": "add_book", "args": {"isbn": isbn, "title": title, "author": "Author X", "pages": 100}}
+
+
+def add_note(page, date="2021-01-01T00:00:00", isbn="1234"):
+    return {"op": "add_note", "args": {"isbn": isbn, "text": f"Note {page}", "page": page, "date": date}}
+
+
+def test_service_runs_operations(service):
+    assert call(service, {**add_book(), "id": 1}) == {"id": 1, "result": True}
+    assert call(service, add_book())["result"] is False
+    assert call(service, add_note(5))["result"] is True
+    assert call(service, add_note(5))["result"] is True
+    assert call(service, add_note(101))["result"] is False
+    assert call(service, {"op": "rate_book", "args": {"isbn": "1234", "rating": 3}})["result"] is True
+
+    assert call(service, {"op": "notes_of_page", "args": {"isbn": "1234", "page": 5}})["result"] == [
+        {"id": 0, "text": "Note 5", "page": 5, "date": "2021-01-01T00:00:00"},
+        {"id": 1, "text": "Note 5", "page": 5, "date": "2021-01-01T00:00:00"}]
+    assert call(service, {"op": "page_with_most_notes", "args": {"isbn": "1234"}})["result"] == 5
+    assert call(service, {"op": "book_with_most_notes"})["result"] == {
+        "isbn": "1234", "title": "Test Book", "author": "Author X", "pages": 100, "rating": 3}
+    assert [book["isbn"] for book in call(service, {"op": "search_by_title", "args": {"query": "tes"}})["result"]] == [
+        "1234"]
+    assert call(service, {"op": "search_notes", "args": {"query": "note"}})["result"][0]["isbn"] == "1234"
+    assert call(service, {"op": "search_by_isbn", "args": {"isbn": "0000"}})["result"] is None
+
+
+def test_service_edits_and_removes_notes(service):
+    call(service, [add_book(), add_note(5), add_note(5), add_note(7)])
+    assert call(service, {"op": "update_note", "args": {"isbn": "1234", "note_id": 0, "page": 7}})["result"] is True
+    assert call(service, {"op": "remove_note", "args": {"isbn": "1234", "note_id": 1}})["result"] is True
+    assert call(service, {"op": "remove_note", "args": {"isbn": "1234", "note_id": 1}})["result"] is False
+    assert call(service, {"op": "update_note", "args": {"isbn": "1234", "note_id": 2, "date": "soon"}}) == {
+        "error": "Invalid date"}
+    assert [note["id"] for note in call(service, {"op": "notes_of_page", "args": {"isbn": "1234", "page": 7}})[
+        "result"]] == [0, 2]
+    assert call(service, {"op": "page_with_most_notes", "args": {"isbn": "1234"}})["result"] == 7
+
+
+def test_service_handles_batches_in_order(service):
+    response = call(service, [add_book(), add_note(1), add_note(1), {"op": "page_with_most_notes",
+                                                                     "args": {"isbn": "1234"}}])
+    assert [item["result"] for item in response] == [True, True, True, 1]
+
+
+def test_service_reports_errors(service):
+    assert call(service, {"op": "drop_tables"}) == {"error": "Unknown operation: drop_tables"}
+    assert call(service, {"op": "add_book", "args": {"isbn": "1234"}}) == {"error": "Invalid arguments"}
+    assert call(service, add_note(1, date="yesterday")) == {"error": "Invalid date"}
+    assert json.loads(service.handle_line(b"{not json")) == {"error": "Invalid JSON"}
+    assert call(service, [1]) == [{"error": "Invalid request"}]
+
+
+def test_service_answers_requests_with_unusable_operations(service):
+    assert call(service, {"op": [1], "id": 1}) == {"id": 1, "error": "Unknown operation: [1]"}
+    assert call(service, {"op": {"name": "add_book"}}) == {"error": "Unknown operation: {'name': 'add_book'}"}
+    assert call(service, [{"op": [1]}, add_book()]) == [{"error": "Unknown operation: [1]"}, {"result": True}]
+    assert json.loads(service.handle_line(b"[" * 100_000)) == {"error": "Invalid JSON"}
+
+
+def test_service_turns_unexpected_errors_into_responses(service, monkeypatch):
+    def broken(request):
+        raise KeyError("id")
+
+    monkeypatch.setattr(service, "handle", broken)
+    assert call(service, [add_book(), add_book()]) == [{"error": "Internal error: KeyError"}] * 2
+
+
+@pytest.mark.parametrize("args", [
+    {"isbn": 5},
+    {"isbn": "1234", "text": "Note", "page": "1", "date": "2021-01-01"},
+    {"isbn": "1234", "text": "Note", "page": True, "date": "2021-01-01"},
+    {"isbn": "1234", "text": None, "page": 1, "date": "2021-01-01"},
+    {"isbn": "1234", "text": "Note", "page": 1, "date": 20210101},
+])
+def test_service_rejects_mistyped_arguments_without_writing(service, args):
+    call(service, add_book())
+    operation = "search_by_isbn" if list(args) == ["isbn"] else "add_note"
+    assert call(service, {"op": operation, "args": args}) == {"error": "Invalid arguments"}
+    assert call(service, {"op": "notes_of_page", "args": {"isbn": "1234", "page": 1}})["result"] == []
+
+
+def test_service_stores_aware_dates(service):
+    call(service, add_book())
+    assert call(service, add_note(1, date="2021-01-01T12:00:00+02:00"))["result"] is True
+    assert call(service, add_note(1))["result"] is True
+    assert [note["date"] for note in call(service, {"op": "notes_of_page", "args": {"isbn": "1234", "page": 1}})[
+        "result"]] == ["2021-01-01T12:00:00+02:00", "2021-01-01T00:00:00"]
+
+
+def test_server_keeps_answering_after_a_request_with_an_unusable_operation():
+    async def scenario():
+        server = await start_server(ReadingDiary(), port=0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            requests = [add_book(), {"op": [1], "id": 1}, {**add_note(1), "id": 2}]
+            writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+
+    assert asyncio.run(scenario()) == [{"result": True}, {"id": 1, "error": "Unknown operation: [1]"},
+                                       {"id": 2, "result": True}]
+
+
+def test_server_answers_pipelined_requests():
+    async def scenario():
+        server = await start_server(ReadingDiary(), port=0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            requests = [add_book()] + [{**add_note(page % 7), "id": page} for page in range(50)]
+            writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+
+    responses = asyncio.run(scenario())
+    assert responses[0] == {"result": True}
+    assert [response["id"] for response in responses[1:]] == list(range(50))
+
+
+def test_load_generator_reports_throughput_and_latency():
+    stats = asyncio.run(run_in_process(connections=2, requests=200, depth=4, batch=3))
+    assert stats["requests"] == 200
+    assert stats["errors"] == 0
+    assert stats["requests_per_second"] > 0
+    assert 0 <= stats["p50_ms"] <= stats["p99_ms"]
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from readingdiary.journal import JournaledDiary
+from readingdiary.model import Book, ReadingDiary
+from readingdiary.sharding import ShardedDiary
+from readingdiary.sqlstore import SQLiteReadingDiary
+from readingdiary.vectorized import DiaryStats
+
+
+def fill(diary):
+    for i in range(40):
+        isbn = f"{i:013d}"
+        diary.add_book(isbn, f"Dune part {i}", f"Author {i % 7}", 100)
+        for j in range(i % 5):
+            diary.add_note_to_book(isbn, f"Note {j} about sand", j + 1, datetime(2021, 1, 1) + timedelta(hours=7 * i + j))
+    diary.rate_book(f"{3:013d}", Book.GOOD)
+
+
+def as_tuples(diary):
+    return [
+        (book.isbn, book.title, book.rating, [(note.id, note.text, note.page, note.date) for note in book.notes])
+        for book in (diary.search_by_isbn(isbn) for isbn in diary.books)
+    ]
+
+
+def isbns(entries):
+    return [entry.isbn if isinstance(entry, Book) else (entry[0].isbn, entry[1].id) for entry in entries]
+
+
+@pytest.fixture
+def diaries():
+    sharded, single = ShardedDiary(3), ReadingDiary()
+    fill(sharded)
+    fill(single)
+    return sharded, single
+
+
+def test_sharded_diary_matches_single_diary(diaries):
+    sharded, single = diaries
+    assert all(shard.books for shard in sharded.shards)
+    assert as_tuples(sharded) == as_tuples(single)
+    assert sharded.add_book(f"{0:013d}", "Duplicate", "Author", 10) is False
+    assert sharded.book_with_most_notes() is sharded.search_by_isbn(f"{4:013d}")
+    assert isbns(sharded.most_annotated_books(6)) == isbns(single.most_annotated_books(6))
+    assert isbns(sharded.search_by_title("dune", limit=5)) == isbns(single.search_by_title("dune", limit=5))
+    assert isbns(sharded.search_by_author("autor 3", fuzzy=True)) == isbns(single.search_by_author("autor 3", fuzzy=True))
+    assert isbns(sharded.latest_notes(5)) == isbns(single.latest_notes(5))
+    between = (datetime(2021, 1, 3), datetime(2021, 1, 6))
+    assert sorted(isbns(sharded.iter_notes_between(*between))) == sorted(isbns(single.iter_notes_between(*between)))
+    assert len(sharded.search_notes("sand", limit=100)) == 80
+
+
+def test_sharded_undo_spans_batches_across_shards(diaries):
+    sharded, _ = diaries
+    expected = as_tuples(sharded)
+    with sharded.batch():
+        for i in range(40, 50):
+            sharded.add_book(f"{i:013d}", f"Book {i}", "Author", 10)
+    assert len(sharded.books) == 50
+    assert sharded.undo()
+    assert as_tuples(sharded) == expected
+    assert sharded.redo()
+    assert len(sharded.books) == 50
+
+
+@pytest.mark.parametrize("count", [1, 2, 7])
+def test_reshard_moves_books_and_keeps_queries(diaries, count):
+    sharded, single = diaries
+    sharded.reshard(count)
+    assert len(sharded.shards) == count
+    assert as_tuples(sharded) == as_tuples(single)
+    assert isbns(sharded.most_annotated_books(6)) == isbns(single.most_annotated_books(6))
+    assert not sharded.undo()
+
+
+def test_rebalance_serves_lookups_between_steps(diaries):
+    sharded, single = diaries
+    steps = sharded.rebalance(5, step=1)
+    assert len(next(steps)) == 1
+    sharded.add_book("new", "New Book", "Author", 10)
+    assert as_tuples(sharded)[:40] == as_tuples(single)
+    with pytest.raises(RuntimeError):
+        list(sharded.rebalance(6))
+    assert len(list(steps)) > 0
+    assert sharded.search_by_isbn("new").title == "New Book"
+
+
+def test_reshard_persists_journaled_shards(tmp_path):
+    def factory(index):
+        return JournaledDiary(str(tmp_path / f"shard-{index}.rdry"))
+
+    sharded = ShardedDiary(2, shard_factory=factory)
+    fill(sharded)
+    sharded.reshard(3)
+    expected = sorted(as_tuples(sharded))
+    for shard in sharded.shards:
+        shard.close()
+    assert sorted(as_tuples(ShardedDiary(3, shard_factory=factory))) == expected
+
+
+def test_sharded_diary_routes_isbn_forms_to_one_shard():
+    sharded = ShardedDiary(4)
+    assert sharded.add_book("978-0-13-235088-4", "Clean Code", "Robert C. Martin", 464)
+    assert not sharded.add_book("0132350882", "Clean Code", "Robert C. Martin", 464)
+    assert sharded.add_note_to_book("9780132350884", "Note", 1, datetime(2021, 1, 1))
+    assert sharded.search_by_isbn("0-13-235088-2").notes[0].text == "Note"
+
+
+def test_reshard_rejects_sqlite_shards_before_moving_anything(tmp_path):
+    sharded = ShardedDiary(2, shard_factory=lambda index: SQLiteReadingDiary(str(tmp_path / f"shard-{index}.sqlite")))
+    fill(sharded)
+    expected = as_tuples(sharded)
+    with pytest.raises(TypeError):
+        sharded.reshard(3)
+    assert sharded.shard_count == 2
+    assert len(sharded.shards) == 2
+    assert as_tuples(sharded) == expected
+    assert sharded.add_book("new", "New Book", "Author", 10)
+    for shard in sharded.shards:
+        shard.close()
+
+
+def test_diary_stats_work_on_a_sharded_diary(diaries):
+    pytest.importorskip("numpy")
+    sharded, single = diaries
+    stats = DiaryStats(sharded, use_numpy=True)
+    assert stats.pages_with_most_notes() == DiaryStats(single, use_numpy=True).pages_with_most_notes()
+    version = sharded._version
+    sharded.add_note_to_book(f"{1:013d}", "Another note", 9, datetime(2021, 2, 1))
+    assert sharded._version > version
+    assert stats.page_with_most_notes(f"{1:013d}") == 1
+    sharded.add_note_to_book(f"{1:013d}", "Another note", 9, datetime(2021, 2, 2))
+    assert stats.page_with_most_notes(f"{1:013d}") == 9
+    version = sharded._version
+    sharded.reshard(2)
+    assert sharded._version > version
+    assert stats.pages_with_most_notes() == DiaryStats(sharded, use_numpy=False).pages_with_most_notes()
@@ -0,0 +1,206 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from readingdiary.model import Book, ReadingDiary
+from readingdiary.sqlstore import SQLiteReadingDiary
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "diary.sqlite")
+
+
+@pytest.fixture
+def diaries(path):
+    diaries = (ReadingDiary(), SQLiteReadingDiary(path, batch_size=3))
+    for diary in diaries:
+        diary.add_book("1234", "Test Book", "Author X", 100)
+        diary.add_book("5678", "Another Book", "Author Y", 200)
+        diary.add_book("9012", "Third Book", "Author Z", 300)
+        diary.add_note_to_book("5678", "Note 1", 2, datetime(2021, 1, 1))
+        diary.add_note_to_book("1234", "Note 2", 2, datetime(2021, 1, 2))
+        diary.search_by_isbn("1234").add_note("Note 3", 1, datetime(2021, 1, 3, 8, 30))
+        diary.add_note_to_book("5678", "Note 4", 1, datetime(2021, 1, 4))
+        diary.add_note_to_book("1234", "Note 5", 1, datetime(2021, 1, 5))
+        diary.rate_book("1234", Book.GOOD)
+    yield diaries
+    diaries[1].close()
+
+
+def as_tuples(book):
+    return (book.isbn, book.title, book.author, book.pages, book.rating,
+            [(note.text, note.page, note.date) for note in book.notes])
+
+
+def test_sqlite_diary_books_match_memory_diary(diaries):
+    memory, sqlite = diaries
+    assert list(sqlite.books) == list(memory.books)
+    assert [as_tuples(sqlite.books[isbn]) for isbn in sqlite.books] == [as_tuples(book) for book in memory.books.values()]
+
+
+@pytest.mark.parametrize("isbn, page", [("1234", 1), ("1234", 2), ("5678", 1), ("9012", 1)])
+def test_sqlite_book_get_notes_of_page_matches_memory_book(diaries, isbn, page):
+    memory, sqlite = diaries
+    expected = [(note.text, note.page, note.date) for note in memory.search_by_isbn(isbn).get_notes_of_page(page)]
+    assert [(note.text, note.page, note.date) for note in sqlite.search_by_isbn(isbn).get_notes_of_page(page)] == expected
+
+
+@pytest.mark.parametrize("isbn", ["1234", "5678", "9012"])
+def test_sqlite_book_page_with_most_notes_matches_memory_book(diaries, isbn):
+    memory, sqlite = diaries
+    assert sqlite.search_by_isbn(isbn).page_with_most_notes() == memory.search_by_isbn(isbn).page_with_most_notes()
+
+
+def test_sqlite_diary_book_with_most_notes_matches_memory_diary(diaries):
+    memory, sqlite = diaries
+    assert sqlite.book_with_most_notes().isbn == memory.book_with_most_notes().isbn == "1234"
+    assert [book.isbn for book in sqlite.most_annotated_books(5)] == ["1234", "5678"]
+
+
+def test_sqlite_diary_rejects_what_memory_diary_rejects(diaries):
+    for diary in diaries:
+        assert not diary.add_book("1234", "Test Book", "Author X", 100)
+        assert not diary.add_note_to_book("1234", "Note", 101, datetime(2021, 1, 1))
+        assert not diary.add_note_to_book("0000", "Note", 1, datetime(2021, 1, 1))
+        assert not diary.rate_book("1234", 0)
+        assert diary.search_by_isbn("0000") is None
+
+
+def test_sqlite_diary_book_with_most_notes_returns_none_without_notes(path):
+    diary = SQLiteReadingDiary(path)
+    assert diary.book_with_most_notes() is None
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    assert diary.book_with_most_notes() is None
+    diary.close()
+
+
+def test_sqlite_diary_persists_after_close(diaries, path):
+    memory, sqlite = diaries
+    sqlite.commit()
+    reopened = SQLiteReadingDiary(path)
+    assert as_tuples(reopened.search_by_isbn("1234")) == as_tuples(memory.search_by_isbn("1234"))
+    reopened.close()
+
+
+def test_sqlite_book_iterators_match_memory_book(diaries):
+    memory, sqlite = diaries
+    memory_book, sqlite_book = memory.search_by_isbn("1234"), sqlite.search_by_isbn("1234")
+    start, end = datetime(2021, 1, 2), datetime(2021, 1, 5)
+    assert [note.text for note in sqlite_book.iter_notes_in_pages(1, 2)] == \
+        [note.text for note in memory_book.iter_notes_in_pages(1, 2)]
+    assert [note.text for note in sqlite_book.iter_notes_between(start, end)] == \
+        [note.text for note in memory_book.iter_notes_between(start, end)]
+    assert [(book.isbn, note.text) for book, note in sqlite.iter_notes()] == \
+        [(book.isbn, note.text) for book, note in memory.iter_notes()]
+
+
+def test_sqlite_diary_date_queries_match_memory_diary(diaries):
+    memory, sqlite = diaries
+    start, end = datetime(2021, 1, 2), datetime(2021, 1, 5)
+    assert [(book.isbn, note.text) for book, note in sqlite.latest_notes(3)] == \
+        [(book.isbn, note.text) for book, note in memory.latest_notes(3)]
+    assert [(book.isbn, note.text) for book, note in sqlite.iter_notes_between(start, end)] == \
+        [(book.isbn, note.text) for book, note in memory.iter_notes_between(start, end)]
+    assert [note.text for note in sqlite.search_by_isbn("1234").latest_notes(2)] == \
+        [note.text for note in memory.search_by_isbn("1234").latest_notes(2)]
+
+
+def test_sqlite_diary_batch_commits_or_rolls_back(diaries, path):
+    sqlite = diaries[1]
+    with sqlite.batch():
+        for i in range(10):
+            sqlite.add_note_to_book("9012", f"Batch {i}", 3, datetime(2021, 2, 1))
+    with pytest.raises(RuntimeError):
+        with sqlite.batch():
+            sqlite.add_book("3456", "Dropped Book", "Author W", 10)
+            sqlite.add_note_to_book("1234", "Dropped", 1, datetime(2021, 2, 2))
+            raise RuntimeError
+    sqlite.commit()
+
+    reopened = SQLiteReadingDiary(path)
+    assert len(reopened.search_by_isbn("9012").notes) == 10
+    assert reopened.search_by_isbn("3456") is None
+    assert len(reopened.search_by_isbn("1234").notes) == 3
+    reopened.close()
+
+
+def test_sqlite_diary_note_edits_match_memory_diary(diaries):
+    memory, sqlite = diaries
+    for diary in diaries:
+        book = diary.search_by_isbn("1234")
+        first, second = [note.id for note in book.notes][:2]
+        assert diary.update_note("1234", first, text="Edited", page=1)
+        assert diary.remove_note("1234", second)
+        assert not diary.remove_note("1234", second)
+    assert as_tuples(sqlite.books["1234"]) == as_tuples(memory.books["1234"])
+    assert sqlite.search_by_isbn("1234").page_with_most_notes() == memory.search_by_isbn("1234").page_with_most_notes()
+    assert [book.isbn for book in sqlite.most_annotated_books(3)] == [book.isbn for book in memory.most_annotated_books(3)]
+    assert [note.text for _, note in sqlite.search_notes("edited")] == ["Edited"]
+    assert [note.text for _, note in sqlite.search_notes("3")] == []
+
+
+def test_sqlite_diary_matches_memory_diary_on_isbn_forms(path):
+    memory, sqlite = ReadingDiary(), SQLiteReadingDiary(path)
+    for diary in (memory, sqlite):
+        assert diary.add_book("0-306-40615-2", "Test Book", "Author X", 100)
+        assert not diary.add_book("9780306406157", "Test Book", "Author X", 100)
+        assert diary.add_note_to_book("978-0-306-40615-7", "Alias note", 1, datetime(2021, 1, 1))
+        assert diary.search_by_isbn("0306406152").isbn == "0-306-40615-2"
+        assert [note.text for _, note in diary.search_notes("alias", isbn="9780306406157")] == ["Alias note"]
+    sqlite.close()
+
+
+def test_sqlite_diary_keys_books_created_before_isbn_normalization(path):
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, isbn TEXT NOT NULL UNIQUE, title TEXT NOT NULL, "
+               "author TEXT NOT NULL, pages INTEGER NOT NULL, rating INTEGER NOT NULL, "
+               "note_count INTEGER NOT NULL DEFAULT 0)")
+    db.executemany("INSERT INTO books (isbn, title, author, pages, rating) VALUES (?, ?, ?, 100, -1)",
+                   [("0306406152", "Short Form", "Author X"), ("9780306406157", "Long Form", "Author X"),
+                    ("1234", "Invalid", "Author Y")])
+    db.commit()
+    db.close()
+
+    diary = SQLiteReadingDiary(path)
+    assert list(diary.books) == ["0306406152", "9780306406157", "1234"]
+    assert diary.search_by_isbn("978-0-306-40615-7").title == "Short Form"
+    assert diary.search_by_isbn("9780306406157").title == "Long Form"
+    assert not diary.add_book("0-306-40615-2", "Third Form", "Author X", 100)
+    assert diary.add_book("5678", "Another", "Author Y", 100)
+    diary.close()
+
+
+def test_sqlite_diary_keeps_utc_offsets(path):
+    zone = timezone(timedelta(hours=5, minutes=30))
+    diary = SQLiteReadingDiary(path)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_note_to_book("1234", "Aware", 1, datetime(2021, 1, 1, 8, tzinfo=zone))
+    diary.add_note_to_book("1234", "Naive", 1, datetime(2021, 1, 1, 4))
+    diary.close()
+
+    diary = SQLiteReadingDiary(path)
+    dates = [note.date for note in diary.search_by_isbn("1234").notes]
+    assert dates == [datetime(2021, 1, 1, 8, tzinfo=zone), datetime(2021, 1, 1, 4)]
+    assert dates[0].utcoffset() == timedelta(hours=5, minutes=30)
+    assert dates[1].tzinfo is None
+    assert [note.text for _, note in diary.iter_notes_between(datetime(2021, 1, 1), datetime(2021, 1, 2))] == \
+        ["Aware", "Naive"]
+    diary.close()
+
+
+def test_sqlite_diary_reads_notes_created_before_utc_offsets(path):
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, isbn TEXT NOT NULL, page INTEGER NOT NULL, "
+               "date INTEGER NOT NULL, text TEXT NOT NULL)")
+    db.commit()
+    db.close()
+
+    diary = SQLiteReadingDiary(path)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_note_to_book("1234", "Naive", 1, datetime(2021, 1, 1))
+    diary.add_note_to_book("1234", "Aware", 1, datetime(2021, 1, 1, tzinfo=timezone.utc))
+    assert [note.date for note in diary.search_by_isbn("1234").notes] == \
+        [datetime(2021, 1, 1), datetime(2021, 1, 1, tzinfo=timezone.utc)]
+    diary.close()
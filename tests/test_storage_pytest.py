@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import Book, ReadingDiary
+from readingdiary.storage import load_diary, save_diary
+
+
+@pytest.fixture
+def diary():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_book("5678", "Otro libro ñ", "Autora Y", 200)
+    diary.add_book("9012", "Empty Book", "Author Z", 300)
+    diary.add_note_to_book("1234", "Note 1", 1, datetime(2021, 1, 1))
+    diary.add_note_to_book("5678", "Nota 2 ✓", 2, datetime(2021, 1, 2, 13, 45, 7, 12))
+    diary.add_note_to_book("5678", "", 2, datetime(1969, 12, 31))
+    diary.add_note_to_book("5678", "Note 4", 5, datetime(2021, 1, 4))
+    diary.rate_book("1234", Book.EXCELLENT)
+    diary.rate_book("5678", Book.BAD)
+    return diary
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "diary.rdry")
+
+
+def as_tuples(diary):
+    return [
+        (book.isbn, book.title, book.author, book.pages, book.rating,
+         [(note.text, note.page, note.date) for note in book.notes])
+        for book in (diary.search_by_isbn(isbn) for isbn in diary.books)
+    ]
+
+
+def test_save_and_load_round_trip(diary, path):
+    save_diary(diary, path)
+    assert as_tuples(load_diary(path)) == as_tuples(diary)
+
+
+def test_load_round_trip_with_columnar_books(diary, path):
+    save_diary(diary, path)
+    loaded = load_diary(path, ColumnarBook)
+    assert isinstance(loaded.search_by_isbn("5678"), ColumnarBook)
+    assert as_tuples(loaded) == as_tuples(diary)
+
+
+def test_load_decodes_notes_of_a_book_on_first_access(diary, path):
+    save_diary(diary, path)
+    loaded = load_diary(path)
+    assert set(loaded._note_loaders) == {"1234", "5678"}
+    assert len(loaded.books["5678"].notes) == 3
+    assert len(loaded.books.get("1234").notes) == 1
+    assert loaded._note_loaders == {}
+
+
+def test_load_answers_book_with_most_notes_decoding_only_that_book(diary, path):
+    save_diary(diary, path)
+    loaded = load_diary(path)
+    assert loaded.book_with_most_notes() is loaded.books["5678"]
+    assert len(loaded.book_with_most_notes().notes) == 3
+    assert list(loaded._note_loaders) == ["1234"]
+
+
+def test_loaded_diary_appends_new_notes_after_stored_ones(diary, path):
+    save_diary(diary, path)
+    loaded = load_diary(path)
+    assert loaded.add_note_to_book("1234", "Note 5", 3, datetime(2021, 1, 5))
+    assert [note.text for note in loaded.search_by_isbn("1234").notes] == ["Note 1", "Note 5"]
+
+
+def test_save_includes_notes_not_yet_decoded(diary, path):
+    save_diary(diary, path)
+    save_diary(load_diary(path), path)
+    assert as_tuples(load_diary(path)) == as_tuples(diary)
+
+
+def test_load_writes_no_history_records(diary, path, monkeypatch):
+    save_diary(diary, path)
+
+    def log(self, record):
+        raise AssertionError(record)
+
+    monkeypatch.setattr(ReadingDiary, "_log", log)
+    loaded = load_diary(path)
+    assert not loaded.undo()
+    assert [book.isbn for book in loaded.search_by_title("book")] == ["1234", "9012"]
+    assert loaded.search_by_isbn("1234").rating == Book.EXCELLENT
+
+
+def test_save_and_load_empty_diary(path):
+    save_diary(ReadingDiary(), path)
+    assert load_diary(path).books == {}
+
+
+def test_load_rejects_other_files(path):
+    with open(path, "wb") as file:
+        file.write(b"not a diary file at all")
+    with pytest.raises(ValueError):
+        load_diary(path)
+
+
+def test_loaded_diary_date_queries_include_undecoded_notes(diary, path):
+    save_diary(diary, path)
+    loaded = load_diary(path)
+    loaded.add_note_to_book("1234", "Note 5", 3, datetime(2021, 1, 5))
+    assert [note.text for _, note in loaded.latest_notes(3)] == ["Note 5", "Note 4", "Nota 2 ✓"]
+    assert [note.text for _, note in loaded.iter_notes_between(datetime(1960, 1, 1), datetime(2021, 1, 2))] == ["", "Note 1"]
+
+
+@pytest.mark.parametrize("book_type", [Book, ColumnarBook])
+def test_load_keeps_note_ids_after_removals(diary, path, book_type):
+    diary.remove_note("5678", 2)
+    save_diary(diary, path)
+    loaded = load_diary(path, book_type)
+    assert [note.id for note in loaded.search_by_isbn("5678").notes] == [0, 1]
+    loaded.add_note_to_book("5678", "Note 5", 5, datetime(2021, 1, 5))
+    assert [note.id for note in loaded.search_by_isbn("5678").notes] == [0, 1, 3]
+    assert loaded.search_by_isbn("5678").page_with_most_notes() == 2
+
+
+def test_compressed_save_round_trip(diary, path):
+    save_diary(diary, path, compress=True)
+    assert as_tuples(load_diary(path)) == as_tuples(diary)
+    assert as_tuples(load_diary(path, ColumnarBook)) == as_tuples(diary)
+
+
+def test_load_keeps_books_stored_under_two_forms_of_one_isbn(path):
+    diary = ReadingDiary()
+    diary._add_book("0306406152", "Short Form", "Author X", 100)
+    diary._add_book("978-0-306-40615-7", "Long Form", "Author X", 100)
+    diary.add_note_to_book("978-0-306-40615-7", "Note 1", 1, datetime(2021, 1, 1))
+    save_diary(diary, path)
+
+    loaded = load_diary(path)
+    assert as_tuples(loaded) == as_tuples(diary)
+    assert loaded.search_by_isbn("9780306406157").title == "Short Form"
+    assert not loaded.add_book("9780306406157", "Third Form", "Author X", 100)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_save_and_load_keep_utc_offsets(diary, path, compress):
+    diary.add_note_to_book("1234", "Aware", 2, datetime(2021, 1, 6, 12, tzinfo=timezone(timedelta(hours=2))))
+    diary.add_note_to_book("1234", "UTC", 3, datetime(2021, 1, 7, tzinfo=timezone.utc))
+    save_diary(diary, path, compress=compress)
+    loaded = load_diary(path)
+    assert [str(note) for note in loaded.search_by_isbn("1234").notes] == [
+        str(note) for note in diary.search_by_isbn("1234").notes]
+    assert [note.date.utcoffset() for note in loaded.search_by_isbn("1234").notes] == [
+        None, timedelta(hours=2), timedelta(0)]
+    assert as_tuples(loaded) == as_tuples(diary)
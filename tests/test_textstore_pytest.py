@@ -0,0 +1,73 @@
+import gc
+from datetime import datetime
+
+import pytest
+
+from readingdiary.model import Note, ReadingDiary
+from readingdiary.storage import load_diary, save_diary
+from readingdiary.textstore import Blob, CompactBook, CompactNote, TextStore
+
+QUOTE = "It was the best of times, it was the worst of times, it was the age of wisdom, it was the age of foolishness."
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = TextStore(threshold=32, training_samples=4)
+    monkeypatch.setattr(CompactNote, "store", store)
+    return store
+
+
+def test_text_store_interns_short_texts(store):
+    assert store.pack("#todo") is store.pack("".join(["#to", "do"]))
+    assert store.unpack(store.pack("#todo")) == "#todo"
+
+
+def test_text_store_compresses_long_texts_after_training(store):
+    texts = [f"{QUOTE} ({i})" for i in range(6)]
+    packed = [store.pack(text) for text in texts]
+    assert all(type(value) is str for value in packed[:3])
+    assert all(type(value) is Blob and len(value.data) < len(QUOTE) for value in packed[3:])
+    assert store.pack(texts[5]) is packed[5]
+    assert [store.unpack(value) for value in packed] == texts
+    assert store.stats()["blobs"] == 3
+
+
+def test_text_store_drops_texts_no_note_uses(store):
+    diary = ReadingDiary(CompactBook)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    for i in range(6):
+        diary.add_note_to_book("1234", f"{QUOTE} ({i})", 1, datetime(2021, 1, 1 + i))
+    assert store.stats()["blobs"] == 3
+    for note_id in (3, 4):
+        diary.remove_note("1234", note_id)
+    diary.clear_history()
+    gc.collect()
+    assert store.stats()["blobs"] == 1
+    assert diary.search_by_isbn("1234").get_note(5).text == f"{QUOTE} (5)"
+
+
+def test_compact_book_notes_behave_like_notes(store):
+    diary = ReadingDiary(CompactBook)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    for i in range(6):
+        diary.add_note_to_book("1234", f"{QUOTE} ({i})", 1, datetime(2021, 1, 1 + i))
+    book = diary.search_by_isbn("1234")
+    assert all(isinstance(note, Note) for note in book.notes)
+    assert str(book.notes[5]) == f"2021-01-06 00:00:00 - page 1: {QUOTE} (5)"
+    assert [note for _, note in diary.search_notes("wisdom 5")][0].id == 5
+    assert book.update_note(5, text="Short")
+    assert book.get_note(5).text == "Short"
+    assert diary.undo()
+    assert book.get_note(5).text == f"{QUOTE} (5)"
+
+
+def test_compact_book_round_trips_through_storage(store, tmp_path):
+    path = str(tmp_path / "diary.rdry")
+    diary = ReadingDiary(CompactBook)
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    for i in range(6):
+        diary.add_note_to_book("1234", f"{QUOTE} ({i})", 1 + i, datetime(2021, 1, 1 + i))
+    save_diary(diary, path, compress=True)
+    loaded = load_diary(path, CompactBook)
+    assert isinstance(loaded.search_by_isbn("1234").notes[0], CompactNote)
+    assert [note.text for note in loaded.search_by_isbn("1234").notes] == [f"{QUOTE} ({i})" for i in range(6)]
@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from readingdiary.columnar import ColumnarBook
+from readingdiary.model import Book, ReadingDiary
+from readingdiary.vectorized import DiaryStats
+
+np = pytest.importorskip("numpy")
+
+
+def fill(diary, num_books=15):
+    rng = random.Random(5)
+    start = datetime(2021, 1, 1)
+    for i in range(num_books):
+        isbn = f"isbn-{i}"
+        diary.add_book(isbn, f"Title {i}", "Author X", rng.choice([0, 50, 300]))
+        for j in range(rng.randrange(0, 30)):
+            diary.add_note_to_book(isbn, f"Note {j}", rng.randrange(-2, 12), start + timedelta(hours=rng.randrange(200)))
+    return diary
+
+
+@pytest.mark.parametrize("book_type", [Book, ColumnarBook])
+def test_vectorized_matches_fallback(book_type):
+    diary = fill(ReadingDiary(book_type))
+    vectorized = DiaryStats(diary, use_numpy=True)
+    fallback = DiaryStats(diary, use_numpy=False)
+
+    assert vectorized.pages_with_most_notes() == fallback.pages_with_most_notes()
+    for isbn in diary.books:
+        assert vectorized.page_with_most_notes(isbn) == diary.books[isbn].page_with_most_notes()
+    assert vectorized.book_with_most_notes() is fallback.book_with_most_notes()
+    assert vectorized.reading_velocity() == pytest.approx(fallback.reading_velocity())
+    assert vectorized.progress() == pytest.approx(fallback.progress())
+    assert vectorized.progress_percentiles() == pytest.approx(fallback.progress_percentiles())
+
+
+def test_page_with_most_notes_breaks_ties_by_first_note():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    for page in (9, 3, 3, 9, 1):
+        diary.add_note_to_book("1234", "Note", page, datetime(2021, 1, 1))
+    stats = DiaryStats(diary, use_numpy=True)
+    assert stats.page_with_most_notes("1234") == 9
+    assert stats.pages_with_most_notes() == {"1234": 9}
+    assert stats.page_with_most_notes("0000") is None
+
+
+def test_reading_velocity_and_progress():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 200)
+    diary.add_book("5678", "Another Book", "Author Y", 100)
+    diary.add_note_to_book("1234", "Start", 10, datetime(2021, 1, 1))
+    diary.add_note_to_book("1234", "Later", 50, datetime(2021, 1, 5))
+    stats = DiaryStats(diary, use_numpy=True)
+    assert stats.reading_velocity() == {"1234": 10.0}
+    assert stats.progress() == {"1234": 0.25, "5678": 0.0}
+    assert stats.progress_percentiles((0, 50, 100)) == {0: 0.0, 50: 0.125, 100: 0.25}
+
+
+def test_empty_diary():
+    for use_numpy in (True, False):
+        stats = DiaryStats(ReadingDiary(), use_numpy=use_numpy)
+        assert stats.book_with_most_notes() is None
+        assert stats.pages_with_most_notes() == {}
+        assert stats.reading_velocity() == {}
+        assert stats.progress_percentiles((50,)) == {50: 0.0}
+
+
+def test_refresh_picks_up_new_notes():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    stats = DiaryStats(diary, use_numpy=True)
+    assert stats.book_with_most_notes() is None
+    diary.add_note_to_book("1234", "Note", 1, datetime(2021, 1, 1))
+    stats.refresh()
+    assert stats.book_with_most_notes() is diary.books["1234"]
+
+
+def test_arrays_follow_diary_changes():
+    diary = ReadingDiary()
+    diary.add_book("1234", "Test Book", "Author X", 100)
+    diary.add_book("5678", "Another Book", "Author Y", 100)
+    stats = DiaryStats(diary, use_numpy=True)
+    assert stats.book_with_most_notes() is None
+    arrays = stats.arrays
+    assert stats.arrays is arrays
+
+    diary.add_note_to_book("1234", "Note", 1, datetime(2021, 1, 1))
+    assert stats.book_with_most_notes() is diary.books["1234"]
+    with diary.batch():
+        diary.add_note_to_book("5678", "Note", 1, datetime(2021, 1, 1))
+        diary.add_note_to_book("5678", "Note", 2, datetime(2021, 1, 2))
+    assert stats.book_with_most_notes() is diary.books["5678"]
+    diary.undo()
+    assert stats.book_with_most_notes() is diary.books["1234"]
+    diary.remove_note("1234", 0)
+    assert stats.pages_with_most_notes() == {"1234": -1, "5678": -1}
+
+
+def test_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr("readingdiary.vectorized.np", None)
+    diary = fill(ReadingDiary())
+    stats = DiaryStats(diary)
+    assert not stats.use_numpy
+    assert stats.book_with_most_notes() is diary.book_with_most_notes()
+    with pytest.raises(ImportError):
+        DiaryStats(diary, use_numpy=True)